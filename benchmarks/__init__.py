@@ -0,0 +1,7 @@
+"""Developer benchmarks for the SubwayIQ report modules.
+
+Nothing in here ships with the app. Run from the repository root, e.g.::
+
+    python -m benchmarks.stub_server --stores 100
+    python -m benchmarks.e2e --stores 10,100 --days 7
+"""
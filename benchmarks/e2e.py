@@ -0,0 +1,228 @@
+"""End-to-end benchmark: drive each report module against the LiveIQ stub.
+
+Each run loads the module the way SubwayIQ does, hands run() a real Tk
+Toplevel, waits for the worker thread and records:
+
+    wall_s     run() call to worker exit
+    calls      fetch_data calls (http = attempts including retries)
+    peak_mb    tracemalloc peak across all threads (--no-memory to skip)
+    render_s   time spent in the report's ScrolledText insert/see/update
+    lines      lines rendered
+
+Needs a display (on Linux CI use xvfb-run). Ranges longer than a module's
+MAX_DAYS are reported as skipped.
+
+    python -m benchmarks.e2e --stores 10,100,300 --days 7,30 --json bench.json
+"""
+import argparse
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tkinter as tk
+import tracemalloc
+from datetime import date, timedelta
+from tkinter.scrolledtext import ScrolledText
+
+from . import stub_server, synthetic
+from .host import Host
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULES_DIR = os.path.join(ROOT_DIR, "modules")
+MODULES = ["Sales", "Transactions", "Items-Sold", "Discounts", "Labor", "3rd-Party"]
+END_DATE = date(2025, 6, 29)
+
+
+class TimedScrolledText(ScrolledText):
+    """ScrolledText that accumulates the time modules spend rendering into it."""
+
+    seconds = 0.0
+    lines = 0
+    _lock = threading.Lock()
+
+    @classmethod
+    def reset(cls):
+        cls.seconds = 0.0
+        cls.lines = 0
+
+    def _timed(self, fn, *args, **kwargs):
+        t0 = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with TimedScrolledText._lock:
+                TimedScrolledText.seconds += time.perf_counter() - t0
+
+    def insert(self, index, chars, *args):
+        with TimedScrolledText._lock:
+            TimedScrolledText.lines += str(chars).count("\n")
+        return self._timed(super().insert, index, chars, *args)
+
+    def see(self, index):
+        return self._timed(super().see, index)
+
+    def update(self):
+        return self._timed(super().update)
+
+    def delete(self, index1, index2=None):
+        return self._timed(super().delete, index1, index2)
+
+
+_loaded = {}
+
+
+def load_module(name):
+    """Import modules/<name>.py once, as SubwayIQ does."""
+    if name not in _loaded:
+        spec = importlib.util.spec_from_file_location(f"subwayiq_bench_{name.replace('-', '_')}", os.path.join(MODULES_DIR, f"{name}.py"))
+        mod = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(mod)
+        mod.ScrolledText = TimedScrolledText
+        _loaded[name] = mod
+    return _loaded[name]
+
+
+def start_stub(args):
+    """Run the stub in its own process so it does not compete for our GIL."""
+    cmd = [sys.executable, "-m", "benchmarks.stub_server", "--port", "0", "--stores", str(max(args.stores)),
+           "--stores-per-account", str(args.stores_per_account), "--txns-per-day", str(args.txns_per_day),
+           "--seed", str(args.seed), "--latency-ms", str(args.latency_ms), "--jitter-ms", str(args.jitter_ms),
+           "--rate-429", str(args.rate_429), "--rate-500", str(args.rate_500), "--rate-502", str(args.rate_502),
+           "--retry-after", str(args.retry_after), "--limit-per-min", str(args.limit_per_min),
+           "--script", args.script, "--script-period", str(args.script_period)]
+    proc = subprocess.Popen(cmd, cwd=ROOT_DIR, stdout=subprocess.PIPE, text=True)
+    line = proc.stdout.readline()
+    if "listening on" not in line:
+        proc.kill()
+        raise RuntimeError(f"stub server failed to start: {line!r}")
+    return proc, line.rsplit(" ", 1)[1].strip()
+
+
+def drive(mod, host, hidden=False, on_start=None):
+    """Call mod.run() with a real Toplevel against host and wait for its worker; return the wall seconds."""
+    root = tk.Tk()
+    if hidden:
+        root.withdraw()
+    store_vars = {sid: tk.BooleanVar(root, value=True) for sid in host.stores}
+    host.install(sys.modules["__main__"], store_vars)
+    window = tk.Toplevel(root)
+    TimedScrolledText.reset()
+    if on_start:
+        on_start()
+    before = set(threading.enumerate())
+    t0 = time.perf_counter()
+    try:
+        mod.run(window)
+        workers = [t for t in threading.enumerate() if t not in before]
+
+        def poll():
+            if any(t.is_alive() for t in workers):
+                root.after(10, poll)
+            else:
+                root.quit()
+
+        root.after(0, poll)
+        root.mainloop()
+        return time.perf_counter() - t0
+    finally:
+        try:
+            root.destroy()
+        except tk.TclError:
+            pass
+
+
+def run_once(name, stores, days, base_url, args, workdir):
+    mod = load_module(name)
+    max_days = getattr(mod, "MAX_DAYS", 30)
+    row = {"module": name, "stores": stores, "days": days}
+    if days > max_days:
+        row["skipped"] = f"MAX_DAYS={max_days}"
+        return row
+
+    end = END_DATE
+    start = end - timedelta(days=days - 1)
+    ids = synthetic.store_ids(stores)
+    accounts = [dict(a, StoreIDs=[s for s in a["StoreIDs"] if s in ids]) for a in stub_server.accounts(max(args.stores), args.stores_per_account)]
+    accounts = [a for a in accounts if a["StoreIDs"]]
+    host = Host(base_url, accounts, start.isoformat(), end.isoformat(), ids, args.workers, workdir)
+
+    try:
+        row["wall_s"] = round(drive(mod, host, args.hidden, tracemalloc.start if args.memory else None), 3)
+    finally:
+        if args.memory:
+            row["peak_mb"] = round(tracemalloc.get_traced_memory()[1] / 2 ** 20, 1)
+            tracemalloc.stop()
+    row.update(calls=host.stats["calls"], http=host.stats["http_requests"], retries=host.stats["retries"],
+               rate_limited=host.stats["rate_limited"], errors=host.stats["errors"],
+               render_s=round(TimedScrolledText.seconds, 3), lines=TimedScrolledText.lines)
+    return row
+
+
+COLUMNS = [("module", 13, "{}"), ("stores", 6, "{}"), ("days", 4, "{}"), ("wall_s", 8, "{:.2f}"), ("calls", 6, "{}"),
+           ("http", 6, "{}"), ("rate_limited", 6, "{}"), ("errors", 6, "{}"), ("peak_mb", 8, "{:.1f}"),
+           ("render_s", 8, "{:.2f}"), ("lines", 7, "{}")]
+
+
+def format_row(row):
+    if "skipped" in row:
+        return f"{row['module']:<13} {row['stores']:>6} {row['days']:>4}  skipped ({row['skipped']})"
+    cells = []
+    for key, width, fmt in COLUMNS:
+        value = row.get(key, "")
+        text = fmt.format(value) if value != "" else "-"
+        cells.append(f"{text:<{width}}" if key == "module" else f"{text:>{width}}")
+    return " ".join(cells)
+
+
+def parse_ints(text):
+    return [int(x) for x in text.split(",") if x.strip()]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="End-to-end benchmark of the report modules against the LiveIQ stub.")
+    stub_server.add_arguments(parser, stores=False)
+    parser.add_argument("--stores", default="10,100,300", help="comma list of store counts (default 10,100,300)")
+    parser.add_argument("--modules", default=",".join(MODULES), help="comma list (default: all six)")
+    parser.add_argument("--days", default="7,30", help="comma list of range lengths (default 7,30)")
+    parser.add_argument("--workers", type=int, default=8, help="config_max_workers (default 8)")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--hidden", action="store_true", help="withdraw the Tk windows")
+    parser.add_argument("--no-memory", dest="memory", action="store_false", help="skip tracemalloc (it slows runs down)")
+    parser.add_argument("--base-url", help="use an already running stub instead of starting one")
+    parser.add_argument("--json", help="also write the rows to this file")
+    args = parser.parse_args(argv)
+    args.stores = parse_ints(args.stores)
+    days = parse_ints(args.days)
+    modules = [m.strip() for m in args.modules.split(",") if m.strip()]
+
+    proc = None
+    base_url = args.base_url
+    if not base_url:
+        proc, base_url = start_stub(args)
+    rows = []
+    print(" ".join(f"{k:<{w}}" if k == "module" else f"{k[:w]:>{w}}" for k, w, _ in COLUMNS))
+    try:
+        with tempfile.TemporaryDirectory(prefix="subwayiq-bench-") as workdir:
+            for name in modules:
+                for n in args.stores:
+                    for d in days:
+                        for _ in range(args.repeat):
+                            row = run_once(name, n, d, base_url, args, workdir)
+                            rows.append(row)
+                            print(format_row(row), flush=True)
+    finally:
+        if proc:
+            proc.terminate()
+            proc.wait()
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=2)
+    return rows
+
+
+if __name__ == "__main__":
+    main()
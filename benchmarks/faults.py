@@ -0,0 +1,120 @@
+"""Fault-injection harness: how much throughput do 429 and 5xx storms cost?
+
+Runs the module's own run() against the stub, the way benchmarks.e2e does,
+so the endpoints, fan-out, windows and thread pools are whatever the module
+does today. The module drops a request when fetch_data raises RateLimitError
+or returns {"error": ...}; the host records each one. Each scenario scripts
+its failures through the stub's --script windows. Each policy decides what
+the host does with a 429:
+
+    skip         raise RateLimitError at once (what the modules get today)
+    retry-after  wait out Retry-After and retry, up to --rate-limit-retries
+
+Reported per scenario x policy: time to complete, effective requests/min
+(successful fetch_data calls), HTTP attempts/min, retries, dropped calls and
+dropped store-days. Like e2e it needs a display (xvfb-run on Linux CI).
+
+    python -m benchmarks.faults --module Items-Sold --stores 20 --days 7
+    python -m benchmarks.faults --scenario 429-burst --policy skip,retry-after
+"""
+import argparse
+import json
+import tempfile
+from datetime import date, timedelta
+
+from . import stub_server, synthetic
+from .e2e import drive, load_module
+from .host import Host
+
+# Windows are short and periodic so that a run of a few seconds still crosses
+# several of them; use --script for real-world timescales.
+SCENARIOS = {
+    "clean": {},
+    "flaky-502": {"rate_502": 0.10, "rate_500": 0.02},
+    "429-burst": {"script": "1-3:429=1,retry=2", "script_period": 6, "rate_502": 0.02},
+    "storm": {"script": "0-2:429=0.6,retry=1;2-4:502=0.3", "script_period": 6},
+    "ceiling": {"limit_per_min": 60},
+}
+POLICIES = {"skip": 0, "retry-after": None}
+END_DATE = date(2025, 6, 29)
+
+
+def dropped_store_days(failed):
+    """(endpoint, store, day) triples covered by the host's failed calls."""
+    return {(ep, sid, d) for ep, sids, start, end in failed for sid in str(sids).split(",")
+            for d in synthetic.date_range(start, end)}
+
+
+def run_scenario(name, policy, args):
+    settings = dict(SCENARIOS[name]) if name != "custom" else {"script": args.script, "script_period": args.script_period}
+    script = stub_server.parse_script(settings.pop("script", ""))
+    config = stub_server.StubConfig(stores=args.stores, stores_per_account=args.stores_per_account,
+                                    txns_per_day=args.txns_per_day, seed=args.seed, latency_ms=args.latency_ms,
+                                    script=script, **settings)
+    server, base_url = stub_server.serve(config)
+    try:
+        start = (END_DATE - timedelta(days=args.days - 1)).isoformat()
+        end = END_DATE.isoformat()
+        accounts = stub_server.accounts(args.stores, args.stores_per_account)
+        retries = POLICIES[policy]
+        with tempfile.TemporaryDirectory(prefix="subwayiq-faults-") as workdir:
+            host = Host(base_url, accounts, start, end, synthetic.store_ids(args.stores), args.workers, workdir,
+                        backoff=args.backoff, rate_limit_retries=args.rate_limit_retries if retries is None else retries)
+            time_s = drive(load_module(args.module), host, hidden=True)
+    finally:
+        server.shutdown()
+        server.server_close()
+    stats = host.stats
+    ok = stats["calls"] - stats["rate_limited"] - stats["errors"]
+    minutes = time_s / 60 or 1e-9
+    return {"scenario": name, "policy": policy, "time_s": time_s, "calls": stats["calls"], "ok": ok,
+            "rate_limited": stats["rate_limited"], "errors": stats["errors"],
+            "dropped_store_days": len(dropped_store_days(host.failed)), "http": stats["http_requests"],
+            "retries": stats["retries"], "http_429": stats["http_429"], "http_5xx": stats["http_5xx"],
+            "req_per_min": ok / minutes, "http_per_min": stats["http_requests"] / minutes}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure report throughput under scripted 429/5xx storms.")
+    parser.add_argument("--module", default="Items-Sold", choices=["Sales", "Transactions", "Items-Sold", "Discounts", "Labor", "3rd-Party"])
+    parser.add_argument("--scenario", default=",".join(SCENARIOS), help=f"comma list of: {', '.join(SCENARIOS)}, custom")
+    parser.add_argument("--policy", default="skip,retry-after", help="comma list of: skip, retry-after")
+    parser.add_argument("--stores", type=int, default=20)
+    parser.add_argument("--stores-per-account", type=int, default=25)
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--txns-per-day", type=int, default=40)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--backoff", type=float, default=0.5, help="5xx back-off base in seconds (host default 0.5)")
+    parser.add_argument("--rate-limit-retries", type=int, default=3, help="429 retries for the retry-after policy")
+    parser.add_argument("--script", default="", help='fault windows for the "custom" scenario, e.g. "10-40:429=1,retry=30"')
+    parser.add_argument("--script-period", type=float, default=0.0)
+    parser.add_argument("--json", help="also write the rows to this file")
+    args = parser.parse_args(argv)
+    if args.script and args.scenario == ",".join(SCENARIOS):
+        args.scenario = "custom"
+    max_days = getattr(load_module(args.module), "MAX_DAYS", 30)
+    if args.days > max_days:
+        parser.error(f"{args.module} supports at most {max_days} days (MAX_DAYS)")
+
+    # Warm the synthetic-data caches so the first scenario is not penalised.
+    run_scenario("clean", "skip", args)
+    rows = []
+    print(f"{'scenario':<11} {'policy':<12} {'time_s':>7} {'calls':>6} {'ok':>6} {'dropped':>7} {'st-days':>7} "
+          f"{'429s':>5} {'5xx':>5} {'retries':>7} {'ok/min':>8} {'http/min':>8}")
+    for name in [s.strip() for s in args.scenario.split(",") if s.strip()]:
+        for policy in [p.strip() for p in args.policy.split(",") if p.strip()]:
+            r = run_scenario(name, policy, args)
+            rows.append(r)
+            print(f"{name:<11} {policy:<12} {r['time_s']:>7.1f} {r['calls']:>6} {r['ok']:>6} {r['rate_limited'] + r['errors']:>7} "
+                  f"{r['dropped_store_days']:>7} {r['http_429']:>5} {r['http_5xx']:>5} {r['retries']:>7} "
+                  f"{r['req_per_min']:>8.1f} {r['http_per_min']:>8.1f}", flush=True)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=2)
+    return rows
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""Headless stand-ins for the SubwayIQ.py helpers a module imports from __main__.
+
+fetch_data talks to the stub server over plain urllib and mirrors the host's
+contract: {"data": ...} on success, {"error": ...} on failure, RateLimitError
+on 429, and a few retries with exponential back-off on 5xx / network errors.
+The URL layout is the stub's own (stub_server.ENDPOINT_PATHS), not LiveIQ's.
+rate_limit_retries > 0 makes it wait out Retry-After and retry 429s instead,
+which is what the fault harness compares against the skip-on-429 default.
+fetch_data_raw is the optional raw-body helper liveiq.stream looks for.
+"""
+import json
+import os
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from urllib.error import HTTPError, URLError
+from urllib.parse import quote
+from urllib.request import Request, urlopen
+
+from .stub_server import ENDPOINT_PATHS
+
+
+def _retry_after(value, default):
+    """Seconds to wait for a Retry-After header (delta-seconds form), else default."""
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return default
+
+
+class RateLimitError(Exception):
+    """Raised by fetch_data when LiveIQ answers 429."""
+
+
+class Host:
+    """One benchmark "SubwayIQ" session: settings, counters and helpers."""
+
+    def __init__(self, base_url, accounts, start, end, stores, max_workers=8, script_dir=None,
+                 retries=3, backoff=0.5, timeout=10.0, rate_limit_retries=0, max_retry_after=60.0):
+        self.base_url = base_url.rstrip("/")
+        self.accounts = accounts
+        self.start = start
+        self.end = end
+        self.stores = stores
+        self.max_workers = max_workers
+        self.script_dir = script_dir or os.getcwd()
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.rate_limit_retries = rate_limit_retries
+        self.max_retry_after = max_retry_after
+        self.error_log = os.path.join(self.script_dir, "error.log")
+        self.stats = Counter()
+        self.failed = []  # (ep, sid, start, end) of calls that raised RateLimitError or returned an error
+        self._lock = threading.Lock()
+
+    def _count(self, key, value=1):
+        with self._lock:
+            self.stats[key] += value
+
+    def _fail(self, key, ep, sid, start, end):
+        with self._lock:
+            self.stats[key] += 1
+            self.failed.append((ep, sid, start, end))
+
+    def url(self, ep, sid, start, end):
+        return f"{self.base_url}/api/{ENDPOINT_PATHS[ep]}/{quote(str(sid), safe=',')}/startDate/{start}/endDate/{end}"
+
+    def fetch_data(self, ep, sid, start, end, cid, ckey):
+        res = self.fetch_data_raw(ep, sid, start, end, cid, ckey)
+        if res.get("error"):
+            return res
+        try:
+            with res["data"] as resp:
+                body = resp.read()
+        except OSError as ex:
+            self._fail("errors", ep, sid, start, end)
+            return {"error": str(ex)}
+        self._count("bytes", len(body))
+        return {"data": json.loads(body)}
+
+    def fetch_data_raw(self, ep, sid, start, end, cid, ckey):
+        """fetch_data's request path, returning the open response instead of parsed JSON."""
+        self._count("calls")
+        req = Request(self.url(ep, sid, start, end), headers={"api-client": cid, "api-key": ckey, "Accept": "application/json"})
+        attempt = limited = 0
+        while True:
+            self._count("http_requests")
+            if attempt or limited:
+                self._count("retries")
+            try:
+                return {"data": urlopen(req, timeout=self.timeout)}
+            except HTTPError as ex:
+                detail = ex.read().decode("utf-8", "replace")
+                if ex.code == 429:
+                    self._count("http_429")
+                    if limited < self.rate_limit_retries:
+                        wait = _retry_after(ex.headers.get("Retry-After"), self.backoff * 2 ** limited)
+                        limited += 1
+                        self._count("retry_after_seconds", wait)
+                        time.sleep(min(wait, self.max_retry_after))
+                        continue
+                    self._fail("rate_limited", ep, sid, start, end)
+                    raise RateLimitError(f"429 Too Many Requests: {detail}")
+                if ex.code >= 500:
+                    self._count("http_5xx")
+                    if attempt + 1 < self.retries:
+                        time.sleep(self.backoff * 2 ** attempt)
+                        attempt += 1
+                        continue
+                self._fail("errors", ep, sid, start, end)
+                return {"error": f"HTTP {ex.code}: {detail}"}
+            except (URLError, OSError) as ex:
+                if attempt + 1 < self.retries:
+                    time.sleep(self.backoff * 2 ** attempt)
+                    attempt += 1
+                    continue
+                self._fail("errors", ep, sid, start, end)
+                return {"error": str(ex)}
+
+    def log_error(self, msg, sid=None, endpoint=None):
+        stamp = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+        with self._lock:
+            with open(self.error_log, "a", encoding="utf-8") as f:
+                f.write(f"[{stamp} UTC] [{endpoint or '-'}] [{sid or '-'}] {msg}\n")
+
+    def handle_rate_limit(self, cid, ckey, root=None):
+        self._count("handle_rate_limit")
+
+    def install(self, namespace, store_vars):
+        """Publish the helpers under the names modules import from __main__."""
+        values = {
+            "get_selected_start_date": lambda: self.start,
+            "get_selected_end_date": lambda: self.end,
+            "fetch_data": self.fetch_data,
+            "fetch_data_raw": self.fetch_data_raw,
+            "store_vars": store_vars,
+            "config_accounts": self.accounts,
+            "handle_rate_limit": self.handle_rate_limit,
+            "log_error": self.log_error,
+            "config_max_workers": self.max_workers,
+            "_password_validated": True,
+            "RateLimitError": RateLimitError,
+            "config_emails": [],
+            "config_smtp": {},
+            "SCRIPT_DIR": self.script_dir,
+        }
+        for name, value in values.items():
+            setattr(namespace, name, value)
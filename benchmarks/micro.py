@@ -0,0 +1,261 @@
+"""Microbenchmarks for the per-record parsing and aggregation code.
+
+Each case runs one hot function over synthetic payloads and reports the best
+time per record over --repeat runs. Results are compared with the stored
+baseline (benchmarks/baseline.json); anything slower than --tolerance is
+flagged, and --check turns that into a non-zero exit for CI.
+
+Shared and virtual machines speed up and slow down by tens of percent from
+one minute to the next. To keep that out of the comparison, every case is
+timed next to a fixed reference workload, and its time is scaled by how much
+faster or slower the reference ran than when the baseline was recorded. A
+case that still looks slow is measured again up to --confirm more times and
+keeps its best scaled time.
+
+    python -m benchmarks.micro                 compare with the baseline
+    python -m benchmarks.micro --save          record a new baseline
+    python -m benchmarks.micro -k discounts    run matching cases only
+
+Timings are machine specific: record the baseline on the machine you compare
+on, and re-save it when a change is meant to move the numbers. Never edit
+baseline.json by hand; --save records every case in one run.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from collections import defaultdict
+
+from . import synthetic
+from .e2e import load_module
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+SEED = 7
+DAY = "2025-06-16"
+
+
+def _details(stores=4, txns=150):
+    """(store, day, Transaction Details payload) for a few store-days."""
+    return [(sid, DAY, synthetic.transaction_details(SEED, sid, DAY, txns)) for sid in synthetic.store_ids(stores)]
+
+
+def case_details_walk():
+    load_module("Items-Sold")
+    from liveiq import details
+    work = [txns for _, _, txns in _details()]
+
+    def run():
+        for txns in work:
+            for _ in details.walk(txns):
+                pass
+    return run, sum(len(t) for t in work)
+
+
+def case_items_sold_reduce():
+    mod = load_module("Items-Sold")
+    work = _details()
+
+    def run():
+        catalog = mod.ItemCatalog()
+        for _, _, txns in work:
+            mod.reduce_items(txns, catalog)
+    return run, sum(len(t) for _, _, t in work)
+
+
+def case_discounts_reduce_fold():
+    mod = load_module("Discounts")
+    work = _details()
+
+    def run():
+        mod.daily_items = {sid: defaultdict(lambda: {"count": 0, "orig": 0.0, "adj": 0.0, "save": 0.0}) for sid, _, _ in work}
+        dmap, smap, dimap = {}, defaultdict(lambda: {"count": 0, "save": 0.0}), defaultdict(dict)
+        for sid, day, txns in work:
+            mod.fold_discounts(mod.reduce_discounts(txns), dmap, smap, dimap, sid, day)
+    return run, sum(len(t) for _, _, t in work)
+
+
+def case_stream_iter_array():
+    load_module("Items-Sold")
+    from liveiq import stream
+    work = [json.dumps(txns).encode("utf-8") for _, _, txns in _details()]
+    size = stream.CHUNK
+
+    def run():
+        for body in work:
+            for _ in stream.iter_array(body[i:i + size] for i in range(0, len(body), size)):
+                pass
+    return run, sum(len(t) for _, _, t in _details())
+
+
+def case_custom_flatten_json():
+    mod = load_module("_CUSTOM")
+    work = [txn for _, _, txns in _details(stores=2) for txn in txns]
+
+    def run():
+        for txn in work:
+            mod.flatten_json(txn)
+    return run, len(work)
+
+
+def case_labor_shift_times():
+    load_module("Labor")
+    from liveiq import entries
+    work = [r for sid in synthetic.store_ids(20) for r in synthetic.daily_timeclock(SEED, sid, "2025-06-10", DAY, today="1970-01-01")]
+
+    def run():
+        shift_times = entries.shift_times
+        for rec in work:
+            shift_times(rec.get("clockInDateTime") or rec.get("clockIn"), rec.get("clockOutDateTime") or rec.get("clockOut"))
+    return run, len(work)
+
+
+def case_transactions_entry():
+    load_module("Transactions")
+    from liveiq import entries, schemas
+    work = [(sid, synthetic.transaction_summary(SEED, sid, DAY, 150)) for sid in synthetic.store_ids(8)]
+
+    def run():
+        schemas.iso_day.cache_clear()  # one parse per distinct date per run, as in a fresh report
+        for sid, txns in work:
+            day = schemas.day_reader(txns)
+            for txn in txns:
+                entries.transaction_entry(txn, sid, day(txn, DAY))
+    return run, sum(len(t) for _, t in work)
+
+
+def case_transactions_table_summary():
+    mod = load_module("Transactions")
+    from liveiq import entries
+    work = [entries.transaction_entry(t, sid, DAY) for sid in synthetic.store_ids(8) for t in synthetic.transaction_summary(SEED, sid, DAY, 150)]
+
+    def run():
+        table = entries.transaction_table()
+        for entry in work:
+            table.append(entry)
+        entries.summarize_transactions(table)
+        mod.index_transactions(table)
+    return run, len(work)
+
+
+def case_reference():
+    """Fixed pure-Python work, unrelated to SubwayIQ code, that gauges how fast the machine is right now."""
+    work = [{"id": i, "name": f"item-{i}", "tags": [i, i + 1, i + 2]} for i in range(200)]
+
+    def run():
+        total = 0
+        for rec in work:
+            for key, value in rec.items():
+                total += len(value) if isinstance(value, (list, str)) else value
+            json.dumps(rec)
+        return total
+    return run, len(work)
+
+
+CASES = {
+    "details.walk": case_details_walk,
+    "items_sold.reduce_items": case_items_sold_reduce,
+    "discounts.reduce+fold": case_discounts_reduce_fold,
+    "stream.iter_array": case_stream_iter_array,
+    "custom.flatten_json": case_custom_flatten_json,
+    "labor.shift_times": case_labor_shift_times,
+    "transactions.entry": case_transactions_entry,
+    "transactions.table+summary": case_transactions_table_summary,
+}
+
+
+def measure(setup, repeat, min_time=0.2):
+    """Return the best microseconds per record over repeat runs."""
+    run, n = setup()
+    run()
+    loops = 1
+    t0 = time.perf_counter()
+    run()
+    once = time.perf_counter() - t0
+    if once < min_time:
+        loops = max(1, int(min_time / max(once, 1e-6)))
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for _ in range(loops):
+            run()
+        best = min(best, (time.perf_counter() - t0) / loops)
+    return best / n * 1e6
+
+
+def load_baseline(path=BASELINE):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Microbenchmarks for per-record parsing and aggregation.")
+    parser.add_argument("-k", dest="pattern", default="", help="only run cases whose name contains this text")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--tolerance", type=float, default=0.15, help="allowed slowdown vs baseline (default 0.15)")
+    parser.add_argument("--confirm", type=int, default=2, help="re-measure a flagged case up to this many times (default 2)")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--save", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--check", action="store_true", help="exit 1 if any case regressed")
+    args = parser.parse_args(argv)
+
+    baseline = load_baseline(args.baseline)
+    base_cases = baseline.get("cases", {})
+    meta = {"python": platform.python_version(), "machine": platform.machine(), "system": platform.system()}
+    if base_cases and baseline.get("meta") != meta:
+        print(f"note: baseline recorded on {baseline.get('meta')}, running on {meta}", file=sys.stderr)
+
+    ref_base = baseline.get("reference")
+    ref_run = None  # this run's first reference time; a fresh baseline is scaled to it
+    keep = bool(args.pattern and ref_base)  # --save -k updates some cases of the stored baseline
+
+    def timed(setup):
+        """Time one case next to the reference; returns (us, us at the baseline's speed, us at this run's speed)."""
+        nonlocal ref_run
+        us, ref = measure(setup, args.repeat), measure(case_reference, args.repeat)
+        ref_run = ref_run or ref
+        return us, us * ref_base / ref if ref_base else us, us * ref_run / ref
+
+    results = {}
+    regressions = []
+    print(f"{'case':<30} {'us/rec':>9} {'scaled':>9} {'baseline':>9} {'change':>8}")
+    for name, setup in CASES.items():
+        if args.pattern and args.pattern not in name:
+            continue
+        us, scaled, own = timed(setup)
+        base = base_cases.get(name)
+        for _ in range(args.confirm if base else 0):
+            if scaled / base - 1 <= args.tolerance:
+                break
+            again = timed(setup)
+            if again[1] < scaled:
+                us, scaled, own = again
+        results[name] = round(scaled if keep else own, 3)
+        if base:
+            change = scaled / base - 1
+            flag = "  REGRESSION" if change > args.tolerance else ""
+            if flag:
+                regressions.append(name)
+            print(f"{name:<30} {us:>9.3f} {scaled:>9.3f} {base:>9.3f} {change:>+7.0%}{flag}")
+        else:
+            print(f"{name:<30} {us:>9.3f} {scaled:>9.3f} {'-':>9} {'-':>8}")
+
+    if args.save:
+        cases = dict(base_cases) if keep else {}
+        cases.update(results)
+        reference = ref_base if keep else round(ref_run, 3)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({"meta": meta, "reference": reference, "cases": cases}, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"baseline written to {args.baseline}")
+    if args.check and regressions:
+        sys.exit(1)
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,310 @@
+"""Local stand-in for https://liveiqfranchiseeapi.subway.com.
+
+Serves all seven endpoints SubwayIQ uses plus /api/Restaurants, with
+synthetic data from benchmarks.synthetic. Routes:
+
+    GET /api/<Path>/<restaurantNumbers>/startDate/<YYYY-MM-DD>/endDate/<YYYY-MM-DD>
+    GET /api/<Path>/<restaurantNumbers>?startDate=...&endDate=...
+    GET /api/Restaurants
+    GET /__stats                      request counters as JSON
+    POST /__reset                     zero the counters
+
+<restaurantNumbers> may be a comma list, as the Labor module sends. Requests
+need the api-client / api-key headers of one of the generated accounts
+(bench-client-N / bench-key-N, each owning --stores-per-account stores).
+
+    python -m benchmarks.stub_server --stores 100 --port 8099 --rate-429 0.02
+    python -m benchmarks.stub_server --script "10-25:429=1,retry=15" --script-period 60
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from collections import Counter, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from . import synthetic
+
+try:
+    import orjson
+
+    def _dumps(obj):
+        return orjson.dumps(obj)
+except ImportError:
+    def _dumps(obj):
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+ENDPOINT_PATHS = {
+    "Sales Summary": "SalesSummary",
+    "Daily Sales Summary": "DailySalesSummary",
+    "Daily Timeclock": "DailyTimeclock",
+    "Third Party Sales Summary": "ThirdPartySalesSummary",
+    "Third Party Transaction Summary": "ThirdPartyTransactionSummary",
+    "Transaction Summary": "TransactionSummary",
+    "Transaction Details": "TransactionDetails",
+}
+PATH_ENDPOINTS = {v.lower(): k for k, v in ENDPOINT_PATHS.items()}
+
+
+def accounts(store_count, stores_per_account=25):
+    """Return config_accounts-style dicts for the generated stores."""
+    ids = synthetic.store_ids(store_count)
+    out = []
+    for n, i in enumerate(range(0, len(ids), stores_per_account), 1):
+        out.append({"Name": f"Bench {n}", "ClientID": f"bench-client-{n}", "ClientKEY": f"bench-key-{n}",
+                    "StoreIDs": ids[i:i + stores_per_account], "Status": "Active"})
+    return out
+
+
+class StubConfig:
+    """Knobs for the synthetic data and the injected failures."""
+
+    def __init__(self, stores=10, stores_per_account=25, txns_per_day=150, seed=1, latency_ms=0.0,
+                 jitter_ms=0.0, rate_429=0.0, rate_500=0.0, rate_502=0.0, retry_after=1, limit_per_min=0,
+                 script=(), script_period=0.0):
+        self.stores = stores
+        self.stores_per_account = stores_per_account
+        self.txns_per_day = txns_per_day
+        self.seed = seed
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.rate_429 = rate_429
+        self.rate_500 = rate_500
+        self.rate_502 = rate_502
+        self.retry_after = retry_after
+        self.limit_per_min = limit_per_min
+        self.script = list(script)
+        self.script_period = script_period
+
+
+def parse_script(text):
+    """Parse "START-END:429=1,502=0.1,retry=10;..." into fault windows.
+
+    Times are seconds since the server started (or was last reset); END may be
+    "inf". Inside a window its rates replace the global ones.
+    """
+    windows = []
+    for part in filter(None, (p.strip() for p in (text or "").split(";"))):
+        span, _, spec = part.partition(":")
+        lo, _, hi = span.partition("-")
+        w = {"start": float(lo), "end": float(hi or "inf"), "rate_429": 0.0, "rate_500": 0.0, "rate_502": 0.0, "retry_after": None}
+        for kv in filter(None, (x.strip() for x in spec.split(","))):
+            key, _, value = kv.partition("=")
+            if key == "retry":
+                w["retry_after"] = int(value)
+            elif key in ("429", "500", "502"):
+                w[f"rate_{key}"] = float(value)
+            else:
+                raise ValueError(f"unknown fault key {key!r} in {part!r}")
+        windows.append(w)
+    return windows
+
+
+class StubState:
+    """Accounts, counters and fault dice shared by all handler threads."""
+
+    def __init__(self, config):
+        self.config = config
+        self.accounts = {a["ClientID"]: a for a in accounts(config.stores, config.stores_per_account)}
+        self.lock = threading.Lock()
+        self.rng = random.Random(config.seed)
+        self.counts = Counter()
+        self.recent = {}
+        self.t0 = time.monotonic()
+
+    def reset(self):
+        with self.lock:
+            self.counts.clear()
+            self.recent.clear()
+            self.t0 = time.monotonic()
+
+    def _rates(self, now):
+        cfg = self.config
+        t = now - self.t0
+        if cfg.script_period:
+            t %= cfg.script_period
+        for w in cfg.script:
+            if w["start"] <= t < w["end"]:
+                return w["rate_429"], w["rate_500"], w["rate_502"], w["retry_after"] or cfg.retry_after
+        return cfg.rate_429, cfg.rate_500, cfg.rate_502, cfg.retry_after
+
+    def stats(self):
+        with self.lock:
+            return dict(self.counts)
+
+    def count(self, *keys):
+        with self.lock:
+            for k in keys:
+                self.counts[k] += 1
+
+    def fault(self, client):
+        """Return (status, retry_after) for an injected failure, or None."""
+        cfg = self.config
+        now = time.monotonic()
+        with self.lock:
+            if cfg.limit_per_min:
+                dq = self.recent.setdefault(client, deque())
+                while dq and now - dq[0] > 60:
+                    dq.popleft()
+                if len(dq) >= cfg.limit_per_min:
+                    return 429, max(1, int(60 - (now - dq[0])) + 1)
+                dq.append(now)
+            roll = self.rng.random()
+        rate_429, rate_500, rate_502, retry_after = self._rates(now)
+        if roll < rate_429:
+            return 429, retry_after
+        roll -= rate_429
+        if roll < rate_500:
+            return 500, None
+        roll -= rate_500
+        if roll < rate_502:
+            return 502, None
+        return None
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    state = None
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body, headers=()):
+        if not isinstance(body, bytes):
+            body = _dumps(body)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in headers:
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        if self.path.rstrip("/") == "/__reset":
+            self.state.reset()
+            self._send(200, {"ok": True})
+        else:
+            self._send(404, {"message": "Not found"})
+
+    def do_GET(self):
+        state = self.state
+        cfg = state.config
+        url = urlsplit(self.path)
+        parts = [unquote(p) for p in url.path.strip("/").split("/")]
+        if parts == ["__stats"]:
+            self._send(200, state.stats())
+            return
+        if len(parts) < 2 or parts[0].lower() != "api":
+            self._send(404, {"message": "Not found"})
+            return
+        client = self.headers.get("api-client", "")
+        acct = state.accounts.get(client)
+        if acct is None or self.headers.get("api-key") != acct["ClientKEY"]:
+            state.count("requests", "status_401")
+            self._send(401, {"message": "Access denied due to invalid subscription key."})
+            return
+        if cfg.latency_ms or cfg.jitter_ms:
+            time.sleep(max(0.0, cfg.latency_ms + random.uniform(-cfg.jitter_ms, cfg.jitter_ms)) / 1000.0)
+        if parts[1].lower() == "restaurants":
+            state.count("requests", "status_200", "endpoint_Restaurants")
+            self._send(200, [{"restaurantNumber": sid, "name": f"Store {sid}"} for sid in acct["StoreIDs"]])
+            return
+        endpoint = PATH_ENDPOINTS.get(parts[1].lower())
+        if endpoint is None or len(parts) < 3:
+            state.count("requests", "status_404")
+            self._send(404, {"message": f"Unknown resource {url.path}"})
+            return
+        query = parse_qs(url.query)
+        start = query.get("startDate", [None])[0]
+        end = query.get("endDate", [None])[0]
+        rest = parts[3:]
+        if len(rest) >= 4 and rest[0].lower() == "startdate" and rest[2].lower() == "enddate":
+            start, end = rest[1], rest[3]
+        elif len(rest) >= 2:
+            start, end = rest[0], rest[1]
+        stores = [s for s in parts[2].split(",") if s]
+        try:
+            synthetic.date_range(start, end)
+        except (TypeError, ValueError):
+            state.count("requests", "status_400")
+            self._send(400, {"message": f"Bad date range {start}..{end}"})
+            return
+        if any(s not in acct["StoreIDs"] for s in stores):
+            state.count("requests", "status_403")
+            self._send(403, {"message": "Restaurant not assigned to this client."})
+            return
+        fault = state.fault(client)
+        if fault:
+            status, retry_after = fault
+            state.count("requests", f"status_{status}", f"endpoint_{endpoint}")
+            if status == 429:
+                self._send(429, {"statusCode": 429, "message": f"Rate limit is exceeded. Try again in {retry_after} seconds."},
+                           [("Retry-After", str(retry_after))])
+            else:
+                self._send(status, {"statusCode": status, "message": "Bad Gateway" if status == 502 else "Internal server error"})
+            return
+        body = []
+        for sid in stores:
+            body.extend(synthetic.payload(endpoint, cfg.seed, sid, start, end, cfg.txns_per_day))
+        state.count("requests", "status_200", f"endpoint_{endpoint}")
+        self._send(200, body)
+
+
+def serve(config, host="127.0.0.1", port=0):
+    """Start a stub server on a daemon thread; return (server, base_url)."""
+    handler = type("BoundStubHandler", (StubHandler,), {"state": StubState(config)})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def add_arguments(parser, stores=True):
+    """Add the stub's data and fault options to an argparse parser."""
+    if stores:
+        parser.add_argument("--stores", type=int, default=10, help="number of stores (default 10)")
+    parser.add_argument("--stores-per-account", type=int, default=25)
+    parser.add_argument("--txns-per-day", type=int, default=150, help="mean transactions per store-day")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="added response latency")
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--rate-429", type=float, default=0.0, help="fraction of requests answered 429")
+    parser.add_argument("--rate-500", type=float, default=0.0)
+    parser.add_argument("--rate-502", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds sent with injected 429s")
+    parser.add_argument("--limit-per-min", type=int, default=0, help="per-client sliding-window limit (0 = off)")
+    parser.add_argument("--script", default="", help='timed fault windows, e.g. "10-25:429=1,retry=15;40-60:502=0.3"')
+    parser.add_argument("--script-period", type=float, default=0.0, help="repeat --script every N seconds")
+
+
+def config_from_args(args, **overrides):
+    """Build a StubConfig from parsed add_arguments() options."""
+    kw = {k: getattr(args, k) for k in ("stores", "stores_per_account", "txns_per_day", "seed", "latency_ms", "jitter_ms",
+                                         "rate_429", "rate_500", "rate_502", "retry_after", "limit_per_min", "script_period")}
+    kw["script"] = parse_script(args.script)
+    kw.update(overrides)
+    return StubConfig(**kw)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_arguments(parser)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    args = parser.parse_args(argv)
+    server, base = serve(config_from_args(args), args.host, args.port)
+    print(f"LiveIQ stub listening on {base}", flush=True)
+    for acct in accounts(args.stores, args.stores_per_account):
+        print(f"  {acct['Name']}: {acct['ClientID']} / {acct['ClientKEY']} ({len(acct['StoreIDs'])} stores)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
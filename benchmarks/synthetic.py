@@ -0,0 +1,262 @@
+"""Deterministic synthetic LiveIQ payloads.
+
+Every record is derived from (seed, store, day), so two runs with the same
+settings see byte-identical responses and a Sales Summary always agrees with
+the Transaction Summary it was built from. Field names follow what the report
+modules read, including the alternate spellings they fall back to.
+"""
+import random
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+
+MENU = [
+    ("6in Italian BMT", "1001", 7.49), ("Footlong Italian BMT", "1002", 11.49),
+    ("6in Turkey", "1011", 6.99), ("Footlong Turkey", "1012", 10.99),
+    ("6in Meatball Marinara", "1021", 6.49), ("Footlong Meatball Marinara", "1022", 9.99),
+    ("6in Spicy Italian", "1031", 6.99), ("Footlong Spicy Italian", "1032", 10.49),
+    ("6in Steak & Cheese", "1041", 8.49), ("Footlong Steak & Cheese", "1042", 12.99),
+    ("6in Tuna", "1051", 6.99), ("Footlong Tuna", "1052", 10.49),
+    ("6in Veggie Delite", "1061", 5.49), ("Footlong Veggie Delite", "1062", 8.49),
+    ("6in Chicken Teriyaki", "1071", 7.99), ("Footlong Chicken Teriyaki", "1072", 11.99),
+    ("6in Rotisserie Chicken", "1081", 7.99), ("Footlong Rotisserie Chicken", "1082", 11.99),
+    ("Protein Bowl Turkey", "1101", 9.49), ("Protein Bowl Steak", "1102", 10.49),
+    ("Chopped Salad Italian", "1111", 8.99), ("Wrap Chicken Bacon Ranch", "1121", 9.99),
+    ("Kids Meal Ham", "1131", 4.99), ("Kids Meal Turkey", "1132", 4.99),
+    ("Cookie Chocolate Chip", "2001", 0.99), ("Cookie White Macadamia", "2002", 0.99),
+    ("Cookie 12pk", "2003", 8.99), ("Chips Lays", "2101", 1.79), ("Chips Doritos", "2102", 1.79),
+    ("Chips Baked", "2103", 1.79), ("Fountain Drink 21oz", "2201", 2.29),
+    ("Fountain Drink 30oz", "2202", 2.59), ("Bottled Water", "2211", 2.19),
+    ("Bottled Soda", "2212", 2.49), ("Coffee", "2221", 1.99), ("Footlong Party Platter", "3001", 49.99),
+]
+MODIFIERS = [
+    ("Extra Cheese", "5001", 0.75), ("Extra Meat", "5002", 2.25), ("Bacon", "5003", 1.50),
+    ("Avocado", "5004", 1.50), ("Pepperoni", "5005", 1.25), ("Double Protein", "5006", 3.00),
+    ("Toasted", "5101", 0.0), ("No Onions", "5102", 0.0), ("Light Mayo", "5103", 0.0),
+    ("Chipotle Southwest", "5104", 0.0), ("Jalapenos", "5105", 0.0),
+]
+SIDES = [("Chips Lays", "2101", 1.79), ("Fountain Drink 21oz", "2201", 2.29), ("Cookie Chocolate Chip", "2001", 0.99)]
+DISCOUNTS = [
+    ("BOGO50", "BOGO 50% Off Footlong", 0.5), ("APP2OFF", "App $2 Off", None),
+    ("FL699", "$6.99 Footlong Promo", None), ("EMP50", "Employee Meal", 0.5),
+    ("REW3", "MVP Rewards $3", None), ("MEAL1", "Meal Deal $1 Off", None),
+]
+CLERKS = ["Ana Lopez", "Ben Carter", "Chloe Nguyen", "Dev Patel", "Ella Brooks", "Finn Murphy",
+          "Gia Romano", "Hugo Silva", "Ivy Chen", "Jack Wilson", "Kira Tanaka", "Leo Martin"]
+CHANNELS = [("POS", "EatIn", "In-Store"), ("POS", "ToGo", "In-Store"), ("Kiosk", "ToGo", "Kiosk"),
+            ("Online", "ToGo", "Subway.com"), ("App", "ToGo", "Subway App"), ("Delivery", "Delivery", "Third Party")]
+CHANNEL_WEIGHTS = [30, 30, 8, 10, 10, 12]
+PROVIDERS = [("DoorDash", 45), ("Uber", 30), ("Grubhub", 20), ("ezCater", 5)]
+TAX_RATE = 0.0725
+
+
+def store_ids(count):
+    """Return count five-digit store ids as strings, e.g. ["10000", "10001"]."""
+    return [str(10000 + i) for i in range(count)]
+
+
+def date_range(start, end):
+    """Return the ISO dates from start to end inclusive."""
+    s = date.fromisoformat(start)
+    e = date.fromisoformat(end)
+    return [(s + timedelta(days=i)).isoformat() for i in range((e - s).days + 1)]
+
+
+def _rng(seed, kind, store, day):
+    return random.Random(f"{seed}:{kind}:{store}:{day}")
+
+
+@lru_cache(maxsize=4096)
+def _summary_txns(seed, store, day, txns_per_day):
+    rng = _rng(seed, "txn", store, day)
+    n = max(0, int(rng.gauss(txns_per_day, txns_per_day * 0.15)))
+    opening = datetime.fromisoformat(day).replace(hour=7)
+    out = []
+    for i in range(n):
+        channel, sale_type, source = rng.choices(CHANNELS, CHANNEL_WEIGHTS)[0]
+        units = rng.choices((1, 2, 3, 4, 6), (50, 28, 12, 7, 3))[0]
+        total = round(sum(rng.uniform(3.5, 12.5) for _ in range(units)), 2)
+        roll = rng.random()
+        txn_type = "Void" if roll < 0.01 else "Refund" if roll < 0.015 else "Sale"
+        provider = rng.choices([p for p, _ in PROVIDERS], [w for _, w in PROVIDERS])[0] if sale_type == "Delivery" else ""
+        ts = opening + timedelta(seconds=int(rng.uniform(0, 14 * 3600)))
+        net = round(total / (1 + TAX_RATE), 2)
+        out.append({
+            "restaurantNumber": store,
+            "businessDate": f"{day}T00:00:00",
+            "time": ts.strftime("%Y-%m-%dT%H:%M:%S.000"),
+            "type": txn_type,
+            "receiptNumber": "",
+            "clerkName": rng.choice(CLERKS),
+            "channel": channel,
+            "saleType": sale_type,
+            "units": units,
+            "orderSource": source,
+            "deliveryProvider": provider,
+            "deliveryPartner": provider,
+            "total": total,
+            "netTotal": net,
+            "tax": round(total - net, 2),
+            "paymentType": rng.choice(("Credit", "Credit", "Credit", "Cash", "GiftCard")),
+        })
+    out.sort(key=lambda t: t["time"])
+    for i, t in enumerate(out, 1):
+        t["receiptNumber"] = f"{int(store) % 1000:03d}{i:05d}"
+    return tuple(out)
+
+
+def transaction_summary(seed, store, day, txns_per_day):
+    """Transaction Summary records for one store-day."""
+    return list(_summary_txns(seed, store, day, txns_per_day))
+
+
+def _item(rng, product, depth, max_depth):
+    desc, plu, price = product
+    qty = 1 if depth else rng.choices((1, 2, 3), (85, 12, 3))[0]
+    item = {"description": desc, "plu": plu, "quantity": qty, "type": "Sale" if depth == 0 else "Modifier",
+            "originalPrice": price, "adjustedPrice": price, "discountCode": None, "discount": None}
+    if price and rng.random() < 0.06:
+        code, label, pct = rng.choice(DISCOUNTS)
+        cut = round(price * pct, 2) if pct else min(price, rng.choice((1.0, 2.0, 3.0)))
+        item.update(discountCode=code, discount=label, adjustedPrice=round(price - cut, 2))
+    if depth < max_depth:
+        item["modifiers"] = [_item(rng, rng.choice(MODIFIERS), depth + 1, max_depth) for _ in range(rng.choices((0, 1, 2, 3), (40, 30, 20, 10))[0])]
+        item["addons"] = []
+        item["extras"] = []
+        if depth == 0 and rng.random() < 0.25:
+            # Meal combos ship their sides as addons of type Sale.
+            for side in rng.sample(SIDES, rng.randint(1, 2)):
+                sub = _item(rng, side, depth + 1, max_depth)
+                sub["type"] = "Sale"
+                item["addons"].append(sub)
+        if rng.random() < 0.1:
+            item["extras"] = [_item(rng, rng.choice(MODIFIERS), depth + 1, max_depth)]
+    return item
+
+
+def transaction_details(seed, store, day, txns_per_day, max_depth=2):
+    """Transaction Details records (nested items) for one store-day."""
+    rng = _rng(seed, "detail", store, day)
+    out = []
+    for txn in _summary_txns(seed, store, day, txns_per_day):
+        rec = {k: txn[k] for k in ("restaurantNumber", "businessDate", "time", "type", "receiptNumber", "clerkName", "channel", "saleType", "total", "netTotal", "tax")}
+        rec["items"] = [_item(rng, rng.choice(MENU), 0, max_depth) for _ in range(txn["units"])]
+        out.append(rec)
+    return out
+
+
+@lru_cache(maxsize=None)
+def _day_totals(seed, store, day, txns_per_day):
+    txns = _summary_txns(seed, store, day, txns_per_day)
+    sales = [t for t in txns if t["type"] == "Sale"]
+    tp = [t for t in sales if t["deliveryProvider"]]
+    providers = {}
+    for t in tp:
+        p = providers.setdefault(t["deliveryProvider"], {"provider": t["deliveryProvider"], "transactions": 0, "netSales": 0.0, "sales": 0.0})
+        p["transactions"] += 1
+        p["netSales"] += t["netTotal"]
+        p["sales"] += t["total"]
+    return {
+        "netSales": round(sum(t["netTotal"] for t in sales), 2),
+        "tax": round(sum(t["tax"] for t in sales), 2),
+        "units": sum(t["units"] for t in sales),
+        "transactions": len(sales),
+        "cashCardTotal": round(sum(t["total"] for t in sales if t["paymentType"] != "GiftCard"), 2),
+        "thirdPartySales": round(sum(t["netTotal"] for t in tp), 2),
+        "thirdPartyTransactions": len(tp),
+        "grossSales": round(sum(t["total"] for t in sales), 2),
+        "providers": providers,
+    }
+
+
+def _sum_totals(totals):
+    out = {"netSales": 0.0, "tax": 0.0, "units": 0, "transactions": 0, "cashCardTotal": 0.0,
+           "thirdPartySales": 0.0, "thirdPartyTransactions": 0, "grossSales": 0.0, "providers": {}}
+    for t in totals:
+        for k in out:
+            if k != "providers":
+                out[k] += t[k]
+        for name, p in t["providers"].items():
+            q = out["providers"].setdefault(name, {"provider": name, "transactions": 0, "netSales": 0.0, "sales": 0.0})
+            q["transactions"] += p["transactions"]
+            q["netSales"] += p["netSales"]
+            q["sales"] += p["sales"]
+    return out
+
+
+def _sales_record(store, day, t):
+    return {"restaurantNumber": store, "businessDate": f"{day}T00:00:00", "netSales": round(t["netSales"], 2),
+            "tax": round(t["tax"], 2), "units": t["units"], "transactions": t["transactions"],
+            "cashCardTotal": round(t["cashCardTotal"], 2), "thirdPartySales": round(t["thirdPartySales"], 2),
+            "thirdPartyTransactions": t["thirdPartyTransactions"]}
+
+
+def sales_summary(seed, store, start, end, txns_per_day):
+    """Sales Summary: one record aggregated over the range."""
+    t = _sum_totals(_day_totals(seed, store, d, txns_per_day) for d in date_range(start, end))
+    return [_sales_record(store, start, t)]
+
+
+def daily_sales_summary(seed, store, start, end, txns_per_day):
+    """Daily Sales Summary: one record per day in the range."""
+    return [_sales_record(store, d, _day_totals(seed, store, d, txns_per_day)) for d in date_range(start, end)]
+
+
+def third_party_sales_summary(seed, store, start, end, txns_per_day):
+    """Third Party Sales Summary: one record aggregated over the range."""
+    t = _sum_totals(_day_totals(seed, store, d, txns_per_day) for d in date_range(start, end))
+    providers = [{"provider": p["provider"], "transactions": p["transactions"], "netSales": round(p["netSales"], 2),
+                  "sales": round(p["sales"], 2)} for p in sorted(t["providers"].values(), key=lambda p: p["provider"])]
+    return [{"restaurantNumber": store, "businessDate": f"{start}T00:00:00",
+             "totalSales": round(sum(p["sales"] for p in providers), 2),
+             "totalNetSales": round(sum(p["netSales"] for p in providers), 2),
+             "totalTransactions": sum(p["transactions"] for p in providers), "providers": providers}]
+
+
+def third_party_transaction_summary(seed, store, start, end, txns_per_day):
+    """Third Party Transaction Summary: the delivery transactions in the range."""
+    out = []
+    for d in date_range(start, end):
+        for t in _summary_txns(seed, store, d, txns_per_day):
+            if t["deliveryProvider"]:
+                out.append({"restaurantNumber": store, "businessDate": t["businessDate"], "time": t["time"],
+                            "provider": t["deliveryProvider"], "orderId": f"{t['deliveryProvider'][:2].upper()}{t['receiptNumber']}",
+                            "receiptNumber": t["receiptNumber"], "total": t["total"], "netTotal": t["netTotal"],
+                            "tax": t["tax"], "type": t["type"]})
+    return out
+
+
+def daily_timeclock(seed, store, start, end, today=None):
+    """Daily Timeclock: shifts for every day in the range; today's late shifts are still open."""
+    today = today or date.today().isoformat()
+    out = []
+    for d in date_range(start, end):
+        rng = _rng(seed, "clock", store, d)
+        base = datetime.fromisoformat(d)
+        for i in range(rng.randint(6, 14)):
+            cin = base + timedelta(hours=rng.choice((6, 7, 8, 10, 11, 14, 16)), minutes=rng.randint(0, 59))
+            cout = cin + timedelta(hours=rng.uniform(3, 9), seconds=rng.randint(0, 59))
+            open_shift = d == today and i % 3 == 0
+            out.append({"restaurantNumber": store, "employeeName": f"{rng.choice(CLERKS)} {i}".upper() if i % 5 == 0 else rng.choice(CLERKS),
+                        "employeeId": f"{store}-{i:03d}", "businessDate": f"{d}T00:00:00",
+                        "clockInDateTime": cin.strftime("%Y-%m-%dT%H:%M:%S"),
+                        "clockOutDateTime": None if open_shift else cout.replace(microsecond=0).strftime("%Y-%m-%dT%H:%M:%S")})
+    return out
+
+
+def payload(endpoint, seed, store, start, end, txns_per_day):
+    """Return the JSON body LiveIQ would send for one store and date range."""
+    if endpoint == "Sales Summary":
+        return sales_summary(seed, store, start, end, txns_per_day)
+    if endpoint == "Daily Sales Summary":
+        return daily_sales_summary(seed, store, start, end, txns_per_day)
+    if endpoint == "Daily Timeclock":
+        return daily_timeclock(seed, store, start, end)
+    if endpoint == "Third Party Sales Summary":
+        return third_party_sales_summary(seed, store, start, end, txns_per_day)
+    if endpoint == "Third Party Transaction Summary":
+        return third_party_transaction_summary(seed, store, start, end, txns_per_day)
+    if endpoint == "Transaction Summary":
+        return [t for d in date_range(start, end) for t in transaction_summary(seed, store, d, txns_per_day)]
+    if endpoint == "Transaction Details":
+        return [t for d in date_range(start, end) for t in transaction_details(seed, store, d, txns_per_day)]
+    raise KeyError(endpoint)
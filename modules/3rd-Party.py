@@ -6,12 +6,16 @@ from tkinter import messagebox, filedialog, Toplevel, StringVar
 from datetime import datetime, date, timedelta
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import tempfile
-import win32print
+try:
+    import win32print
+except ImportError:
+    win32print = None
 import urllib.parse
 import webbrowser
 import csv
 import json
 import os
+import sys
 import subprocess
 import smtplib
 import random
@@ -28,8 +32,15 @@ except ImportError:
     REPORTLAB_AVAILABLE = False
 
 TP_ENDPOINT = "Third Party Sales Summary"
-MAX_DAYS = 7
+MAX_DAYS = 92  # per-day calls run a SUBWAYIQ_WINDOW_DAYS window at a time and resume from the rollup
 SCRIPT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+MODULES_DIR = os.path.dirname(os.path.abspath(__file__))
+if MODULES_DIR not in sys.path:
+    sys.path.insert(0, MODULES_DIR)
+from liveiq import compare, entries, metrics, profiling, rollup, schemas, windows
+
+SUMMARY_KEYS = ("TotSales", "TotNet", "TotTxns", "DD-T", "DD-N", "DD-S", "GH-T", "GH-N", "GH-S",
+                "UE-T", "UE-N", "UE-S", "EC-T", "EC-N", "EC-S")
 
 def generate_unique_filename(ext):
     """Generate unique filename in reports/ dir (3rd-Party-XXXX.ext, alphanumeric)."""
@@ -383,9 +394,13 @@ def create_toolbar(window, txt, title, tp_data, daily_breakdown, start_date, end
             pdf_btn.config(state=tk.NORMAL)
     return enable_toolbar
 
+@profiling.profiled("3rd-Party")
 def run(window):
     """Run the 3rd-Party report for selected stores and date range."""
     from __main__ import get_selected_start_date, get_selected_end_date, fetch_data, store_vars, config_accounts, handle_rate_limit, log_error, config_max_workers, _password_validated, RateLimitError, config_emails, config_smtp, SCRIPT_DIR
+    fetch_data = metrics.instrument(fetch_data, config_accounts, RateLimitError)
+    metrics.start_exporter(SCRIPT_DIR)
+    roll = rollup.open_rollup(SCRIPT_DIR)
 
     if not _password_validated:
         messagebox.showerror("Access Denied", "Password validation required.", parent=window)
@@ -476,9 +491,18 @@ def run(window):
                 window.after(0, enable_toolbar)
                 return
 
+            # Stores with every day already in the rollup skip the range fetch; rolled-up store-days skip the daily one
+            day_strs = [(start + timedelta(days=x)).isoformat() for x in range((end - start).days + 1)]
+            fetch_map, rolled, rolled_rows = store_map, [], {}
+            if roll:
+                rolled, rest, rolled_rows = roll.covered("third_party", list(store_map), day_strs)
+                fetch_map = {sid: store_map[sid] for sid in rest}
+
             # Start report
             log(f"3rd-Party Sales Report: {start_date_str} to {end_date_str}", "title")
-            log(f"Fetching data for {len(store_map)} stores...", "sep")
+            log(f"Fetching data for {len(fetch_map)} stores...", "sep")
+            if rolled:
+                log(f"{len(rolled)} store(s) answered from the local rollup.", "sep")
             log("", None)
 
             # Header for store/day views
@@ -490,10 +514,14 @@ def run(window):
             log(hdr, "heading")
             log("─" * 75, "sep")
 
+            # Range totals for rolled-up stores are the sums of their daily rows
+            for sid in rolled:
+                tp_data.append({"Store": sid, **rollup.total((rolled_rows[(sid, d)] for d in day_strs), SUMMARY_KEYS)})
+
             # Fetch top summary per store
             futures = {}
             with ThreadPoolExecutor(max_workers=min(config_max_workers, len(selected_stores))) as ex:
-                for sid, (aname, cid, ckey) in store_map.items():
+                for sid, (aname, cid, ckey) in fetch_map.items():
                     fut = ex.submit(fetch_data, TP_ENDPOINT, sid, start_date_str, end_date_str, cid, ckey)
                     futures[fut] = (sid, cid, ckey)
 
@@ -519,30 +547,7 @@ def run(window):
 
                     data = res.get("data", []) or []
                     obj = data[0] if data else {}
-                    ts = float(obj.get("totalSales", 0.0))
-                    n = float(obj.get("totalNetSales", 0.0))
-                    tt = int(obj.get("totalTransactions", 0))
-                    provs = obj.get("providers", [])
-                    pm = {p.get("provider", "").lower(): p for p in provs}
-                    def g(p, k, d=0):
-                        return pm.get(p, {}).get(k, d)
-                    dd_t = int(g('doordash', 'transactions', 0))
-                    dd_n = float(g('doordash', 'netSales', 0.0))
-                    dd_s = float(g('doordash', 'sales', 0.0))
-                    gh_t = int(g('grubhub', 'transactions', 0))
-                    gh_n = float(g('grubhub', 'netSales', 0.0))
-                    gh_s = float(g('grubhub', 'sales', 0.0))
-                    ue_t = int(g('uber', 'transactions', 0))
-                    ue_n = float(g('uber', 'netSales', 0.0))
-                    ue_s = float(g('uber', 'sales', 0.0))
-                    ec_t = int(g('ezcater', 'transactions', 0))
-                    ec_n = float(g('ezcater', 'netSales', 0.0))
-                    ec_s = float(g('ezcater', 'sales', 0.0))
-                    tp_data.append({"Store": sid, "TotSales": ts, "TotNet": n, "TotTxns": tt, 
-                                    "DD-T": dd_t, "DD-N": dd_n, "DD-S": dd_s, 
-                                    "GH-T": gh_t, "GH-N": gh_n, "GH-S": gh_s, 
-                                    "UE-T": ue_t, "UE-N": ue_n, "UE-S": ue_s, 
-                                    "EC-T": ec_t, "EC-N": ec_n, "EC-S": ec_s})
+                    tp_data.append(entries.tp_entry(sid, obj))
 
             # Log Third-Party Summary in selected_stores order
             for sid in selected_stores:
@@ -558,18 +563,22 @@ def run(window):
                 if not found:
                     log(f"Store {sid}: No data available.", "sep")
 
-            # Fetch daily breakdown per store
-            days = [start + timedelta(days=x) for x in range((end - start).days + 1)]
-            for day in days:
-                dstr = day.strftime("%Y-%m-%d")
+            # Fetch the daily breakdown a window at a time; all store-days of a window share one pool
+            spans = windows.day_windows(start, end)
+            for span in spans:
+                fresh = []
                 futures = {}
                 with ThreadPoolExecutor(max_workers=min(config_max_workers, len(selected_stores))) as ex:
-                    for sid, (aname, cid, ckey) in store_map.items():
-                        fut = ex.submit(fetch_data, TP_ENDPOINT, sid, dstr, dstr, cid, ckey)
-                        futures[fut] = (sid, cid, ckey)
+                    for dstr in span:
+                        for sid, (aname, cid, ckey) in store_map.items():
+                            if (sid, dstr) in rolled_rows:
+                                daily_breakdown[dstr].append({"Store": sid, **rolled_rows[(sid, dstr)]})
+                                continue
+                            fut = ex.submit(fetch_data, TP_ENDPOINT, sid, dstr, dstr, cid, ckey)
+                            futures[fut] = (sid, dstr, cid, ckey)
 
                     for fut in as_completed(futures):
-                        sid, cid, ckey = futures[fut]
+                        sid, dstr, cid, ckey = futures[fut]
                         try:
                             res = fut.result()
                             log_error(f"API response for store {sid} on {dstr}: {json.dumps(res, indent=2)}", endpoint=TP_ENDPOINT)
@@ -590,62 +599,66 @@ def run(window):
 
                         data = res.get("data", []) or []
                         obj = data[0] if data else {}
-                        date_key = next((k for k in obj if "date" in k.lower()), None)
-                        raw = obj.get(date_key, dstr)
-                        date = raw.split("T")[0] if "T" in str(raw) else str(raw)
                         try:
-                            parsed_date = datetime.strptime(date, "%Y-%m-%d").date()
-                            date = parsed_date.strftime("%Y-%m-%d")
-                        except ValueError:
-                            log_error(f"Invalid date format for store {sid} on {dstr}: {raw}", endpoint=TP_ENDPOINT)
+                            date = schemas.day_reader(data)(obj, dstr)
+                        except ValueError as e:
+                            log_error(f"Invalid date format for store {sid} on {dstr}: {e}", endpoint=TP_ENDPOINT)
                             continue
-                        ts = float(obj.get("totalSales", 0.0))
-                        n = float(obj.get("totalNetSales", 0.0))
-                        tt = int(obj.get("totalTransactions", 0))
-                        provs = obj.get("providers", [])
-                        pm = {p.get("provider", "").lower(): p for p in provs}
-                        def g(p, k, d=0):
-                            return pm.get(p, {}).get(k, d)
-                        dd_t = int(g('doordash', 'transactions', 0))
-                        dd_n = float(g('doordash', 'netSales', 0.0))
-                        dd_s = float(g('doordash', 'sales', 0.0))
-                        gh_t = int(g('grubhub', 'transactions', 0))
-                        gh_n = float(g('grubhub', 'netSales', 0.0))
-                        gh_s = float(g('grubhub', 'sales', 0.0))
-                        ue_t = int(g('uber', 'transactions', 0))
-                        ue_n = float(g('uber', 'netSales', 0.0))
-                        ue_s = float(g('uber', 'sales', 0.0))
-                        ec_t = int(g('ezcater', 'transactions', 0))
-                        ec_n = float(g('ezcater', 'netSales', 0.0))
-                        ec_s = float(g('ezcater', 'sales', 0.0))
-                        daily_breakdown[date].append({"Store": sid, "TotSales": ts, "TotNet": n, "TotTxns": tt, 
-                                                      "DD-T": dd_t, "DD-N": dd_n, "DD-S": dd_s, 
-                                                      "GH-T": gh_t, "GH-N": gh_n, "GH-S": gh_s, 
-                                                      "UE-T": ue_t, "UE-N": ue_n, "UE-S": ue_s, 
-                                                      "EC-T": ec_t, "EC-N": ec_n, "EC-S": ec_s})
-
-                # Log per-day summaries only for multi-day
-                if not is_single_day:
-                    log("", None)
-                    log(f"Per-Day Third-Party Summary ({dstr})", "title")
-                    log("─" * 75, "sep")
-                    log(f"{'Store':<6} {'TotSales':>10} {'TotNet':>8} {'TotTxns':>7} {'DD-T':>5} {'DD-N':>8} {'DD-S':>8} {'GH-T':>5} {'GH-N':>8} {'GH-S':>8} {'UE-T':>5} {'UE-N':>8} {'UE-S':>8} {'EC-T':>5} {'EC-N':>8} {'EC-S':>8}", "heading")
-                    log("─" * 75, "sep")
-                    for sid in selected_stores:
-                        found = False
-                        for entry in daily_breakdown[dstr]:
-                            if entry["Store"] == sid:
-                                found = True
-                                log(f"{entry['Store']:<6} {entry['TotSales']:>10.2f} {entry['TotNet']:>8.2f} {entry['TotTxns']:>7} "
-                                    f"{entry['DD-T']:>5} {entry['DD-N']:>8.2f} {entry['DD-S']:>8.2f} "
-                                    f"{entry['GH-T']:>5} {entry['GH-N']:>8.2f} {entry['GH-S']:>8.2f} "
-                                    f"{entry['UE-T']:>5} {entry['UE-N']:>8.2f} {entry['UE-S']:>8.2f} "
-                                    f"{entry['EC-T']:>5} {entry['EC-N']:>8.2f} {entry['EC-S']:>8.2f}")
-                        if not found:
-                            log(f"{sid:<6} {0.0:>10.2f} {0.0:>8.2f} {0:>7} {0:>5} {0.0:>8.2f} {0.0:>8.2f} "
-                                f"{0:>5} {0.0:>8.2f} {0.0:>8.2f} {0:>5} {0.0:>8.2f} {0.0:>8.2f} "
-                                f"{0:>5} {0.0:>8.2f} {0.0:>8.2f}")
-                    log("─" * 75, "sep")
+                        entry = entries.tp_entry(sid, obj)
+                        daily_breakdown[date].append(entry)
+                        fresh.append((sid, date, entry))
+
+                # Roll the fetched store-days up for later runs (settled days only)
+                if roll:
+                    roll.put("third_party", fresh)
+                futures.clear()
+                if len(spans) > 1:
+                    from_rollup = sum((sid, d) in rolled_rows for sid in store_map for d in span)
+                    log(f"{span[0]} → {span[-1]}: {len(fresh)} store-days fetched, {from_rollup} from the rollup", "sep")
+
+                for dstr in span:
+                    # Log per-day summaries only for multi-day
+                    if not is_single_day:
+                        log("", None)
+                        log(f"Per-Day Third-Party Summary ({dstr})", "title")
+                        log("─" * 75, "sep")
+                        log(f"{'Store':<6} {'TotSales':>10} {'TotNet':>8} {'TotTxns':>7} {'DD-T':>5} {'DD-N':>8} {'DD-S':>8} {'GH-T':>5} {'GH-N':>8} {'GH-S':>8} {'UE-T':>5} {'UE-N':>8} {'UE-S':>8} {'EC-T':>5} {'EC-N':>8} {'EC-S':>8}", "heading")
+                        log("─" * 75, "sep")
+                        for sid in selected_stores:
+                            found = False
+                            for entry in daily_breakdown[dstr]:
+                                if entry["Store"] == sid:
+                                    found = True
+                                    log(f"{entry['Store']:<6} {entry['TotSales']:>10.2f} {entry['TotNet']:>8.2f} {entry['TotTxns']:>7} "
+                                        f"{entry['DD-T']:>5} {entry['DD-N']:>8.2f} {entry['DD-S']:>8.2f} "
+                                        f"{entry['GH-T']:>5} {entry['GH-N']:>8.2f} {entry['GH-S']:>8.2f} "
+                                        f"{entry['UE-T']:>5} {entry['UE-N']:>8.2f} {entry['UE-S']:>8.2f} "
+                                        f"{entry['EC-T']:>5} {entry['EC-N']:>8.2f} {entry['EC-S']:>8.2f}")
+                            if not found:
+                                log(f"{sid:<6} {0.0:>10.2f} {0.0:>8.2f} {0:>7} {0:>5} {0.0:>8.2f} {0.0:>8.2f} "
+                                    f"{0:>5} {0.0:>8.2f} {0.0:>8.2f} {0:>5} {0.0:>8.2f} {0.0:>8.2f} "
+                                    f"{0:>5} {0.0:>8.2f} {0.0:>8.2f}")
+                        log("─" * 75, "sep")
+
+            # Period-over-period tables: comparison days come from the rollup, only days it lacks are fetched
+            # (one call per store-day, since a Third Party Sales Summary totals its whole range)
+            periods = compare.selected()
+            if periods:
+                def fetch_run(sid, cid, ckey, first, last):
+                    res = fetch_data(TP_ENDPOINT, sid, first, last, cid, ckey)
+                    if res.get("error"):
+                        raise compare.FetchError(res["error"])
+                    data = res.get("data", []) or []
+                    return {first: entries.tp_entry(sid, data[0] if data else {})}
+
+                totals, failed = compare.collect(roll, "third_party", store_map, periods, start, end, fetch_run, ("TotSales", "TotTxns"),
+                                                 run_days=1, max_workers=config_max_workers)
+                for sid, err in failed.items():
+                    log_error(f"Comparison fetch failed for store {sid}: {err}", sid, TP_ENDPOINT)
+                    log(f"⚠️ Store {sid}: comparison data incomplete ({err}).", "sep")
+                current = {entry["Store"]: entry for entry in tp_data}
+                for line, tag in compare.report_lines(selected_stores, current, totals, (("TotSales", "TotSales", True), ("TotTxns", "TotTxns", False))):
+                    log(line, tag)
 
             # Log per-store daily breakdown only for multi-day
             if not is_single_day:
@@ -679,7 +692,7 @@ def run(window):
             log(f"❌ Report error: {ex}", "sep")
             window.after(0, enable_toolbar)
 
-    threading.Thread(target=worker, daemon=True).start()
+    threading.Thread(target=metrics.timed(profiling.profiled("3rd-Party", "worker")(worker), "3rd-Party"), daemon=True).start()
 
 if __name__ == "__main__":
     config_emails = []
@@ -0,0 +1,206 @@
+import threading
+import tkinter as tk
+from tkinter.scrolledtext import ScrolledText
+from tkinter import messagebox
+from datetime import date, timedelta
+from collections import Counter
+import os
+import sys
+
+ENDPOINT_NAME = "Backfill"
+SCRIPT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+MODULES_DIR = os.path.dirname(os.path.abspath(__file__))
+if MODULES_DIR not in sys.path:
+    sys.path.insert(0, MODULES_DIR)
+from liveiq import backfill, compare, details, entries, metrics, pacing, profiling, rollup, schemas, windows
+
+SOURCES = ("sales", "transactions", "third_party", "labor", "items_sold", "discounts")
+PROGRESS_EVERY = 50  # log a progress line every this many finished fetches
+
+def backfill_months():
+    """Months walked back from the last settled day, from SUBWAYIQ_BACKFILL_MONTHS (default 3)."""
+    try:
+        return max(1, int(os.environ.get("SUBWAYIQ_BACKFILL_MONTHS", "") or 3))
+    except ValueError:
+        return 3
+
+def backfill_sources():
+    """Sources named in SUBWAYIQ_BACKFILL_SOURCES (default all), in SOURCES order."""
+    names = {name.strip().lower() for name in os.environ.get("SUBWAYIQ_BACKFILL_SOURCES", "").split(",") if name.strip()}
+    return [s for s in SOURCES if not names or s in names or "all" in names]
+
+def zero_row(source):
+    """A rollup row of zeros: the store answered but had nothing that day."""
+    return {key: 0 for _, key, _ in rollup.SOURCES[source]}
+
+def store_sales(roll, sid, days, data):
+    got = entries.daily_entries(sid, data)
+    roll.put("sales", [(sid, d, got.get(d) or zero_row("sales")) for d in days])
+
+def store_transactions(roll, sid, days, data):
+    got = entries.day_summaries(sid, data, days[0])
+    roll.put("transactions", [(sid, d, got.get(d) or entries.empty_summary()) for d in days])
+
+def store_third_party(roll, sid, days, data):
+    roll.put("third_party", [(sid, days[0], entries.tp_entry(sid, data[0] if data else {}))])
+
+def store_labor(roll, sid, days, data):
+    totals, employees = entries.labor_rollup_rows(schemas.DAILY_TIMECLOCK.decode_all(data), [sid], days)
+    roll.put("labor", totals)
+    roll.put_employees(employees)
+
+def store_items_sold(roll, sid, days, data):
+    roll.put_partials("items_sold", [(sid, days[0], details.item_rows(data))])
+
+def store_discounts(roll, sid, days, data):
+    roll.put_partials("discounts", [(sid, days[0], details.discount_rows(data))])
+
+def make_sources(names, window_days):
+    """backfill.Source objects for the named sources, fetched the way each report fetches them."""
+    available = {
+        "sales": backfill.Source("sales", "Daily Sales Summary", window_days, backfill.in_rollup("sales"), store_sales),
+        "transactions": backfill.Source("transactions", "Transaction Summary", window_days, backfill.in_rollup("transactions"), store_transactions),
+        "third_party": backfill.Source("third_party", "Third Party Sales Summary", 1, backfill.in_rollup("third_party"), store_third_party),
+        "labor": backfill.Source("labor", "Daily Timeclock", window_days, backfill.in_rollup("labor"), store_labor),
+        "items_sold": backfill.Source("items_sold", "Transaction Details", 1, backfill.in_partials("items_sold"), store_items_sold),
+        "discounts": backfill.Source("discounts", "Transaction Details", 1, backfill.in_partials("discounts"), store_discounts),
+    }
+    return [available[name] for name in names]
+
+@profiling.profiled("Backfill")
+def run(window):
+    """Backfill the rollup for every configured store over the last SUBWAYIQ_BACKFILL_MONTHS months."""
+    from __main__ import fetch_data, config_accounts, log_error, config_max_workers, _password_validated, RateLimitError, SCRIPT_DIR
+    fetch_data = metrics.instrument(fetch_data, config_accounts, RateLimitError)
+    metrics.start_exporter(SCRIPT_DIR)
+    roll = rollup.open_rollup(SCRIPT_DIR)
+
+    if not _password_validated:
+        messagebox.showerror("Access Denied", "Password validation required.", parent=window)
+        window.destroy()
+        return
+    if roll is None:
+        messagebox.showerror("Rollup Required", "Set SUBWAYIQ_ROLLUP_DB to the rollup file the backfill should fill.", parent=window)
+        window.destroy()
+        return
+
+    # Set up window
+    window.title("Backfill")
+    parent = window.master
+    parent.update_idletasks()
+    px, py = parent.winfo_rootx(), parent.winfo_rooty()
+    window.geometry(f"{int(window.winfo_screenwidth()*0.6)}x{int(window.winfo_screenheight()*0.6)}+{px}+{py}")
+    window.resizable(True, True)
+    window.minsize(800, 600)
+
+    stop = threading.Event()
+    toolbar = tk.Frame(window, bg="#f0f0f0")
+    toolbar.pack(fill="x", pady=(8, 0), padx=8)
+    txt = ScrolledText(window, wrap="none", font=("Courier New", 11), fg="black", state="normal")
+
+    def request_stop():
+        stop.set()
+        stop_btn.config(state=tk.DISABLED)
+        log("Stopping after the fetches in flight; run the backfill again to resume.", "sep")
+
+    stop_btn = tk.Button(toolbar, text="Stop", command=request_stop, bg="#005228", fg="#ecc10c", font=("Arial", 10))
+    stop_btn.pack(side="right", padx=4)
+    copy_btn = tk.Button(toolbar, text="Copy", bg="#005228", fg="#ecc10c", font=("Arial", 10),
+                         command=lambda: (window.clipboard_clear(), window.clipboard_append(txt.get("1.0", "end-1c"))))
+    copy_btn.pack(side="right", padx=4)
+    window.bind("<Destroy>", lambda e: stop.set() if e.widget is window else None, add="+")
+
+    txt.pack(fill="both", expand=True, padx=8, pady=(4, 8))
+    hbar = tk.Scrollbar(window, orient="horizontal", command=txt.xview)
+    hbar.pack(fill="x", padx=8)
+    txt.configure(xscrollcommand=hbar.set)
+    txt.tag_configure("title", font=("Courier New", 12, "bold"), foreground="black")
+    txt.tag_configure("heading", font=("Courier New", 11, "bold"), foreground="black")
+    txt.tag_configure("sep", foreground="#888888")
+
+    def log(line="", tag=None):
+        txt.configure(state="normal")
+        txt.insert("end", line + "\n", tag or ())
+        txt.see("end")
+        txt.update()
+        txt.configure(state="normal")
+        log_error(f"Log: {line}", endpoint=ENDPOINT_NAME)
+
+    def worker():
+        try:
+            store_map = {}
+            for acct in config_accounts:
+                name = acct.get("Name", "")
+                cid = acct.get("ClientID", "")
+                ckey = acct.get("ClientKEY", "")
+                if not all([name, cid, ckey]):
+                    log(f"Skipping invalid account: {name or 'Unknown'}", "sep")
+                    log_error(f"Invalid account: Name={name}, ClientID={cid}", endpoint=ENDPOINT_NAME)
+                    continue
+                for sid in acct.get("StoreIDs", []):
+                    if sid not in store_map:
+                        store_map[sid] = (name, cid, ckey)
+
+            if not store_map:
+                log("No valid accounts with stores found.", "sep")
+                log_error("No valid accounts with stores", endpoint=ENDPOINT_NAME)
+                return
+
+            # The last settled day back through the requested months; later days are never rolled up
+            end = date.today() - timedelta(days=roll.settle)
+            start = end
+            for _ in range(backfill_months()):
+                start = compare.shift(start, "mom")
+            start += timedelta(days=1)
+            days = [(start + timedelta(days=x)).isoformat() for x in range((end - start).days + 1)]
+            stores = list(store_map)
+            sources = make_sources(backfill_sources(), windows.window_days())
+
+            log(f"Backfill: {start.isoformat()} → {end.isoformat()}", "title")
+            log(f"{len(stores)} stores; sources: {', '.join(s.name for s in sources)}", "sep")
+            tasks = backfill.plan(roll, sources, stores, days)
+            pacer = pacing.shared()
+            per_account = Counter(store_map[task.sid][1] for task in tasks)
+            busiest = max(per_account.values(), default=0)
+            log(f"{len(tasks)} fetches to go (about {busiest / pacer.rate:.0f} min at {pacer.rate} requests/min per account).", "sep")
+            log("", None)
+
+            counts = {"done": 0, "failed": 0}
+
+            def on_done(task, error):
+                if error is None:
+                    counts["done"] += 1
+                else:
+                    counts["failed"] += 1
+                    log_error(f"Backfill fetch failed for {task}: {error}", task.sid, task.endpoint)
+                    if isinstance(error, RateLimitError):
+                        log(f"⚠️ {task}: Rate limit hit; left for the next run.", "sep")
+                    else:
+                        log(f"❌ {task}: {error}", "sep")
+                finished = counts["done"] + counts["failed"]
+                if finished % PROGRESS_EVERY == 0:
+                    log(f"{finished}/{len(tasks)} fetches finished ({counts['failed']} failed).", "sep")
+
+            done, failed = backfill.run(roll, tasks, pacer.wrap(fetch_data, RateLimitError), store_map, stop, on_done,
+                                        max_workers=max(1, config_max_workers))
+            log("", None)
+            log(f"{done} fetches stored, {failed} failed, {len(tasks) - done - failed} not started.", "heading")
+
+            # Coverage: what is still missing after this run
+            log("", None)
+            log("Coverage Gaps", "title")
+            log("─" * 60, "sep")
+            for name, missing in backfill.gaps(roll, sources, stores, days).items():
+                total = len(stores) * len(days)
+                gap_days = sum((date.fromisoformat(b) - date.fromisoformat(a)).days + 1 for ranges in missing.values() for a, b in ranges)
+                log(f"{name:<14} {total - gap_days:>8}/{total} store-days on file", "heading")
+                for sid, ranges in missing.items():
+                    log(f"  {sid:<6} " + ", ".join(a if a == b else f"{a}..{b}" for a, b in ranges))
+            log("─" * 60, "sep")
+        except Exception as ex:
+            log_error(f"Worker thread error: {ex}", endpoint=ENDPOINT_NAME)
+            log(f"❌ Backfill error: {ex}", "sep")
+        finally:
+            window.after(0, lambda: stop_btn.config(state=tk.DISABLED))
+
+    threading.Thread(target=metrics.timed(profiling.profiled("Backfill", "worker")(worker), "Backfill"), daemon=True).start()
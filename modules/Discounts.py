@@ -3,7 +3,7 @@ import threading
 import tkinter as tk
 from tkinter.scrolledtext import ScrolledText
 from tkinter import messagebox, filedialog, Toplevel, StringVar
-from datetime import datetime, timedelta
+from datetime import datetime
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import tempfile
 import urllib.parse
@@ -11,6 +11,7 @@ import webbrowser
 import csv
 import json
 import os
+import sys
 import subprocess
 import smtplib
 import random
@@ -27,8 +28,12 @@ except ImportError:
     REPORTLAB_AVAILABLE = False
 
 ENDPOINT_NAME = "Transaction Details"
-MAX_DAYS = 7
+MAX_DAYS = 92
 SCRIPT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+MODULES_DIR = os.path.dirname(os.path.abspath(__file__))
+if MODULES_DIR not in sys.path:
+    sys.path.insert(0, MODULES_DIR)
+from liveiq import details, intraday, metrics, parallel, profiling, rollup, stream, windows
 
 def generate_unique_filename(ext):
     """Generate unique filename in reports/ dir (Discounts-XXXX.ext, alphanumeric)."""
@@ -41,6 +46,34 @@ def generate_unique_filename(ext):
         if not os.path.exists(fname):
             return fname
 
+# Shared with the process-pool stage (liveiq.parallel), which runs it in worker processes
+reduce_discounts = details.discount_rows
+
+def _add(entry, count, orig, adj, save):
+    entry["count"] += count
+    entry["orig"] += orig
+    entry["adj"] += adj
+    entry["save"] += save
+
+def fold_discounts(rows, dmap, smap, dimap, sid, day_str):
+    """Add one store-day's reduce_discounts rows to the per-discount, per-store, per-day and per-store-item tallies."""
+    sm = smap.setdefault(sid, {"count": 0, "save": 0.0})
+    day = dimap.setdefault(day_str, {})
+    per_store = daily_items[sid]
+    for code, desc, count, orig, adj, save in rows:
+        key = f"{code}|{desc}"
+        e = dmap.setdefault(key, {
+            "code": code, "desc": desc,
+            "count": 0, "orig": 0.0, "adj": 0.0, "save": 0.0,
+            "stores": {}
+        })
+        _add(e, count, orig, adj, save)
+        _add(e["stores"].setdefault(sid, {"count": 0, "orig": 0.0, "adj": 0.0, "save": 0.0}), count, orig, adj, save)
+        sm["count"] += count
+        sm["save"] += save
+        _add(day.setdefault(key, {"code": code, "desc": desc, "count": 0, "orig": 0.0, "adj": 0.0, "save": 0.0}), count, orig, adj, save)
+        _add(per_store.setdefault((code, desc), {"count": 0, "orig": 0.0, "adj": 0.0, "save": 0.0}), count, orig, adj, save)
+
 def create_toolbar(window, txt, title, discounts_data, store_summary, daily_breakdown, start_date, end_date, selected_stores, daily_items, config_emails, config_smtp):
     """Create revamped toolbar with Export .PDF/.JSON/.TXT/.CSV, Email, Copy."""
     toolbar = tk.Frame(window, bg="#f0f0f0")
@@ -770,9 +803,19 @@ def open_email_dialog(window, txt, discounts_data, store_summary, daily_breakdow
         tk.Button(btn_frame, text="Send Now", command=send_now, bg="#005228", fg="#ecc10c").pack(side="left", padx=5)
     tk.Button(btn_frame, text="Close", command=dialog.destroy, bg="#005228", fg="#ecc10c").pack(side="right", padx=5)
 
+@profiling.profiled("Discounts")
 def run(window):
     """Run the Discounts report for selected stores and date range."""
     from __main__ import get_selected_start_date, get_selected_end_date, fetch_data, store_vars, config_accounts, handle_rate_limit, log_error, config_max_workers, _password_validated, RateLimitError, config_emails, config_smtp, SCRIPT_DIR
+    fetch_data = metrics.instrument(fetch_data, config_accounts, RateLimitError)
+    # Workers are only given raw bodies: pickling a parsed list to them costs more than walking it here
+    procs = parallel.pool() if stream.host_fetch() else None
+    fetch_stream = stream.fetcher(stream.host_fetch(), raw=bool(procs))
+    if fetch_stream:
+        fetch_stream = metrics.instrument(fetch_stream, config_accounts, RateLimitError)
+    metrics.start_exporter(SCRIPT_DIR)
+    roll = rollup.open_rollup(SCRIPT_DIR)
+    today = intraday.tracker("discounts")
 
     if not _password_validated:
         messagebox.showerror("Access Denied", "Password validation required.", parent=window)
@@ -834,63 +877,6 @@ def run(window):
         txt.configure(state="normal")
         log_error(f"Log: {line}", endpoint=ENDPOINT_NAME)
 
-    def flatten(items):
-        out = []
-        for it in items or []:
-            out.append(it)
-            out += flatten(it.get("modifiers", []) + it.get("addons", []) + it.get("extras", []))
-        return out
-
-    def scan_item(it, dmap, smap, dimap, sid, day_str):
-        code = (it.get("discountCode") or "").strip()
-        desc = (it.get("discount") or it.get("description", "")).strip()
-        orig = float(it.get("originalPrice") or 0)
-        adj = float(it.get("adjustedPrice") or orig)
-        save = orig - adj
-        if code and save > 0:
-            key = f"{code}|{desc}"
-            e = dmap.setdefault(key, {
-                "code": code, "desc": desc,
-                "count": 0, "orig": 0.0, "adj": 0.0, "save": 0.0,
-                "stores": {}
-            })
-            e["count"] += 1
-            e["orig"] += orig
-            e["adj"] += adj
-            e["save"] += save
-
-            se = e["stores"].setdefault(sid, {
-                "count": 0, "orig": 0.0, "adj": 0.0, "save": 0.0
-            })
-            se["count"] += 1
-            se["orig"] += orig
-            se["adj"] += adj
-            se["save"] += save
-
-            sm = smap.setdefault(sid, {"count": 0, "save": 0.0})
-            sm["count"] += 1
-            sm["save"] += save
-
-            de = dimap.setdefault(day_str, {}).setdefault(key, {
-                "code": code, "desc": desc,
-                "count": 0, "orig": 0.0, "adj": 0.0, "save": 0.0
-            })
-            de["count"] += 1
-            de["orig"] += orig
-            de["adj"] += adj
-            de["save"] += save
-
-            pe = daily_items[sid].setdefault((code, desc), {
-                "count": 0, "orig": 0.0, "adj": 0.0, "save": 0.0
-            })
-            pe["count"] += 1
-            pe["orig"] += orig
-            pe["adj"] += adj
-            pe["save"] += save
-
-        for sub in it.get("modifiers", []) + it.get("addons", []) + it.get("extras", []):
-            scan_item(sub, dmap, smap, dimap, sid, day_str)
-
     def worker():
         try:
             if not selected_stores:
@@ -928,47 +914,82 @@ def run(window):
             daily_discounts = defaultdict(lambda: defaultdict(lambda: {"count": 0, "orig": 0.0, "adj": 0.0, "save": 0.0}))
             global daily_items
 
-            days = []
-            current = start
-            while current <= end:
-                days.append(current)
-                current += timedelta(days=1)
+            def fetch_day(sid, day_str, cid, ckey):
+                # Runs on the pool thread: reduce the payload to discount rows while other fetches are in flight
+                # An unsettled day may be walked twice (see below), so it is only streamed as a raw body for the pool
+                fetch = fetch_stream if fetch_stream and (procs or not today.tracks(day_str)) else fetch_data
+                res = fetch(ENDPOINT_NAME, sid, day_str, day_str, cid, ckey)
+                if res.get("error"):
+                    return res, None
+                # An unsettled day is refreshed incrementally: only transactions no earlier run reduced are walked,
+                # unless one it kept was edited or removed since, and then the whole day is reduced again
+                with today.open(sid, day_str) as kept:
+                    body, current = res.get("data"), {}
+                    if procs and isinstance(body, bytes):
+                        # Process mode: a worker decodes and reduces the raw body; only its compact rows come back
+                        rows, current = procs.submit(parallel.discount_rows, body, kept and kept.seen).result()
+                        res = parallel.summary(body)
+                        full = lambda: procs.submit(parallel.discount_rows, body).result()[0]
+                    else:
+                        # Streaming mode reduces transactions as they are decoded, and logs a summary instead of the payload
+                        data = body or []
+                        try:
+                            rows = reduce_discounts(kept.fresh(data, current) if kept else data)
+                        finally:
+                            if fetch is fetch_stream:
+                                data.close()
+                        if fetch is fetch_stream:
+                            res = data.summary()
+                        full = lambda: reduce_discounts(data)
+                    if kept:
+                        rows = kept.commit(current, rows, full)
+                return res, rows
+
+            # One window at a time: fetch, fold, then let the payloads go.
+            # Store-days checkpointed by an earlier run are read back instead of fetched.
+            spans = windows.day_windows(start, end)
+            for span in spans:
+                cached = roll.get_partials("discounts", store_map, span) if roll else {}
+                reduced = [(sid, day_str, rows) for (sid, day_str), rows in cached.items()]
+                futures = {}
+                with ThreadPoolExecutor(max_workers=config_max_workers) as ex:
+                    for sid, (name, cid, ckey) in store_map.items():
+                        for day_str in span:
+                            if (sid, day_str) in cached:
+                                continue
+                            fut = ex.submit(fetch_day, sid, day_str, cid, ckey)
+                            futures[fut] = (sid, day_str, cid, ckey)
+
+                    for fut in as_completed(futures):
+                        sid, day_str, cid, ckey = futures[fut]
+                        try:
+                            res, rows = fut.result()
+                            log_error(f"API response for store {sid} on {day_str}: {json.dumps(res, indent=2)}", endpoint=ENDPOINT_NAME)
+                        except RateLimitError as ex:
+                            log_error(f"Rate limit for store {sid} on {day_str}: {ex}", endpoint=ENDPOINT_NAME)
+                            log(f"⚠️ Store {sid} on {day_str}: Rate limit hit; skipping.", "sep")
+                            continue
+                        except Exception as ex:
+                            log_error(f"Fetch failed for store {sid} on {day_str}: {ex}", endpoint=ENDPOINT_NAME)
+                            log(f"❌ Store {sid} on {day_str}: Exception: {ex}", "sep")
+                            continue
 
-            futures = {}
-            lock = threading.Lock()
-            with ThreadPoolExecutor(max_workers=config_max_workers) as ex:
-                for sid, (name, cid, ckey) in store_map.items():
-                    for day in days:
-                        day_str = day.isoformat()
-                        fut = ex.submit(fetch_data, ENDPOINT_NAME, sid, day_str, day_str, cid, ckey)
-                        futures[fut] = (sid, day_str, cid, ckey)
+                        err = res.get("error")
+                        if err:
+                            log_error(f"API error for store {sid} on {day_str}: {err}", endpoint=ENDPOINT_NAME)
+                            log(f"❌ Store {sid} on {day_str}: {err}", "sep")
+                            continue
 
-                for fut in as_completed(futures):
-                    sid, day_str, cid, ckey = futures[fut]
-                    try:
-                        res = fut.result()
-                        log_error(f"API response for store {sid} on {day_str}: {json.dumps(res, indent=2)}", endpoint=ENDPOINT_NAME)
-                    except RateLimitError as ex:
-                        log_error(f"Rate limit for store {sid} on {day_str}: {ex}", endpoint=ENDPOINT_NAME)
-                        log(f"⚠️ Store {sid} on {day_str}: Rate limit hit; skipping.", "sep")
-                        continue
-                    except Exception as ex:
-                        log_error(f"Fetch failed for store {sid} on {day_str}: {ex}", endpoint=ENDPOINT_NAME)
-                        log(f"❌ Store {sid} on {day_str}: Exception: {ex}", "sep")
-                        continue
+                        reduced.append((sid, day_str, rows))
 
-                    err = res.get("error")
-                    if err:
-                        log_error(f"API error for store {sid} on {day_str}: {err}", endpoint=ENDPOINT_NAME)
-                        log(f"❌ Store {sid} on {day_str}: {err}", "sep")
-                        continue
+                if roll:
+                    roll.put_partials("discounts", [r for r in reduced if (r[0], r[1]) not in cached])
 
-                    items = []
-                    for txn in res.get("data", []):
-                        items += flatten(txn.get("items", []))
-                    with lock:
-                        for it in items:
-                            scan_item(it, discount_map, store_sum, daily_discounts, sid, day_str)
+                for sid, day_str, rows in reduced:
+                    fold_discounts(rows, discount_map, store_sum, daily_discounts, sid, day_str)
+                futures.clear()
+                if len(spans) > 1:
+                    log(f"{span[0]} → {span[-1]}: {len(reduced) - len(cached)} store-days fetched, {len(cached)} from checkpoints", "sep")
 
             if not discount_map:
                 log("No discounts found.", "sep")
@@ -1061,7 +1082,7 @@ def run(window):
             log(f"❌ Report error: {ex}", "sep")
             window.after(0, enable_toolbar)
 
-    threading.Thread(target=worker, daemon=True).start()
+    threading.Thread(target=metrics.timed(profiling.profiled("Discounts", "worker")(worker), "Discounts"), daemon=True).start()
 
 if __name__ == "__main__":
     config_emails = []
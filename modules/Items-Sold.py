@@ -3,7 +3,7 @@ import threading
 import tkinter as tk
 from tkinter.scrolledtext import ScrolledText
 from tkinter import messagebox, filedialog, Toplevel, StringVar
-from datetime import datetime, timedelta
+from datetime import datetime
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import tempfile
 import urllib.parse
@@ -11,6 +11,7 @@ import webbrowser
 import csv
 import json
 import os
+import sys
 import subprocess
 import smtplib
 import random
@@ -18,6 +19,12 @@ from email.mime.text import MIMEText
 from email.mime.application import MIMEApplication
 from email.mime.multipart import MIMEMultipart
 from collections import defaultdict
+from collections.abc import Mapping
+from array import array
+from itertools import repeat
+import heapq
+import sqlite3
+import weakref
 try:
     from reportlab.lib.pagesizes import letter
     from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
@@ -27,8 +34,14 @@ except ImportError:
     REPORTLAB_AVAILABLE = False
 
 ENDPOINT_NAME = "Transaction Details"
-MAX_DAYS = 7
+MAX_DAYS = 92
+TOP_N_ENV = "SUBWAYIQ_ITEMS_TOP_N"  # show only the N best sellers per list on screen; exports stay complete
+SPILL_ENV = "SUBWAYIQ_ITEMS_SPILL_MB"  # move per-store/per-day totals to disk past this many MB (0 = never)
 SCRIPT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+MODULES_DIR = os.path.dirname(os.path.abspath(__file__))
+if MODULES_DIR not in sys.path:
+    sys.path.insert(0, MODULES_DIR)
+from liveiq import details, intraday, metrics, parallel, profiling, rollup, stream, windows
 
 def generate_unique_filename(ext):
     """Generate unique filename in reports/ dir (Items-Sold-XXXX.ext, alphanumeric)."""
@@ -41,6 +54,251 @@ def generate_unique_filename(ext):
         if not os.path.exists(fname):
             return fname
 
+class ItemCatalog:
+    """Interns (description, PLU) pairs to small integer ids for one report run."""
+
+    def __init__(self):
+        self.keys = []
+        self._ids = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.keys)
+
+    def id(self, key):
+        """Return key's id, assigning the next one on first sight (safe across pool threads)."""
+        item_id = self._ids.get(key)
+        if item_id is None:
+            with self._lock:
+                item_id = self._ids.get(key)
+                if item_id is None:
+                    item_id = self._ids[key] = len(self.keys)
+                    self.keys.append(key)
+        return item_id
+
+def _whole(count):
+    """A unit count as an int when it is whole, else unchanged (fractional quantities)."""
+    return int(count) if isinstance(count, float) and count.is_integer() else count
+
+class ItemTotals:
+    """Units and sales per item for one scope (run, store or day), indexed by catalog id.
+
+    Long-lived scopes keep typed arrays; compact=False uses plain lists, which
+    are cheaper to update per line item in short-lived per-store-day partials.
+    Counts are doubles, since LiveIQ quantities can be fractional (weighed or
+    half-portion items); whole counts are reported as ints.
+    Interning saves memory only: reduce and merge cost about the same CPU as
+    the tuple-keyed dicts they replaced, since walking the items dominates.
+    """
+
+    def __init__(self, catalog, compact=True):
+        self.catalog = catalog
+        self.counts = array("d") if compact else []
+        self.totals = array("d") if compact else []
+        self.seen = bytearray()
+        self._ranked = None
+
+    def _grow(self, size):
+        extra = size - len(self.seen)
+        if extra > 0:
+            self.counts.extend(repeat(0, extra))
+            self.totals.extend(repeat(0.0, extra))
+            self.seen.extend(bytes(extra))
+
+    def ids(self):
+        """Ids of the items this scope has sold."""
+        return [i for i, flag in enumerate(self.seen) if flag]
+
+    def merge(self, other):
+        """Add another scope's totals into this one."""
+        self._grow(len(other.seen))
+        self._ranked = None
+        counts, totals, seen = self.counts, self.totals, self.seen
+        for i in other.ids():
+            counts[i] += other.counts[i]
+            totals[i] += other.totals[i]
+            seen[i] = 1
+
+    def __len__(self):
+        return self.seen.count(1)
+
+    def count_total(self):
+        return _whole(sum(self.counts))
+
+    def sales_total(self):
+        return sum(self.totals)
+
+    def to_rows(self):
+        """[[description, plu, count, total], ...] in catalog order, for checkpointing."""
+        keys = self.catalog.keys
+        return [[*keys[i], self.counts[i], self.totals[i]] for i in self.ids()]
+
+    @classmethod
+    def from_rows(cls, catalog, rows):
+        """Rebuild a partial from to_rows() output."""
+        partial = cls(catalog, compact=False)
+        ids = [catalog.id((desc, plu)) for desc, plu, _, _ in rows]
+        partial._grow(max(ids, default=-1) + 1)
+        for i, (_, _, count, total) in zip(ids, rows):
+            partial.counts[i] += count
+            partial.totals[i] += total
+            partial.seen[i] = 1
+        return partial
+
+    def items(self):
+        """((description, plu), {"count", "total"}) pairs in catalog order."""
+        keys = self.catalog.keys
+        return [(keys[i], {"count": _whole(self.counts[i]), "total": self.totals[i]}) for i in self.ids()]
+
+    def ranked(self):
+        """items() by units sold, best first; sorted once and cached until the next merge."""
+        if self._ranked is None:
+            self._ranked = sorted(self.items(), key=lambda x: x[1]["count"], reverse=True)
+        return self._ranked
+
+    def top(self, n):
+        """The n best sellers, by partial selection unless the full ranking is already cached."""
+        if self._ranked is not None or n >= len(self):
+            return self.ranked()[:n]
+        keys, counts, totals = self.catalog.keys, self.counts, self.totals
+        return [(keys[i], {"count": _whole(counts[i]), "total": totals[i]}) for i in heapq.nlargest(n, self.ids(), key=counts.__getitem__)]
+
+def spill_budget():
+    """Return the in-memory budget in bytes for per-store/per-day totals from SUBWAYIQ_ITEMS_SPILL_MB (0 = never spill)."""
+    try:
+        return max(0, int(float(os.environ.get(SPILL_ENV, "0") or 0) * 1024 * 1024))
+    except ValueError:
+        return 0
+
+def _drop_spill(db, path):
+    db.close()
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+class ScopeTotals(Mapping):
+    """ItemTotals per store or per day that move to a temporary on-disk table past a memory budget.
+
+    add() merges a partial into the scope's in-memory totals. Once the in-memory
+    scopes pass the budget they are all upserted into a SQLite table keyed by
+    (scope, item id) and dropped; reading a scope merges its on-disk row sums
+    with whatever has been added since, so reports see the same totals either way.
+    """
+
+    ITEM_BYTES = 17  # one int64 count, one float64 total and one seen flag per catalog id
+
+    def __init__(self, catalog, keys=(), budget=None):
+        self.catalog = catalog
+        self.budget = spill_budget() if budget is None else budget
+        self.spills = 0
+        self._keys = dict.fromkeys(keys)
+        self._mem = {key: ItemTotals(catalog) for key in self._keys}
+        self._bytes = 0
+        self._db = None
+        self._last = None
+
+    def add(self, key, partial):
+        self._keys.setdefault(key)
+        totals = self._mem.get(key)
+        if totals is None:
+            totals = self._mem[key] = ItemTotals(self.catalog)
+        size = len(totals.seen)
+        totals.merge(partial)
+        self._bytes += (len(totals.seen) - size) * self.ITEM_BYTES
+        self._last = None
+        if self.budget and self._bytes > self.budget:
+            self.spill()
+
+    def spill(self):
+        """Fold every in-memory scope into the on-disk table and free it."""
+        if self._db is None:
+            fd, path = tempfile.mkstemp(prefix="Items-Sold-", suffix=".spill.db")
+            os.close(fd)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=OFF")
+            self._db.execute("PRAGMA synchronous=OFF")
+            self._db.execute("CREATE TABLE totals (scope TEXT NOT NULL, item INTEGER NOT NULL, count REAL NOT NULL, "
+                             "total REAL NOT NULL, PRIMARY KEY (scope, item)) WITHOUT ROWID")
+            weakref.finalize(self, _drop_spill, self._db, path)
+        rows = ((key, i, totals.counts[i], totals.totals[i]) for key, totals in self._mem.items() for i in totals.ids())
+        with self._db:
+            self._db.executemany("INSERT INTO totals VALUES (?, ?, ?, ?) ON CONFLICT (scope, item) DO UPDATE "
+                                 "SET count = count + excluded.count, total = total + excluded.total", rows)
+        self._mem.clear()
+        self._bytes = 0
+        self._last = None
+        self.spills += 1
+
+    def __getitem__(self, key):
+        if key not in self._keys:
+            raise KeyError(key)
+        if self._db is None:
+            return self._mem[key]
+        if self._last is not None and self._last[0] == key:
+            return self._last[1]
+        totals = ItemTotals(self.catalog)
+        totals._grow(len(self.catalog))
+        counts, sums, seen = totals.counts, totals.totals, totals.seen
+        for i, count, total in self._db.execute("SELECT item, count, total FROM totals WHERE scope = ?", (key,)):
+            counts[i], sums[i], seen[i] = count, total, 1
+        if key in self._mem:
+            totals.merge(self._mem[key])
+        self._last = (key, totals)
+        return totals
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, key):
+        return key in self._keys
+
+class RankedRows(Mapping):
+    """{scope: [{"Description", "PLU", "Count", "Total"}, ...]} best sellers first, built from ScopeTotals on access."""
+
+    def __init__(self, scopes):
+        self.scopes = scopes
+
+    def __getitem__(self, key):
+        return [{"Description": desc, "PLU": plu, "Count": d["count"], "Total": d["total"]} for (desc, plu), d in self.scopes[key].ranked()]
+
+    def __iter__(self):
+        return iter(self.scopes)
+
+    def __len__(self):
+        return len(self.scopes)
+
+def screen_top_n():
+    """Return the on-screen list length from SUBWAYIQ_ITEMS_TOP_N (0 = show everything)."""
+    try:
+        return max(0, int(os.environ.get(TOP_N_ENV, "0") or 0))
+    except ValueError:
+        return 0
+
+def reduce_items(data, catalog):
+    """Reduce one store-day Transaction Details payload to an ItemTotals partial."""
+    partial = ItemTotals(catalog, compact=False)
+    size = len(catalog)
+    partial._grow(size)
+    counts, totals, seen = partial.counts, partial.totals, partial.seen
+    known = catalog._ids
+    for txn, item, depth in details.walk(data):
+        if item.get("type", "").lower() == "sale":
+            qty = item.get("quantity", 1)
+            key = (item.get("description", "Unknown"), item.get("plu", "N/A"))
+            i = known.get(key)
+            if i is None or i >= size:
+                i = catalog.id(key)
+                size = len(catalog)
+                partial._grow(size)
+            counts[i] += qty
+            totals[i] += float(item.get("adjustedPrice", 0.0)) * qty
+            seen[i] = 1
+    return partial
+
 def create_toolbar(window, txt, title, items_data, store_summary, daily_breakdown, start_date, end_date, selected_stores):
     """Create revamped toolbar with Export .PDF/.JSON/.TXT/.CSV, Email, Copy."""
     toolbar = tk.Frame(window, bg="#f0f0f0")
@@ -106,7 +364,7 @@ def create_toolbar(window, txt, title, items_data, store_summary, daily_breakdow
                 for sid in sorted(selected_stores, key=int):
                     writer.writerow([f"Store {sid}"])
                     writer.writerow(["Description", "PLU", "Count", "Total"])
-                    for (desc, plu), d in sorted(store_items[sid].items(), key=lambda x: x[1]["count"], reverse=True):
+                    for (desc, plu), d in store_items[sid].ranked():
                         writer.writerow([sid, desc, plu, d["count"], d["total"]])
                     writer.writerow([])
         elif fmt == "JSON":
@@ -121,7 +379,7 @@ def create_toolbar(window, txt, title, items_data, store_summary, daily_breakdow
             if start_date != end_date:
                 export_data["daily_breakdown"] = {date: entries for date, entries in daily_breakdown.items()}
             export_data["per_store_breakdown"] = {
-                sid: [{"Description": desc, "PLU": plu, "Count": d["count"], "Total": d["total"]} for (desc, plu), d in sorted(store_items[sid].items(), key=lambda x: x[1]["count"], reverse=True)]
+                sid: [{"Description": desc, "PLU": plu, "Count": d["count"], "Total": d["total"]} for (desc, plu), d in store_items[sid].ranked()]
                 for sid in sorted(selected_stores, key=int)
             }
             with open(fname, "w", encoding="utf-8") as f:
@@ -168,7 +426,7 @@ def create_toolbar(window, txt, title, items_data, store_summary, daily_breakdow
                 elements.append(Paragraph("Per-Store Breakdown", styles["Heading2"]))
                 for sid in sorted(selected_stores, key=int):
                     elements.append(Paragraph(f"Store {sid}", styles["Heading3"]))
-                    for (desc, plu), d in sorted(store_items[sid].items(), key=lambda x: x[1]["count"], reverse=True):
+                    for (desc, plu), d in store_items[sid].ranked():
                         text = f"Description: {desc}<br/>PLU: {plu}<br/>Count: {d['count']}<br/>Total: {d['total']:.2f}<br/>"
                         elements.append(Paragraph(text, style))
                         elements.append(Spacer(1, 12))
@@ -260,7 +518,7 @@ def open_email_dialog(window, txt, items_data, store_summary, daily_breakdown, t
                 for sid in sorted(selected_stores, key=int):
                     writer.writerow([f"Store {sid}"])
                     writer.writerow(["Description", "PLU", "Count", "Total"])
-                    for (desc, plu), d in sorted(store_items[sid].items(), key=lambda x: x[1]["count"], reverse=True):
+                    for (desc, plu), d in store_items[sid].ranked():
                         writer.writerow([sid, desc, plu, d["count"], d["total"]])
                     writer.writerow([])
         elif fmt == "JSON":
@@ -275,7 +533,7 @@ def open_email_dialog(window, txt, items_data, store_summary, daily_breakdown, t
             if start_date != end_date:
                 export_data["daily_breakdown"] = {date: entries for date, entries in daily_breakdown.items()}
             export_data["per_store_breakdown"] = {
-                sid: [{"Description": desc, "PLU": plu, "Count": d["count"], "Total": d["total"]} for (desc, plu), d in sorted(store_items[sid].items(), key=lambda x: x[1]["count"], reverse=True)]
+                sid: [{"Description": desc, "PLU": plu, "Count": d["count"], "Total": d["total"]} for (desc, plu), d in store_items[sid].ranked()]
                 for sid in sorted(selected_stores, key=int)
             }
             with open(fname, "w", encoding="utf-8") as f:
@@ -322,7 +580,7 @@ def open_email_dialog(window, txt, items_data, store_summary, daily_breakdown, t
                 elements.append(Paragraph("Per-Store Breakdown", styles["Heading2"]))
                 for sid in sorted(selected_stores, key=int):
                     elements.append(Paragraph(f"Store {sid}", styles["Heading3"]))
-                    for (desc, plu), d in sorted(store_items[sid].items(), key=lambda x: x[1]["count"], reverse=True):
+                    for (desc, plu), d in store_items[sid].ranked():
                         text = f"Description: {desc}<br/>PLU: {plu}<br/>Count: {d['count']}<br/>Total: {d['total']:.2f}<br/>"
                         elements.append(Paragraph(text, style))
                         elements.append(Spacer(1, 12))
@@ -382,7 +640,7 @@ def open_email_dialog(window, txt, items_data, store_summary, daily_breakdown, t
                 for sid in sorted(selected_stores, key=int):
                     writer.writerow([f"Store {sid}"])
                     writer.writerow(["Description", "PLU", "Count", "Total"])
-                    for (desc, plu), d in sorted(store_items[sid].items(), key=lambda x: x[1]["count"], reverse=True):
+                    for (desc, plu), d in store_items[sid].ranked():
                         writer.writerow([sid, desc, plu, d["count"], d["total"]])
                     writer.writerow([])
         elif fmt == "JSON":
@@ -397,7 +655,7 @@ def open_email_dialog(window, txt, items_data, store_summary, daily_breakdown, t
             if start_date != end_date:
                 export_data["daily_breakdown"] = {date: entries for date, entries in daily_breakdown.items()}
             export_data["per_store_breakdown"] = {
-                sid: [{"Description": desc, "PLU": plu, "Count": d["count"], "Total": d["total"]} for (desc, plu), d in sorted(store_items[sid].items(), key=lambda x: x[1]["count"], reverse=True)]
+                sid: [{"Description": desc, "PLU": plu, "Count": d["count"], "Total": d["total"]} for (desc, plu), d in store_items[sid].ranked()]
                 for sid in sorted(selected_stores, key=int)
             }
             with open(fname, "w", encoding="utf-8") as f:
@@ -444,7 +702,7 @@ def open_email_dialog(window, txt, items_data, store_summary, daily_breakdown, t
                 elements.append(Paragraph("Per-Store Breakdown", styles["Heading2"]))
                 for sid in sorted(selected_stores, key=int):
                     elements.append(Paragraph(f"Store {sid}", styles["Heading3"]))
-                    for (desc, plu), d in sorted(store_items[sid].items(), key=lambda x: x[1]["count"], reverse=True):
+                    for (desc, plu), d in store_items[sid].ranked():
                         text = f"Description: {desc}<br/>PLU: {plu}<br/>Count: {d['count']}<br/>Total: {d['total']:.2f}<br/>"
                         elements.append(Paragraph(text, style))
                         elements.append(Spacer(1, 12))
@@ -492,9 +750,19 @@ def open_email_dialog(window, txt, items_data, store_summary, daily_breakdown, t
         tk.Button(btn_frame, text="Send Now", command=send_now, bg="#005228", fg="#ecc10c").pack(side="left", padx=5)
     tk.Button(btn_frame, text="Close", command=dialog.destroy, bg="#005228", fg="#ecc10c").pack(side="right", padx=5)
 
+@profiling.profiled("Items-Sold")
 def run(window):
     """Run the Items-Sold report for selected stores and date range."""
     from __main__ import get_selected_start_date, get_selected_end_date, fetch_data, store_vars, config_accounts, handle_rate_limit, log_error, config_max_workers, _password_validated, RateLimitError, config_emails, config_smtp, SCRIPT_DIR
+    fetch_data = metrics.instrument(fetch_data, config_accounts, RateLimitError)
+    # Workers are only given raw bodies: pickling a parsed list to them costs more than walking it here
+    procs = parallel.pool() if stream.host_fetch() else None
+    fetch_stream = stream.fetcher(stream.host_fetch(), raw=bool(procs))
+    if fetch_stream:
+        fetch_stream = metrics.instrument(fetch_stream, config_accounts, RateLimitError)
+    metrics.start_exporter(SCRIPT_DIR)
+    roll = rollup.open_rollup(SCRIPT_DIR)
+    today = intraday.tracker("items_sold")
 
     if not _password_validated:
         messagebox.showerror("Access Denied", "Password validation required.", parent=window)
@@ -534,9 +802,11 @@ def run(window):
 
     items_data = []
     store_summary = defaultdict(lambda: {"total_count": 0, "total_sales": 0.0})
-    daily_breakdown = defaultdict(list)
     global store_items
-    store_items = {sid: defaultdict(lambda: {"count": 0, "total": 0.0}) for sid in selected_stores}
+    catalog = ItemCatalog()
+    store_items = ScopeTotals(catalog, selected_stores)
+    daily_items = ScopeTotals(catalog)
+    daily_breakdown = RankedRows(daily_items)
     enable_toolbar = create_toolbar(window, txt, "Items-Sold Report", items_data, store_summary, daily_breakdown, start_date_str, end_date_str, selected_stores)
     log_error("Toolbar created", endpoint=ENDPOINT_NAME)
 
@@ -556,15 +826,6 @@ def run(window):
         txt.configure(state="normal")
         log_error(f"Log: {line}", endpoint=ENDPOINT_NAME)
 
-    def flatten_items(items):
-        flattened = []
-        for item in items or []:
-            flattened.append(item)
-            for key in ['modifiers', 'addons', 'extras']:
-                if key in item and isinstance(item[key], list):
-                    flattened.extend(flatten_items(item[key]))
-        return flattened
-
     def worker():
         try:
             if not selected_stores:
@@ -597,82 +858,113 @@ def run(window):
             log(f"Fetching data for {len(store_map)} stores...", "sep")
             log("", None)
 
-            all_items = defaultdict(lambda: {"count": 0, "total": 0.0})
-            global store_items
-            daily_items = defaultdict(lambda: defaultdict(lambda: {"count": 0, "total": 0.0}))
-
-            days = []
-            current = start
-            while current <= end:
-                days.append(current)
-                current += timedelta(days=1)
-
-            futures = {}
-            lock = threading.Lock()
-            with ThreadPoolExecutor(max_workers=config_max_workers) as ex:
-                for sid, (name, cid, ckey) in store_map.items():
-                    for day in days:
-                        day_str = day.isoformat()
-                        fut = ex.submit(fetch_data, ENDPOINT_NAME, sid, day_str, day_str, cid, ckey)
-                        futures[fut] = (sid, day_str, cid, ckey)
-
-                for fut in as_completed(futures):
-                    sid, day_str, cid, ckey = futures[fut]
-                    try:
-                        res = fut.result()
-                        log_error(f"API response for store {sid} on {day_str}: {json.dumps(res, indent=2)}", endpoint=ENDPOINT_NAME)
-                    except RateLimitError as ex:
-                        log_error(f"Rate limit for store {sid} on {day_str}: {ex}", endpoint=ENDPOINT_NAME)
-                        log(f"⚠️ Store {sid} on {day_str}: Rate limit hit; skipping.", "sep")
-                        continue
-                    except Exception as ex:
-                        log_error(f"Fetch failed for store {sid} on {day_str}: {ex}", endpoint=ENDPOINT_NAME)
-                        log(f"❌ Store {sid} on {day_str}: Exception: {ex}", "sep")
-                        continue
-
-                    err = res.get("error")
-                    if err:
-                        log_error(f"API error for store {sid} on {day_str}: {err}", endpoint=ENDPOINT_NAME)
-                        log(f"❌ Store {sid} on {day_str}: {err}", "sep")
-                        continue
-
-                    data = res.get("data", []) or []
-                    for txn in data:
-                        items = flatten_items(txn.get("items", []))
-                        for item in items:
-                            if item.get("type", "").lower() == "sale":
-                                desc = item.get("description", "Unknown")
-                                plu = item.get("plu", "N/A")
-                                key = (desc, plu)
-                                qty = item.get("quantity", 1)
-                                price = float(item.get("adjustedPrice", 0.0)) * qty
-                                with lock:
-                                    all_items[key]["count"] += qty
-                                    all_items[key]["total"] += price
-                                    store_items[sid][key]["count"] += qty
-                                    store_items[sid][key]["total"] += price
-                                    daily_items[day_str][key]["count"] += qty
-                                    daily_items[day_str][key]["total"] += price
+            all_items = ItemTotals(catalog)
+
+            def fetch_day(sid, day_str, cid, ckey):
+                # Runs on the pool thread: reduce the payload to a local partial while other fetches are in flight
+                # An unsettled day may be walked twice (see below), so it is only streamed as a raw body for the pool
+                fetch = fetch_stream if fetch_stream and (procs or not today.tracks(day_str)) else fetch_data
+                res = fetch(ENDPOINT_NAME, sid, day_str, day_str, cid, ckey)
+                if res.get("error"):
+                    return res, None
+                # An unsettled day is refreshed incrementally: only transactions no earlier run reduced are walked,
+                # unless one it kept was edited or removed since, and then the whole day is reduced again
+                with today.open(sid, day_str) as kept:
+                    body, current = res.get("data"), {}
+                    if procs and isinstance(body, bytes):
+                        # Process mode: a worker decodes and reduces the raw body; only its compact rows come back
+                        rows, current = procs.submit(parallel.item_rows, body, kept and kept.seen).result()
+                        res, partial = parallel.summary(body), ItemTotals.from_rows(catalog, rows)
+                        full = lambda: procs.submit(parallel.item_rows, body).result()[0]
+                    else:
+                        # Streaming mode reduces transactions as they are decoded, and logs a summary instead of the payload
+                        data = body or []
+                        try:
+                            partial = reduce_items(kept.fresh(data, current) if kept else data, catalog)
+                        finally:
+                            if fetch is fetch_stream:
+                                data.close()
+                        if fetch is fetch_stream:
+                            res = data.summary()
+                        full = lambda: reduce_items(data, catalog).to_rows()
+                    if kept:
+                        partial = ItemTotals.from_rows(catalog, kept.commit(current, partial.to_rows(), full))
+                return res, partial
+
+            # One window at a time: fetch, fold into the run's totals, then let the payloads go.
+            # Store-days checkpointed by an earlier run are read back instead of fetched.
+            spans = windows.day_windows(start, end)
+            for span in spans:
+                cached = roll.get_partials("items_sold", store_map, span) if roll else {}
+                partials = [(sid, day_str, ItemTotals.from_rows(catalog, rows)) for (sid, day_str), rows in cached.items()]
+                futures = {}
+                with ThreadPoolExecutor(max_workers=config_max_workers) as ex:
+                    for sid, (name, cid, ckey) in store_map.items():
+                        for day_str in span:
+                            if (sid, day_str) in cached:
+                                continue
+                            fut = ex.submit(fetch_day, sid, day_str, cid, ckey)
+                            futures[fut] = (sid, day_str, cid, ckey)
+
+                    for fut in as_completed(futures):
+                        sid, day_str, cid, ckey = futures[fut]
+                        try:
+                            res, partial = fut.result()
+                            log_error(f"API response for store {sid} on {day_str}: {json.dumps(res, indent=2)}", endpoint=ENDPOINT_NAME)
+                        except RateLimitError as ex:
+                            log_error(f"Rate limit for store {sid} on {day_str}: {ex}", endpoint=ENDPOINT_NAME)
+                            log(f"⚠️ Store {sid} on {day_str}: Rate limit hit; skipping.", "sep")
+                            continue
+                        except Exception as ex:
+                            log_error(f"Fetch failed for store {sid} on {day_str}: {ex}", endpoint=ENDPOINT_NAME)
+                            log(f"❌ Store {sid} on {day_str}: Exception: {ex}", "sep")
+                            continue
+
+                        err = res.get("error")
+                        if err:
+                            log_error(f"API error for store {sid} on {day_str}: {err}", endpoint=ENDPOINT_NAME)
+                            log(f"❌ Store {sid} on {day_str}: {err}", "sep")
+                            continue
+
+                        partials.append((sid, day_str, partial))
+
+                if roll:
+                    roll.put_partials("items_sold", [(sid, day_str, partial.to_rows()) for sid, day_str, partial in partials
+                                                     if (sid, day_str) not in cached])
+
+                # Merge the window's per-store-day partials once, on this thread only
+                for sid, day_str, partial in partials:
+                    all_items.merge(partial)
+                    store_items.add(sid, partial)
+                    daily_items.add(day_str, partial)
+                futures.clear()
+                if len(spans) > 1:
+                    log(f"{span[0]} → {span[-1]}: {len(partials) - len(cached)} store-days fetched, {len(cached)} from checkpoints", "sep")
 
             items_data.clear()
-            items_data.extend([{"Description": desc, "PLU": plu, "Count": all_items[(desc, plu)]["count"], "Total": all_items[(desc, plu)]["total"]} for (desc, plu) in sorted(all_items, key=lambda k: all_items[k]["count"], reverse=True)])
+            items_data.extend([{"Description": desc, "PLU": plu, "Count": d["count"], "Total": d["total"]} for (desc, plu), d in all_items.ranked()])
 
             for sid in store_items:
-                total_count = sum(d["count"] for d in store_items[sid].values())
-                total_sales = sum(d["total"] for d in store_items[sid].values())
-                store_summary[sid] = {"total_count": total_count, "total_sales": total_sales}
+                store_summary[sid] = {"total_count": store_items[sid].count_total(), "total_sales": store_items[sid].sales_total()}
 
-            daily_breakdown.clear()
-            for date in daily_items:
-                daily_breakdown[date] = [{"Description": desc, "PLU": plu, "Count": daily_items[date][(desc, plu)]["count"], "Total": daily_items[date][(desc, plu)]["total"]} for (desc, plu) in sorted(daily_items[date], key=lambda k: daily_items[date][k]["count"], reverse=True)]
+            if store_items.spills or daily_items.spills:
+                log_error(f"Spilled item totals to disk: {store_items.spills} store and {daily_items.spills} day pass(es)", endpoint=ENDPOINT_NAME)
 
             log("", None)
+            top_n = screen_top_n()
+
+            def log_more(shown, total):
+                if total > shown:
+                    log(f"... {total - shown} more items (export for the full list)", "sep")
+
             log("All Items Sold" if start == end else "All Items Sold (Aggregated)", "title")
             hdr = f"{'Description':<25} | {'PLU':>6} | {'Count':>10} | {'Total':>10}"
             log(hdr, "heading")
             log("─" * len(hdr), "sep")
-            for entry in items_data:
+            shown = items_data[:top_n] if top_n else items_data
+            for entry in shown:
                 log(f"{entry['Description'][:25]:<25} | {entry['PLU']:>6} | {entry['Count']:>10} | {entry['Total']:>10.2f}")
+            log_more(len(shown), len(items_data))
 
             if start != end:
                 for date in sorted(daily_breakdown):
@@ -680,8 +972,11 @@ def run(window):
                     log(f"Items Sold on {date}", "title")
                     log(hdr, "heading")
                     log("─" * len(hdr), "sep")
-                    for entry in daily_breakdown[date]:
+                    rows = daily_breakdown[date]
+                    shown = rows[:top_n] if top_n else rows
+                    for entry in shown:
                         log(f"{entry['Description'][:25]:<25} | {entry['PLU']:>6} | {entry['Count']:>10} | {entry['Total']:>10.2f}")
+                    log_more(len(shown), len(rows))
 
             log("", None)
             log("Store Summary", "title")
@@ -698,8 +993,10 @@ def run(window):
                 log(f"Items Sold at Store {sid}", "title")
                 log(hdr, "heading")
                 log("─" * len(hdr), "sep")
-                for (desc, plu), d in sorted(store_items[sid].items(), key=lambda x: x[1]["count"], reverse=True):
+                shown = store_items[sid].top(top_n) if top_n else store_items[sid].ranked()
+                for (desc, plu), d in shown:
                     log(f"{desc[:25]:<25} | {plu:>6} | {d['count']:>10} | {d['total']:>10.2f}")
+                log_more(len(shown), len(store_items[sid]))
 
             idx = txt.search("Fetching data for ", "1.0", tk.END)
             if idx:
@@ -710,7 +1007,7 @@ def run(window):
             log(f"❌ Report error: {ex}", "sep")
             window.after(0, enable_toolbar)
 
-    threading.Thread(target=worker, daemon=True).start()
+    threading.Thread(target=metrics.timed(profiling.profiled("Items-Sold", "worker")(worker), "Items-Sold"), daemon=True).start()
 
 if __name__ == "__main__":
     config_emails = []
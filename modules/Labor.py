@@ -3,15 +3,20 @@ import threading
 import tkinter as tk
 from tkinter.scrolledtext import ScrolledText
 from tkinter import messagebox, simpledialog, filedialog, Toplevel, StringVar
-from datetime import datetime
+from datetime import datetime, timedelta
+from collections import defaultdict
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import tempfile
-import win32print
+try:
+    import win32print
+except ImportError:
+    win32print = None
 import urllib.parse
 import webbrowser
 import csv
 import json
 import os
+import sys
 import subprocess
 import smtplib
 import random
@@ -29,6 +34,10 @@ except ImportError:
 ENDPOINT_NAME = "Daily Timeclock"
 MAX_DAYS = 30
 SCRIPT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+MODULES_DIR = os.path.dirname(os.path.abspath(__file__))
+if MODULES_DIR not in sys.path:
+    sys.path.insert(0, MODULES_DIR)
+from liveiq import entries, metrics, profiling, rollup, schemas
 
 def generate_unique_filename(ext):
     """Generate unique filename in reports/ dir (Labor-XXXX.ext, alphanumeric)."""
@@ -452,6 +461,7 @@ def open_email_dialog(window, txt, labor_data, emp_summary, store_summary, title
         tk.Button(btn_frame, text="Send Now", command=send_now, bg="#005228", fg="#ecc10c").pack(side="left", padx=5)
     tk.Button(btn_frame, text="Close", command=dialog.destroy, bg="#005228", fg="#ecc10c").pack(side="right", padx=5)
 
+@profiling.profiled("Labor")
 def run(window):
     """Run the Labor report for selected stores and date range.
     
@@ -459,6 +469,9 @@ def run(window):
         window: Tk window to display the report.
     """
     from __main__ import get_selected_start_date, get_selected_end_date, fetch_data, store_vars, config_accounts, handle_rate_limit, log_error, config_max_workers, _password_validated, RateLimitError, config_emails, config_smtp, SCRIPT_DIR
+    fetch_data = metrics.instrument(fetch_data, config_accounts, RateLimitError)
+    metrics.start_exporter(SCRIPT_DIR)
+    roll = rollup.open_rollup(SCRIPT_DIR)
 
     if not _password_validated:
         messagebox.showerror("Access Denied", "Password validation required.", parent=window)
@@ -554,15 +567,26 @@ def run(window):
                 window.after(0, enable_toolbar)
                 return
 
+            # Accounts whose stores are rolled up for every day are answered locally: per-employee totals,
+            # with one "(rollup total)" export row per employee instead of shift times
+            day_strs = [(start + timedelta(days=x)).isoformat() for x in range((end - start).days + 1)]
+            rolled_accounts = {}
+            if roll:
+                for name, (store_ids, cid, ckey) in list(account_store_lists.items()):
+                    if not roll.covered("labor", store_ids, day_strs)[1]:
+                        rolled_accounts[name] = account_store_lists.pop(name)
+
             # Start report
             s_str, e_str = start.isoformat(), end.isoformat()
             log(f"Labor Hours: {s_str} → {e_str}", "title")
             log(f"Fetching data for {len(store_map)} stores across {len(account_store_lists)} account(s)…", "sep")
+            if rolled_accounts:
+                log(f"{len(rolled_accounts)} account(s) answered from the local rollup.", "sep")
             log("", None)  # Blank line for readability
 
             # Fetch data with comma-separated store IDs per account
             futures = {}
-            with ThreadPoolExecutor(max_workers=min(config_max_workers, len(account_store_lists))) as ex:
+            with ThreadPoolExecutor(max_workers=max(1, min(config_max_workers, len(account_store_lists)))) as ex:
                 for name, (store_ids, cid, ckey) in account_store_lists.items():
                     if store_ids:
                         restaurant_numbers = ",".join(store_ids)
@@ -597,8 +621,14 @@ def run(window):
                         log_error(f"No data for account {name} (stores {store_ids})", endpoint=ENDPOINT_NAME)
                         continue
 
+                    # Bucket the account's records by store in one pass
+                    records = schemas.DAILY_TIMECLOCK.decode_all(data)
+                    by_store = defaultdict(list)
+                    for rec in records:
+                        by_store[rec.store].append(rec)
+
                     for sid in sorted(store_ids):  # Sort for consistent order
-                        store_data = [rec for rec in data if rec.get("restaurantNumber") == sid]
+                        store_data = by_store.get(sid, [])
                         log(f"Store {sid} (Acct: {name})", "heading")
                         if not store_data:
                             msg = "clock-in data for today" if start == end == datetime.now().date() else "data available"
@@ -610,16 +640,10 @@ def run(window):
                         log("─" * 80, "sep")
 
                         for rec in store_data:
-                            emp = rec.get("employeeName", "Unknown").strip().title()
-                            cin = rec.get("clockInDateTime") or rec.get("clockIn")
-                            cout = rec.get("clockOutDateTime") or rec.get("clockOut")
-                            fmt = "%Y-%m-%dT%H:%M:%S"
+                            emp = rec.employee.strip().title()
+                            cin, cout = rec.clock_in, rec.clock_out
                             try:
-                                t0 = datetime.strptime(cin, fmt)
-                                t1 = datetime.strptime(cout, fmt) if cout else None
-                                in_s = t0.strftime("%m/%d %I:%M %p")
-                                out_s = t1.strftime("%m/%d %I:%M %p") if t1 else "(in)"
-                                hrs = (t1 - t0).total_seconds() / 3600 if t1 else 0
+                                in_s, out_s, hrs = entries.shift_times(cin, cout)
                             except ValueError:
                                 log_error(f"Bad timestamp for {emp} in store {sid}: {cin}, {cout}", sid, ENDPOINT_NAME)
                                 log(f"⚠️ Bad timestamp for {emp}", "sep")
@@ -635,6 +659,38 @@ def run(window):
                             es["shifts"] += 1
                         log("", None)  # Blank line after store section
 
+                    if roll:
+                        totals, employees = entries.labor_rollup_rows(records, store_ids, day_strs)
+                        roll.put("labor", totals)
+                        roll.put_employees(employees)
+
+            # Rolled-up accounts: per-employee totals read back from the rollup
+            for name, (store_ids, cid, ckey) in rolled_accounts.items():
+                by_store = defaultdict(list)
+                for sid, emp, hrs, n in roll.employees(store_ids, s_str, e_str):
+                    by_store[sid].append((emp, hrs, n))
+                for sid in sorted(store_ids):
+                    log(f"Store {sid} (Acct: {name})", "heading")
+                    if not by_store[sid]:
+                        log(f"No data available for store {sid}.", "sep")
+                        log("", None)
+                        continue
+                    log(f"{'Employee':<30}  {'Shifts':>6}  {'Hrs':>8}", "heading")
+                    log("─" * 48, "sep")
+                    for emp, hrs, n in by_store[sid]:
+                        log(f"{emp:<30}  {n:>6}  {hrs:>8.2f}")
+                        # One export row per employee in place of their shifts, labelled as a rollup total
+                        labor_data.append({"Store": sid, "Employee": emp, "In": "(rollup total)", "Out": f"{n} shift(s)", "Hours": hrs})
+                        ss = store_summary.setdefault(sid, {"hours": 0.0, "emps": set(), "shifts": 0})
+                        ss["hours"] += hrs
+                        ss["shifts"] += n
+                        ss["emps"].add(emp)
+                        es = emp_summary.setdefault(emp.lower(), {"name": emp, "hours": 0.0, "shifts": 0})
+                        es["hours"] += hrs
+                        es["shifts"] += n
+                    log("(from the local rollup; shift times are not stored)", "sep")
+                    log("", None)
+
             # Summaries
             if emp_summary:
                 log("", None)  # Blank line before summaries
@@ -667,7 +723,7 @@ def run(window):
             window.after(0, enable_toolbar)
 
     # Start initial report
-    threading.Thread(target=worker, daemon=True).start()
+    threading.Thread(target=metrics.timed(profiling.profiled("Labor", "worker")(worker), "Labor"), daemon=True).start()
 
 if __name__ == "__main__":
     config_emails = []
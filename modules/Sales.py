@@ -3,15 +3,19 @@ import threading
 import tkinter as tk
 from tkinter.scrolledtext import ScrolledText
 from tkinter import messagebox, filedialog, Toplevel, StringVar
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import tempfile
-import win32print
+try:
+    import win32print
+except ImportError:
+    win32print = None
 import urllib.parse
 import webbrowser
 import csv
 import json
 import os
+import sys
 import subprocess
 import smtplib
 import random
@@ -31,6 +35,23 @@ SALES_ENDPOINT = "Sales Summary"
 DAILY_ENDPOINT = "Daily Sales Summary"
 MAX_DAYS = 30
 SCRIPT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+MODULES_DIR = os.path.dirname(os.path.abspath(__file__))
+if MODULES_DIR not in sys.path:
+    sys.path.insert(0, MODULES_DIR)
+from liveiq import compare, entries, metrics, pacing, profiling, rollup, schemas
+
+SUMMARY_KEYS = ("Sales", "Tax", "Units", "Txns", "Cash/Card", "3rd $", "3rd Txns")
+
+def summary_line(entry):
+    """One store's row of the summary table."""
+    return f"{entry['Store']:<6} {entry['Sales']:>10.2f} {entry['Tax']:>8.2f} {entry['Units']:>7} {entry['Txns']:>7} {entry['Cash/Card']:>11.2f} {entry['3rd $']:>8.2f} {entry['3rd Txns']:>10}"
+
+def live_minutes():
+    """Live-mode refresh interval from SUBWAYIQ_LIVE_MINUTES (default 30, LiveIQ's data latency)."""
+    try:
+        return max(1, int(os.environ.get("SUBWAYIQ_LIVE_MINUTES", "") or 30))
+    except ValueError:
+        return 30
 
 def generate_unique_filename(ext):
     """Generate unique filename in reports/ dir (Sales-XXXX.ext, alphanumeric)."""
@@ -43,7 +64,17 @@ def generate_unique_filename(ext):
         if not os.path.exists(fname):
             return fname
 
-def export_file(fmt, window, txt, sales_data, daily_breakdown, title, start_date, end_date, selected_stores):
+def store_rows(index, selected_stores):
+    """Summary rows in selected_stores order, read from the worker's store index."""
+    by_store = index.get("store", {})
+    return [by_store[sid] for sid in selected_stores if sid in by_store]
+
+def day_rows(index, date, selected_stores):
+    """One day's rows in selected_stores order, read from the worker's (date, store) index."""
+    by_day = index.get("day", {})
+    return [by_day[(date, sid)] for sid in selected_stores if (date, sid) in by_day]
+
+def export_file(fmt, window, txt, sales_data, daily_breakdown, index, title, start_date, end_date, selected_stores):
     """Export report to specified format (PDF, JSON, CSV, TXT)."""
     fname = generate_unique_filename(fmt)
     is_single_day = start_date == end_date
@@ -57,33 +88,28 @@ def export_file(fmt, window, txt, sales_data, daily_breakdown, title, start_date
             writer.writerow([])
             writer.writerow(["Sales Summary"])
             writer.writerow(["Store", "Sales", "Tax", "Units", "Txns", "Cash/Card", "3rd $", "3rd Txns"])
-            for sid in selected_stores:
-                for entry in sales_data:
-                    if entry["Store"] == sid:
-                        writer.writerow([entry["Store"], f"{entry['Sales']:.2f}", f"{entry['Tax']:.2f}", 
-                                        entry["Units"], entry["Txns"], f"{entry['Cash/Card']:.2f}", 
-                                        f"{entry['3rd $']:.2f}", entry["3rd Txns"]])
+            for entry in store_rows(index, selected_stores):
+                writer.writerow([entry["Store"], f"{entry['Sales']:.2f}", f"{entry['Tax']:.2f}", 
+                                entry["Units"], entry["Txns"], f"{entry['Cash/Card']:.2f}", 
+                                f"{entry['3rd $']:.2f}", entry["3rd Txns"]])
             if not is_single_day:
                 writer.writerow([])
                 writer.writerow(["Daily Breakdown"])
                 writer.writerow(["Date", "Store", "Sales", "Tax", "Units", "Txns", "Cash/Card", "3rd $", "3rd Txns"])
                 for date in sorted(daily_breakdown):
-                    for sid in selected_stores:
-                        for entry in daily_breakdown[date]:
-                            if entry["Store"] == sid:
-                                writer.writerow([date, entry["Store"], f"{entry['Sales']:.2f}", f"{entry['Tax']:.2f}", 
-                                                entry["Units"], entry["Txns"], f"{entry['Cash/Card']:.2f}", 
-                                                f"{entry['3rd $']:.2f}", entry["3rd Txns"]])
+                    for entry in day_rows(index, date, selected_stores):
+                        writer.writerow([date, entry["Store"], f"{entry['Sales']:.2f}", f"{entry['Tax']:.2f}", 
+                                        entry["Units"], entry["Txns"], f"{entry['Cash/Card']:.2f}", 
+                                        f"{entry['3rd $']:.2f}", entry["3rd Txns"]])
     elif fmt == "JSON":
         export_data = {
             "generated_on": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
             "date_range": f"{start_date} to {end_date}",
             "stores": selected_stores,
-            "sales_summary": [entry for sid in selected_stores for entry in sales_data if entry["Store"] == sid]
+            "sales_summary": store_rows(index, selected_stores)
         }
         if not is_single_day:
-            export_data["daily_breakdown"] = {date: [entry for sid in selected_stores for entry in entries if entry["Store"] == sid] 
-                                             for date, entries in sorted(daily_breakdown.items())}
+            export_data["daily_breakdown"] = {date: day_rows(index, date, selected_stores) for date in sorted(daily_breakdown)}
         with open(fname, "w", encoding="utf-8") as f:
             json.dump(export_data, f, indent=2)
     elif fmt == "TXT":
@@ -111,9 +137,22 @@ def export_file(fmt, window, txt, sales_data, daily_breakdown, title, start_date
             elements.append(Paragraph(f"Stores: {', '.join(selected_stores)}", styles["Normal"]))
             elements.append(Spacer(1, 12))
             elements.append(Paragraph("Sales Summary", styles["Heading2"]))
-            for sid in selected_stores:
-                for entry in sales_data:
-                    if entry["Store"] == sid:
+            for entry in store_rows(index, selected_stores):
+                text = (f"Store: {entry['Store']:<6}<br/>"
+                        f"Sales: ${entry['Sales']:>10.2f}<br/>"
+                        f"Tax: ${entry['Tax']:>8.2f}<br/>"
+                        f"Units: {entry['Units']:>5}<br/>"
+                        f"Txns: {entry['Txns']:>5}<br/>"
+                        f"Cash/Card: ${entry['Cash/Card']:>10.2f}<br/>"
+                        f"3rd $: ${entry['3rd $']:>8.2f}<br/>"
+                        f"3rd Txns: {entry['3rd Txns']:>9}<br/>")
+                elements.append(Paragraph(text, style))
+                elements.append(Spacer(1, 12))
+            if not is_single_day:
+                elements.append(Paragraph("Daily Breakdown", styles["Heading2"]))
+                for date in sorted(daily_breakdown):
+                    elements.append(Paragraph(f"Date: {date}", styles["Heading3"]))
+                    for entry in day_rows(index, date, selected_stores):
                         text = (f"Store: {entry['Store']:<6}<br/>"
                                 f"Sales: ${entry['Sales']:>10.2f}<br/>"
                                 f"Tax: ${entry['Tax']:>8.2f}<br/>"
@@ -124,23 +163,6 @@ def export_file(fmt, window, txt, sales_data, daily_breakdown, title, start_date
                                 f"3rd Txns: {entry['3rd Txns']:>9}<br/>")
                         elements.append(Paragraph(text, style))
                         elements.append(Spacer(1, 12))
-            if not is_single_day:
-                elements.append(Paragraph("Daily Breakdown", styles["Heading2"]))
-                for date in sorted(daily_breakdown):
-                    elements.append(Paragraph(f"Date: {date}", styles["Heading3"]))
-                    for sid in selected_stores:
-                        for entry in daily_breakdown[date]:
-                            if entry["Store"] == sid:
-                                text = (f"Store: {entry['Store']:<6}<br/>"
-                                        f"Sales: ${entry['Sales']:>10.2f}<br/>"
-                                        f"Tax: ${entry['Tax']:>8.2f}<br/>"
-                                        f"Units: {entry['Units']:>5}<br/>"
-                                        f"Txns: {entry['Txns']:>5}<br/>"
-                                        f"Cash/Card: ${entry['Cash/Card']:>10.2f}<br/>"
-                                        f"3rd $: ${entry['3rd $']:>8.2f}<br/>"
-                                        f"3rd Txns: {entry['3rd Txns']:>9}<br/>")
-                                elements.append(Paragraph(text, style))
-                                elements.append(Spacer(1, 12))
             doc.build(elements)
         except Exception as e:
             messagebox.showerror("PDF Error", f"Failed to generate PDF: {e}", parent=window)
@@ -157,7 +179,7 @@ def export_file(fmt, window, txt, sales_data, daily_breakdown, title, start_date
         else:
             messagebox.showinfo("Open Info", f"File saved to {fname}. Open manually (error: {e}).", parent=window)
 
-def open_email_dialog(window, txt, sales_data, daily_breakdown, title, start_date, end_date, selected_stores, config_emails, config_smtp):
+def open_email_dialog(window, txt, sales_data, daily_breakdown, index, title, start_date, end_date, selected_stores, config_emails, config_smtp):
     """Open dialog to select emails, format, and send report as attachment via mailto or SMTP."""
     if not config_emails:
         messagebox.showwarning("No Emails", "No emails configured. Add via Emails button.", parent=window)
@@ -195,7 +217,7 @@ def open_email_dialog(window, txt, sales_data, daily_breakdown, title, start_dat
             messagebox.showwarning("No Selection", "Select at least one email.", parent=dialog)
             return
         fmt = format_var.get()
-        export_file(fmt, dialog, txt, sales_data, daily_breakdown, title, start_date, end_date, selected_stores)
+        export_file(fmt, dialog, txt, sales_data, daily_breakdown, index, title, start_date, end_date, selected_stores)
         fname = generate_unique_filename(fmt)
         lines = txt.get("1.0", "end-1c").splitlines()
         subj = f"Sales Report: {start_date} to {end_date}"
@@ -215,7 +237,7 @@ def open_email_dialog(window, txt, sales_data, daily_breakdown, title, start_dat
             return
         fmt = format_var.get()
         fname = generate_unique_filename(fmt)
-        export_file(fmt, dialog, txt, sales_data, daily_breakdown, title, start_date, end_date, selected_stores)
+        export_file(fmt, dialog, txt, sales_data, daily_breakdown, index, title, start_date, end_date, selected_stores)
         try:
             smtp = config_smtp
             msg = MIMEMultipart()
@@ -252,28 +274,33 @@ def open_email_dialog(window, txt, sales_data, daily_breakdown, title, start_dat
         tk.Button(btn_frame, text="Send Now", command=send_now, bg="#005228", fg="#ecc10c").pack(side="left", padx=5)
     tk.Button(btn_frame, text="Close", command=dialog.destroy, bg="#005228", fg="#ecc10c").pack(side="right", padx=5)
 
-def create_toolbar(window, txt, title, sales_data, daily_breakdown, start_date, end_date, selected_stores):
-    """Create revamped toolbar with Export .PDF/.JSON/.TXT/.CSV, Email, Print, Copy."""
+def create_toolbar(window, txt, title, sales_data, daily_breakdown, index, start_date, end_date, selected_stores, live=None):
+    """Create revamped toolbar with Export .PDF/.JSON/.TXT/.CSV, Email, Print, Copy; live = (toggle, label var) adds a Live button."""
     toolbar = tk.Frame(window, bg="#f0f0f0")
     toolbar.pack(fill="x", pady=(8, 0), padx=8)
+    live_btn = None
+    if live:
+        toggle, label = live
+        live_btn = tk.Button(toolbar, textvariable=label, command=toggle, state=tk.DISABLED, bg="#005228", fg="#ecc10c", font=("Arial", 10))
+        live_btn.pack(side="left", padx=4)
     copy_btn = tk.Button(toolbar, text="Copy", state=tk.DISABLED, bg="#005228", fg="#ecc10c", font=("Arial", 10))
     copy_btn.pack(side="right", padx=4)
     print_btn = tk.Button(toolbar, text="Print", state=tk.DISABLED, bg="#005228", fg="#ecc10c", font=("Arial", 10))
     print_btn.pack(side="right", padx=4)
     email_btn = tk.Button(toolbar, text="Email", state=tk.DISABLED, bg="#005228", fg="#ecc10c", font=("Arial", 10),
-                          command=lambda: open_email_dialog(window, txt, sales_data, daily_breakdown, title, start_date, end_date, selected_stores, config_emails, config_smtp))
+                          command=lambda: open_email_dialog(window, txt, sales_data, daily_breakdown, index, title, start_date, end_date, selected_stores, config_emails, config_smtp))
     email_btn.pack(side="right", padx=4)
     csv_btn = tk.Button(toolbar, text="Export .CSV", state=tk.DISABLED, bg="#005228", fg="#ecc10c", font=("Arial", 10),
-                        command=lambda: export_file("CSV", window, txt, sales_data, daily_breakdown, title, start_date, end_date, selected_stores))
+                        command=lambda: export_file("CSV", window, txt, sales_data, daily_breakdown, index, title, start_date, end_date, selected_stores))
     csv_btn.pack(side="right", padx=4)
     txt_btn = tk.Button(toolbar, text="Export .TXT", state=tk.DISABLED, bg="#005228", fg="#ecc10c", font=("Arial", 10),
-                        command=lambda: export_file("TXT", window, txt, sales_data, daily_breakdown, title, start_date, end_date, selected_stores))
+                        command=lambda: export_file("TXT", window, txt, sales_data, daily_breakdown, index, title, start_date, end_date, selected_stores))
     txt_btn.pack(side="right", padx=4)
     json_btn = tk.Button(toolbar, text="Export .JSON", state=tk.DISABLED, bg="#005228", fg="#ecc10c", font=("Arial", 10),
-                         command=lambda: export_file("JSON", window, txt, sales_data, daily_breakdown, title, start_date, end_date, selected_stores))
+                         command=lambda: export_file("JSON", window, txt, sales_data, daily_breakdown, index, title, start_date, end_date, selected_stores))
     json_btn.pack(side="right", padx=4)
     pdf_btn = tk.Button(toolbar, text="Export .PDF", state=tk.DISABLED, bg="#005228", fg="#ecc10c", font=("Arial", 10),
-                        command=lambda: export_file("PDF", window, txt, sales_data, daily_breakdown, title, start_date, end_date, selected_stores))
+                        command=lambda: export_file("PDF", window, txt, sales_data, daily_breakdown, index, title, start_date, end_date, selected_stores))
     pdf_btn.pack(side="right", padx=4)
 
     def print_content():
@@ -296,9 +323,22 @@ def create_toolbar(window, txt, title, sales_data, daily_breakdown, start_date,
             elements.append(Paragraph(f"Stores: {', '.join(selected_stores)}", styles["Normal"]))
             elements.append(Spacer(1, 12))
             elements.append(Paragraph("Sales Summary", styles["Heading2"]))
-            for sid in selected_stores:
-                for entry in sales_data:
-                    if entry["Store"] == sid:
+            for entry in store_rows(index, selected_stores):
+                text = (f"Store: {entry['Store']:<6}<br/>"
+                        f"Sales: ${entry['Sales']:>10.2f}<br/>"
+                        f"Tax: ${entry['Tax']:>8.2f}<br/>"
+                        f"Units: {entry['Units']:>5}<br/>"
+                        f"Txns: {entry['Txns']:>5}<br/>"
+                        f"Cash/Card: ${entry['Cash/Card']:>10.2f}<br/>"
+                        f"3rd $: ${entry['3rd $']:>8.2f}<br/>"
+                        f"3rd Txns: {entry['3rd Txns']:>9}<br/>")
+                elements.append(Paragraph(text, style))
+                elements.append(Spacer(1, 12))
+            if not (start_date == end_date):
+                elements.append(Paragraph("Daily Breakdown", styles["Heading2"]))
+                for date in sorted(daily_breakdown):
+                    elements.append(Paragraph(f"Date: {date}", styles["Heading3"]))
+                    for entry in day_rows(index, date, selected_stores):
                         text = (f"Store: {entry['Store']:<6}<br/>"
                                 f"Sales: ${entry['Sales']:>10.2f}<br/>"
                                 f"Tax: ${entry['Tax']:>8.2f}<br/>"
@@ -309,23 +349,6 @@ def create_toolbar(window, txt, title, sales_data, daily_breakdown, start_date,
                                 f"3rd Txns: {entry['3rd Txns']:>9}<br/>")
                         elements.append(Paragraph(text, style))
                         elements.append(Spacer(1, 12))
-            if not (start_date == end_date):
-                elements.append(Paragraph("Daily Breakdown", styles["Heading2"]))
-                for date in sorted(daily_breakdown):
-                    elements.append(Paragraph(f"Date: {date}", styles["Heading3"]))
-                    for sid in selected_stores:
-                        for entry in daily_breakdown[date]:
-                            if entry["Store"] == sid:
-                                text = (f"Store: {entry['Store']:<6}<br/>"
-                                        f"Sales: ${entry['Sales']:>10.2f}<br/>"
-                                        f"Tax: ${entry['Tax']:>8.2f}<br/>"
-                                        f"Units: {entry['Units']:>5}<br/>"
-                                        f"Txns: {entry['Txns']:>5}<br/>"
-                                        f"Cash/Card: ${entry['Cash/Card']:>10.2f}<br/>"
-                                        f"3rd $: ${entry['3rd $']:>8.2f}<br/>"
-                                        f"3rd Txns: {entry['3rd Txns']:>9}<br/>")
-                                elements.append(Paragraph(text, style))
-                                elements.append(Spacer(1, 12))
             doc.build(elements)
             os.startfile(fname, "print")
         except Exception as e:
@@ -346,11 +369,17 @@ def create_toolbar(window, txt, title, sales_data, daily_breakdown, start_date,
         json_btn.config(state=tk.NORMAL)
         if REPORTLAB_AVAILABLE:
             pdf_btn.config(state=tk.NORMAL)
+        if live_btn:
+            live_btn.config(state=tk.NORMAL)
     return enable_toolbar
 
+@profiling.profiled("Sales")
 def run(window):
     """Run the Sales report for selected stores and date range."""
     from __main__ import get_selected_start_date, get_selected_end_date, fetch_data, store_vars, config_accounts, handle_rate_limit, log_error, config_max_workers, _password_validated, RateLimitError, config_emails, config_smtp, SCRIPT_DIR
+    fetch_data = metrics.instrument(fetch_data, config_accounts, RateLimitError)
+    metrics.start_exporter(SCRIPT_DIR)
+    roll = rollup.open_rollup(SCRIPT_DIR)
 
     if not _password_validated:
         messagebox.showerror("Access Denied", "Password validation required.", parent=window)
@@ -395,7 +424,118 @@ def run(window):
     sales_data = []
     store_summary = defaultdict(lambda: {"total_sales": 0.0, "total_tax": 0.0, "total_units": 0, "total_txns": 0, "total_cashcard": 0.0, "total_tp_sales": 0.0, "total_tp_txns": 0})
     daily_breakdown = defaultdict(list)
-    enable_toolbar = create_toolbar(window, txt, f"Sales Report: {start_date_str} to {end_date_str}", sales_data, daily_breakdown, start_date_str, end_date_str, selected_stores)
+    index = {}  # "store": sid -> summary row, "day": (date, sid) -> daily row; filled by the worker
+    store_map = {}  # sid -> (account name, cid, ckey); filled by the worker, reused by live refreshes
+
+    # Live mode (a report for today only): re-fetch Daily Sales Summary every live_minutes() through the
+    # shared paced request stream, and rewrite only the summary rows whose figures changed
+    live_day = start_date_str if is_single_day and start == date.today() else None
+    live = {"on": False, "job": None}
+    live_label = StringVar(window, value="Live: Off")
+    paced_fetch = pacing.shared().wrap(fetch_data, RateLimitError)
+
+    def set_live_status(text):
+        ranges = txt.tag_ranges("live")
+        if ranges:
+            txt.delete(ranges[0], ranges[1])
+            txt.insert(ranges[0], text + "\n", ("sep", "live"))
+        else:
+            txt.insert("end", "\n" + text + "\n", ("sep", "live"))
+
+    def stop_live(reason):
+        live["on"] = False
+        if live["job"]:
+            window.after_cancel(live["job"])
+            live["job"] = None
+        live_label.set("Live: Off")
+        set_live_status(f"Live: {reason}")
+
+    def schedule_live(note=""):
+        minutes = live_minutes()
+        live["job"] = window.after(minutes * 60000, start_live_refresh)
+        set_live_status(f"Live: {note}next refresh at {(datetime.now() + timedelta(minutes=minutes)).strftime('%H:%M')}")
+
+    def toggle_live():
+        if live["on"]:
+            stop_live("off")
+            return
+        live["on"] = True
+        live_label.set("Live: On")
+        schedule_live()
+
+    def start_live_refresh():
+        live["job"] = None
+        if not live["on"]:
+            return
+        if date.today().isoformat() != live_day:
+            stop_live(f"stopped, {live_day} is over")
+            return
+        set_live_status(f"Live: refreshing {len(store_map)} stores...")
+        threading.Thread(target=refresh_live, daemon=True).start()
+
+    def refresh_live():
+        rows, failed = {}, 0
+        try:
+            with ThreadPoolExecutor(max_workers=min(config_max_workers, len(store_map)) or 1) as ex:
+                futures = {ex.submit(paced_fetch, DAILY_ENDPOINT, sid, live_day, live_day, cid, ckey): sid
+                           for sid, (aname, cid, ckey) in store_map.items()}
+                for fut in as_completed(futures):
+                    sid = futures[fut]
+                    try:
+                        res = fut.result()
+                    except Exception as ex:
+                        log_error(f"Live refresh failed for store {sid}: {ex}", sid, DAILY_ENDPOINT)
+                        failed += 1
+                        continue
+                    if res.get("error"):
+                        log_error(f"Live refresh API error for store {sid}: {res['error']}", sid, DAILY_ENDPOINT)
+                        failed += 1
+                        continue
+                    data = res.get("data", res) or []
+                    if isinstance(data, dict):
+                        data = [data]
+                    if data:
+                        rows[sid] = entries.sales_entry(sid, schemas.DAILY_SALES_SUMMARY.decode(data[0]))
+        except Exception as ex:
+            log_error(f"Live refresh error: {ex}", endpoint=DAILY_ENDPOINT)
+        try:
+            window.after(0, lambda: apply_live(rows, failed))
+        except (tk.TclError, RuntimeError):
+            pass  # the window was closed mid-refresh
+
+    def apply_live(rows, failed):
+        if not window.winfo_exists():
+            return
+        changed = 0
+        by_store, by_day = index.setdefault("store", {}), index.setdefault("day", {})
+        for sid, new in rows.items():
+            entry = by_store.get(sid)
+            if entry is not None and all(entry[k] == new[k] for k in SUMMARY_KEYS):
+                continue
+            changed += 1
+            if entry is None:
+                sales_data.append(new)
+                by_store[sid] = entry = new
+            else:
+                entry.update(new)
+            day_entry = by_day.get((live_day, sid))
+            if day_entry is None:
+                daily_breakdown[live_day].append(dict(new))
+                by_day[(live_day, sid)] = daily_breakdown[live_day][-1]
+            else:
+                day_entry.update(new)
+            ranges = txt.tag_ranges(f"row:{sid}")
+            if ranges:
+                txt.delete(ranges[0], ranges[1])
+                txt.insert(ranges[0], summary_line(entry) + "\n", (f"row:{sid}",))
+        log_error(f"Live refresh: {changed} of {len(rows)} store(s) changed, {failed} failed", endpoint=DAILY_ENDPOINT)
+        if live["on"]:
+            schedule_live(f"updated {datetime.now().strftime('%H:%M')}, {changed} changed" + (f", {failed} failed" if failed else "") + "; ")
+
+    window.bind("<Destroy>", lambda e: live.update(on=False) if e.widget is window else None, add="+")
+
+    enable_toolbar = create_toolbar(window, txt, f"Sales Report: {start_date_str} to {end_date_str}", sales_data, daily_breakdown, index, start_date_str, end_date_str, selected_stores,
+                                    live=(toggle_live, live_label) if live_day else None)
     log_error("Toolbar created", endpoint=SALES_ENDPOINT)
 
     # Now pack txt below toolbar
@@ -407,6 +547,17 @@ def run(window):
     txt.tag_configure("heading", font=("Courier New", 11, "bold"), foreground="black")
     txt.tag_configure("sep", foreground="#888888")
 
+    def add_summary(entry):
+        sales_data.append(entry)
+        ss = store_summary[entry["Store"]]
+        ss["total_sales"] += entry["Sales"]
+        ss["total_tax"] += entry["Tax"]
+        ss["total_units"] += entry["Units"]
+        ss["total_txns"] += entry["Txns"]
+        ss["total_cashcard"] += entry["Cash/Card"]
+        ss["total_tp_sales"] += entry["3rd $"]
+        ss["total_tp_txns"] += entry["3rd Txns"]
+
     def log(line="", tag=None):
         txt.configure(state="normal")
         txt.insert("end", line + "\n", tag or ())
@@ -423,7 +574,6 @@ def run(window):
                 window.after(0, enable_toolbar)
                 return
 
-            store_map = {}
             for acct in config_accounts:
                 name = acct.get("Name", "")
                 cid = acct.get("ClientID", "")
@@ -442,9 +592,18 @@ def run(window):
                 window.after(0, enable_toolbar)
                 return
 
+            # Stores with every day already in the rollup are answered locally; only the rest are fetched
+            days = [(start + timedelta(days=x)).isoformat() for x in range((end - start).days + 1)]
+            fetch_map, rolled, rolled_rows = store_map, [], {}
+            if roll:
+                rolled, rest, rolled_rows = roll.covered("sales", list(store_map), days)
+                fetch_map = {sid: store_map[sid] for sid in rest}
+
             # Start report
             log(f"Sales Report: {start_date_str} to {end_date_str}", "title")
-            log(f"Fetching data for {len(store_map)} stores...", "sep")
+            log(f"Fetching data for {len(fetch_map)} stores...", "sep")
+            if rolled:
+                log(f"{len(rolled)} store(s) answered from the local rollup.", "sep")
             log("", None)
 
             # Choose endpoint based on date range
@@ -457,10 +616,14 @@ def run(window):
             log(hdr, "heading")
             log("─" * 75, "sep")
 
+            # Range totals for rolled-up stores are the sums of their daily rows
+            for sid in rolled:
+                add_summary({"Store": sid, **rollup.total((rolled_rows[(sid, d)] for d in days), SUMMARY_KEYS)})
+
             # Fetch top summary per store
             futures = {}
             with ThreadPoolExecutor(max_workers=min(config_max_workers, len(selected_stores))) as ex:
-                for sid, (aname, cid, ckey) in store_map.items():
+                for sid, (aname, cid, ckey) in fetch_map.items():
                     fut = ex.submit(fetch_data, top_ep, sid, start_date_str, end_date_str, cid, ckey)
                     futures[fut] = (sid, cid, ckey)
 
@@ -487,37 +650,28 @@ def run(window):
                     payload = res.get("data", res) or {}
                     if isinstance(payload, list):
                         payload = payload[0] if payload else {}
-                    sales = float(payload.get("netSales", payload.get("netSalesTotal", 0.0)))
-                    tax = float(payload.get("tax", 0.0))
-                    units = int(payload.get("units", payload.get("unitCount", 0)))
-                    txns = int(payload.get("transactions", payload.get("transactionCount", 0)))
-                    cashcard = float(payload.get("cashCardTotal", 0.0))
-                    tp_sales = float(payload.get("thirdPartySales", payload.get("thirdPartySaleTotal", 0.0)))
-                    tp_txns = int(payload.get("thirdPartyTransactions", payload.get("thirdPartyTransactionCount", 0)))
-                    sales_data.append({"Store": sid, "Sales": sales, "Tax": tax, "Units": units, "Txns": txns, "Cash/Card": cashcard, "3rd $": tp_sales, "3rd Txns": tp_txns})
-                    ss = store_summary[sid]
-                    ss["total_sales"] += sales
-                    ss["total_tax"] += tax
-                    ss["total_units"] += units
-                    ss["total_txns"] += txns
-                    ss["total_cashcard"] += cashcard
-                    ss["total_tp_sales"] += tp_sales
-                    ss["total_tp_txns"] += tp_txns
+                    add_summary(entries.sales_entry(sid, schemas.SCHEMAS[top_ep].decode(payload)))
+
+            # Index summary rows by store once; render, export, print and email read from it
+            index["store"] = {entry["Store"]: entry for entry in sales_data}
 
             # Log Sales Summary in selected_stores order
             for sid in selected_stores:
-                found = False
-                for entry in sales_data:
-                    if entry["Store"] == sid:
-                        found = True
-                        log(f"{sid:<6} {entry['Sales']:>10.2f} {entry['Tax']:>8.2f} {entry['Units']:>7} {entry['Txns']:>7} {entry['Cash/Card']:>11.2f} {entry['3rd $']:>8.2f} {entry['3rd Txns']:>10}")
-                if not found:
-                    log(f"Store {sid}: No data available.", "sep")
-
-            # Fetch daily breakdown per store
+                entry = index["store"].get(sid)
+                if entry:
+                    log(summary_line(entry), f"row:{sid}")
+                else:
+                    log(f"Store {sid}: No data available.", ("sep", f"row:{sid}"))
+
+            # Fetch daily breakdown per store; an all-zero rolled-up row is a day the store had no record (e.g. closed)
+            for sid in rolled:
+                for d in days:
+                    if any(rolled_rows[(sid, d)].values()):
+                        daily_breakdown[d].append({"Store": sid, **rolled_rows[(sid, d)]})
+            fetched, answered = {}, set()
             futures = {}
             with ThreadPoolExecutor(max_workers=min(config_max_workers, len(selected_stores))) as ex:
-                for sid, (aname, cid, ckey) in store_map.items():
+                for sid, (aname, cid, ckey) in fetch_map.items():
                     fut = ex.submit(fetch_data, DAILY_ENDPOINT, sid, start_date_str, end_date_str, cid, ckey)
                     futures[fut] = (sid, cid, ckey)
 
@@ -541,6 +695,7 @@ def run(window):
                         log(f"❌ Store {sid}: {err}", "sep")
                         continue
 
+                    answered.add(sid)
                     data = res.get("data", res) or []
                     if isinstance(data, dict):
                         data = [data]
@@ -550,40 +705,57 @@ def run(window):
                         log_error(f"No data for store {sid}", endpoint=DAILY_ENDPOINT)
                         continue
 
+                    decode_daily = schemas.DAILY_SALES_SUMMARY.decode
+                    day = schemas.day_reader(data)
                     for rec in data:
-                        date_key = next((k for k in rec if "date" in k.lower()), None)
-                        raw = rec.get(date_key, "")
-                        date = raw.split("T")[0] if "T" in str(raw) else str(raw)
                         try:
-                            parsed_date = datetime.strptime(date, "%Y-%m-%d").date()
-                            date = parsed_date.strftime("%Y-%m-%d")
-                        except ValueError:
-                            log_error(f"Invalid date format for store {sid}: {raw}", endpoint=DAILY_ENDPOINT)
+                            date = day(rec)
+                        except ValueError as e:
+                            log_error(f"Invalid date format for store {sid}: {e}", endpoint=DAILY_ENDPOINT)
                             continue
-                        sales = float(rec.get("netSales", rec.get("netSalesTotal", 0.0)))
-                        tax = float(rec.get("tax", 0.0))
-                        units = int(rec.get("units", rec.get("unitCount", 0)))
-                        txns = int(rec.get("transactions", rec.get("transactionCount", 0)))
-                        cashcard = float(rec.get("cashCardTotal", 0.0))
-                        tp_sales = float(rec.get("thirdPartySales", rec.get("thirdPartySaleTotal", 0.0)))
-                        tp_txns = int(rec.get("thirdPartyTransactions", rec.get("thirdPartyTransactionCount", 0)))
-                        daily_breakdown[date].append({"Store": sid, "Sales": sales, "Tax": tax, "Units": units, "Txns": txns, "Cash/Card": cashcard, "3rd $": tp_sales, "3rd Txns": tp_txns})
+                        entry = entries.sales_entry(sid, decode_daily(rec))
+                        daily_breakdown[date].append(entry)
+                        fetched[(sid, date)] = entry
+
+            # Roll the fetched days up for later runs (settled days only); a day a store that answered
+            # has no record for is rolled up as zeros, so closed days do not force a fetch every run
+            if roll:
+                zero = {key: 0 for _, key, _ in rollup.SOURCES["sales"]}
+                roll.put("sales", [(sid, d, fetched.get((sid, d)) or zero) for sid in answered for d in days])
+
+            # Index daily rows by (date, store) once
+            index["day"] = {(date, entry["Store"]): entry for date, day_rows in daily_breakdown.items() for entry in day_rows}
+            dates = sorted(daily_breakdown)
+
+            # Period-over-period tables: comparison days come from the rollup, only days it lacks are fetched
+            periods = compare.selected()
+            if periods:
+                def fetch_run(sid, cid, ckey, first, last):
+                    res = fetch_data(DAILY_ENDPOINT, sid, first, last, cid, ckey)
+                    if res.get("error"):
+                        raise compare.FetchError(res["error"])
+                    return entries.daily_entries(sid, res.get("data", res))
+
+                totals, failed = compare.collect(roll, "sales", store_map, periods, start, end, fetch_run, ("Sales", "Txns"), max_workers=config_max_workers)
+                for sid, err in failed.items():
+                    log_error(f"Comparison fetch failed for store {sid}: {err}", sid, DAILY_ENDPOINT)
+                    log(f"⚠️ Store {sid}: comparison data incomplete ({err}).", "sep")
+                for line, tag in compare.report_lines(selected_stores, index["store"], totals, (("Sales", "Sales", True), ("Txns", "Txns", False))):
+                    log(line, tag)
 
             # Log per-day summaries only for multi-day
             if not is_single_day:
-                for date in sorted(daily_breakdown):
+                for date in dates:
                     log("", None)
                     log(f"Per-Day Sales Summary ({date})", "title")
                     log("─" * 75, "sep")
                     log(f"{'Store':<6} {'Sales':>10} {'Tax':>8} {'Units':>7} {'Txns':>7} {'Cash/Card':>11} {'3rd $':>8} {'3rd Txns':>10}", "heading")
                     log("─" * 75, "sep")
                     for sid in selected_stores:
-                        found = False
-                        for entry in daily_breakdown[date]:
-                            if entry["Store"] == sid:
-                                found = True
-                                log(f"{entry['Store']:<6} {entry['Sales']:>10.2f} {entry['Tax']:>8.2f} {entry['Units']:>7} {entry['Txns']:>7} {entry['Cash/Card']:>11.2f} {entry['3rd $']:>8.2f} {entry['3rd Txns']:>10}")
-                        if not found:
+                        entry = index["day"].get((date, sid))
+                        if entry:
+                            log(f"{entry['Store']:<6} {entry['Sales']:>10.2f} {entry['Tax']:>8.2f} {entry['Units']:>7} {entry['Txns']:>7} {entry['Cash/Card']:>11.2f} {entry['3rd $']:>8.2f} {entry['3rd Txns']:>10}")
+                        else:
                             log(f"{sid:<6} {0.0:>10.2f} {0.0:>8.2f} {0:>7} {0:>7} {0.0:>11.2f} {0.0:>8.2f} {0:>10}")
                     log("─" * 75, "sep")
 
@@ -596,11 +768,11 @@ def run(window):
                     log(f"{'Date':<10} {'Sales':>10} {'Tax':>8} {'Units':>7} {'Txns':>7} {'Cash/Card':>11} {'3rd $':>8} {'3rd Txns':>10}", "heading")
                     log("─" * 75, "sep")
                     has_data = False
-                    for date in sorted(daily_breakdown):
-                        for entry in daily_breakdown[date]:
-                            if entry["Store"] == sid:
-                                has_data = True
-                                log(f"{date:<10} {entry['Sales']:>10.2f} {entry['Tax']:>8.2f} {entry['Units']:>7} {entry['Txns']:>7} {entry['Cash/Card']:>11.2f} {entry['3rd $']:>8.2f} {entry['3rd Txns']:>10}")
+                    for date in dates:
+                        entry = index["day"].get((date, sid))
+                        if entry:
+                            has_data = True
+                            log(f"{date:<10} {entry['Sales']:>10.2f} {entry['Tax']:>8.2f} {entry['Units']:>7} {entry['Txns']:>7} {entry['Cash/Card']:>11.2f} {entry['3rd $']:>8.2f} {entry['3rd Txns']:>10}")
                     if not has_data:
                         log(f"No data for this store.")
                     log("─" * 75, "sep")
@@ -615,7 +787,7 @@ def run(window):
             log(f"❌ Report error: {ex}", "sep")
             window.after(0, enable_toolbar)
 
-    threading.Thread(target=worker, daemon=True).start()
+    threading.Thread(target=metrics.timed(profiling.profiled("Sales", "worker")(worker), "Sales"), daemon=True).start()
 
 if __name__ == "__main__":
     config_emails = []
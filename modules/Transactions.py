@@ -3,15 +3,19 @@ import threading
 import tkinter as tk
 from tkinter.scrolledtext import ScrolledText
 from tkinter import messagebox, filedialog, Toplevel, StringVar
-from datetime import datetime, date, timedelta
+from datetime import datetime, date
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import tempfile
-import win32print
+try:
+    import win32print
+except ImportError:
+    win32print = None
 import urllib.parse
 import webbrowser
 import csv
 import json
 import os
+import sys
 import subprocess
 import smtplib
 import random
@@ -19,6 +23,7 @@ from email.mime.text import MIMEText
 from email.mime.application import MIMEApplication
 from email.mime.multipart import MIMEMultipart
 from collections import defaultdict
+import heapq
 try:
     from reportlab.lib.pagesizes import letter
     from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
@@ -28,8 +33,12 @@ except ImportError:
     REPORTLAB_AVAILABLE = False
 
 ENDPOINT_NAME = "Transaction Summary"
-MAX_DAYS = 7
+MAX_DAYS = 7  # every transaction is kept and listed, so the range stays short
 SCRIPT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+MODULES_DIR = os.path.dirname(os.path.abspath(__file__))
+if MODULES_DIR not in sys.path:
+    sys.path.insert(0, MODULES_DIR)
+from liveiq import compare, entries, metrics, profiling, rollup, schemas, windows
 
 def generate_unique_filename(ext):
     """Generate unique filename in reports/ dir (Transactions-XXXX.ext, alphanumeric)."""
@@ -42,10 +51,46 @@ def generate_unique_filename(ext):
         if not os.path.exists(fname):
             return fname
 
-def export_file(fmt, window, txt, transactions_data, store_summary, daily_breakdown, title, start_date, end_date, selected_stores):
+def index_transactions(table):
+    """Bucket row ids per store sorted by (Date, Time), plus a by-type index in (Store, Date, Time) order."""
+    store, date, times = table.columns["Store"], table.columns["Date"], table.columns["Time"]
+    dates, date_codes = date.values, date.codes
+    by_code = defaultdict(list)
+    for i, code in enumerate(store.codes):
+        by_code[code].append(i)
+    type_col = table.columns["Type"]
+    type_names = [str(t).lower() for t in type_col.values]
+    by_store, by_type = {}, defaultdict(list)
+    for code in sorted(by_code, key=lambda c: store.values[c]):
+        rows = by_code[code]
+        rows.sort(key=lambda i: (dates[date_codes[i]], times[i]))
+        by_store[store.values[code]] = rows
+        for i in rows:
+            by_type[type_names[type_col.codes[i]]].append(i)
+    return {"store": by_store, "type": dict(by_type)}
+
+def void_refund_rows(table, index):
+    """Voided and refunded rows in (Store, Date, Time) order, merged from the by-type index."""
+    by_type = index.get("type", {})
+    rows = table.rows(heapq.merge(by_type.get("void", []), by_type.get("refund", []),
+                                  key=lambda i: (table.columns["Store"][i], table.columns["Date"][i], table.columns["Time"][i])))
+    return list(rows)
+
+def day_rows(index, date, selected_stores):
+    """One day's summary rows in selected_stores order, read from the (date, store) index."""
+    by_day = index.get("day", {})
+    return [by_day[(date, sid)] for sid in selected_stores if (date, sid) in by_day]
+
+def store_day_rows(index, sid, dates):
+    """(date, row) pairs for one store across dates, read from the (date, store) index."""
+    by_day = index.get("day", {})
+    return [(date, by_day[(date, sid)]) for date in dates if (date, sid) in by_day]
+
+def export_file(fmt, window, txt, transactions_data, store_summary, daily_breakdown, index, title, start_date, end_date, selected_stores):
     """Export report to specified format (PDF, JSON, CSV, TXT)."""
     fname = generate_unique_filename(fmt)
     is_single_day = start_date == end_date
+    dates = sorted(daily_breakdown)
     if fmt == "CSV":
         with open(fname, "w", newline="", encoding="utf-8") as f:
             writer = csv.writer(f)
@@ -68,27 +113,23 @@ def export_file(fmt, window, txt, transactions_data, store_summary, daily_breakd
                 writer.writerow([])
                 writer.writerow(["Per-Day Transaction Summary"])
                 writer.writerow(["Date", "Store", "Total Sales", "Total Net", "Total Tax", "Total Units", "Total Txns", "EatIn", "ToGo", "Deliv", "Avg Tx $", "Void #", "Void $", "Refund #", "Refund $"])
-                for date in sorted(daily_breakdown):
-                    for sid in selected_stores:
-                        for entry in daily_breakdown[date]:
-                            if entry["Store"] == sid:
-                                writer.writerow([date, entry["Store"], f"{entry['total_sales']:.2f}", f"{entry['total_net']:.2f}", 
-                                                f"{entry['total_tax']:.2f}", entry["total_units"], entry["total_txns"], 
-                                                entry["eatin"], entry["togo"], entry["delivery"], f"{entry['avg_tx']:.2f}", 
-                                                entry["void_count"], f"{entry['void_total']:.2f}", entry["refund_count"], 
-                                                f"{entry['refund_total']:.2f}"])
+                for date in dates:
+                    for entry in day_rows(index, date, selected_stores):
+                        writer.writerow([date, entry["Store"], f"{entry['total_sales']:.2f}", f"{entry['total_net']:.2f}", 
+                                        f"{entry['total_tax']:.2f}", entry["total_units"], entry["total_txns"], 
+                                        entry["eatin"], entry["togo"], entry["delivery"], f"{entry['avg_tx']:.2f}", 
+                                        entry["void_count"], f"{entry['void_total']:.2f}", entry["refund_count"], 
+                                        f"{entry['refund_total']:.2f}"])
                 writer.writerow([])
                 writer.writerow(["Per-Store Breakdown"])
                 writer.writerow(["Store", "Date", "Total Sales", "Total Net", "Total Tax", "Total Units", "Total Txns", "EatIn", "ToGo", "Deliv", "Avg Tx $", "Void #", "Void $", "Refund #", "Refund $"])
                 for sid in selected_stores:
-                    for date in sorted(daily_breakdown):
-                        for entry in daily_breakdown[date]:
-                            if entry["Store"] == sid:
-                                writer.writerow([entry["Store"], date, f"{entry['total_sales']:.2f}", f"{entry['total_net']:.2f}", 
-                                                f"{entry['total_tax']:.2f}", entry["total_units"], entry["total_txns"], 
-                                                entry["eatin"], entry["togo"], entry["delivery"], f"{entry['avg_tx']:.2f}", 
-                                                entry["void_count"], f"{entry['void_total']:.2f}", entry["refund_count"], 
-                                                f"{entry['refund_total']:.2f}"])
+                    for date, entry in store_day_rows(index, sid, dates):
+                        writer.writerow([entry["Store"], date, f"{entry['total_sales']:.2f}", f"{entry['total_net']:.2f}", 
+                                        f"{entry['total_tax']:.2f}", entry["total_units"], entry["total_txns"], 
+                                        entry["eatin"], entry["togo"], entry["delivery"], f"{entry['avg_tx']:.2f}", 
+                                        entry["void_count"], f"{entry['void_total']:.2f}", entry["refund_count"], 
+                                        f"{entry['refund_total']:.2f}"])
             writer.writerow([])
             writer.writerow(["Void/Refund Summary"])
             writer.writerow(["Store", "Void #", "Void $", "Refund #", "Refund $"])
@@ -98,15 +139,14 @@ def export_file(fmt, window, txt, transactions_data, store_summary, daily_breakd
             writer.writerow([])
             writer.writerow(["Voided/Refunded Transactions"])
             writer.writerow(["Store", "Date", "Time", "Type", "Receipt #", "Clerk", "Amount $"])
-            vr_list = [entry for entry in transactions_data if entry["Type"].lower() in ["void", "refund"]]
-            for entry in sorted(vr_list, key=lambda x: (x["Store"], x["Date"], x["Time"])):
+            for entry in void_refund_rows(transactions_data, index):
                 writer.writerow([entry["Store"], entry["Date"], entry["Time"], entry["Type"], entry["Receipt"], entry["Clerk"][:15], f"{entry['Total']:.2f}"])
     elif fmt == "JSON":
         export_data = {
             "generated_on": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
             "date_range": f"{start_date} to {end_date}",
             "stores": selected_stores,
-            "transaction_entries": transactions_data,
+            "transaction_entries": transactions_data.to_dicts(),
             "store_summaries": [{"Store": sid, "Total Sales": ss["total_sales"], "Total Net": ss["total_net"], "Total Tax": ss["total_tax"], 
                                 "Total Units": ss["total_units"], "Total Txns": ss["total_txns"], "EatIn": ss["eatin"], "ToGo": ss["togo"], 
                                 "Deliv": ss["delivery"], "Avg Tx $": ss["avg_tx"], "Void #": ss["void_count"], "Void $": ss["void_total"], 
@@ -122,8 +162,7 @@ def export_file(fmt, window, txt, transactions_data, store_summary, daily_breakd
             "voided_refunded_transactions": [{"Store": entry["Store"], "Date": entry["Date"], "Time": entry["Time"], 
                                               "Type": entry["Type"], "Receipt": entry["Receipt"], "Clerk": entry["Clerk"], 
                                               "Amount $": entry["Total"]} 
-                                             for entry in sorted([entry for entry in transactions_data if entry["Type"].lower() in ["void", "refund"]], 
-                                                                key=lambda x: (x["Store"], x["Date"], x["Time"]))]
+                                             for entry in void_refund_rows(transactions_data, index)]
         }
         if not is_single_day:
             export_data["per_day_summary"] = {date: [{"Store": entry["Store"], "Total Sales": entry["total_sales"], "Total Net": entry["total_net"], 
@@ -131,14 +170,14 @@ def export_file(fmt, window, txt, transactions_data, store_summary, daily_breakd
                                                      "EatIn": entry["eatin"], "ToGo": entry["togo"], "Deliv": entry["delivery"], 
                                                      "Avg Tx $": entry["avg_tx"], "Void #": entry["void_count"], "Void $": entry["void_total"], 
                                                      "Refund #": entry["refund_count"], "Refund $": entry["refund_total"]} 
-                                                    for sid in selected_stores for entry in entries if entry["Store"] == sid] 
-                                                   for date, entries in sorted(daily_breakdown.items())}
+                                                    for entry in day_rows(index, date, selected_stores)] 
+                                                   for date in dates}
             export_data["per_store_breakdown"] = {sid: [{"Date": date, "Total Sales": entry["total_sales"], "Total Net": entry["total_net"], 
                                                         "Total Tax": entry["total_tax"], "Total Units": entry["total_units"], "Total Txns": entry["total_txns"], 
                                                         "EatIn": entry["eatin"], "ToGo": entry["togo"], "Deliv": entry["delivery"], 
                                                         "Avg Tx $": entry["avg_tx"], "Void #": entry["void_count"], "Void $": entry["void_total"], 
                                                         "Refund #": entry["refund_count"], "Refund $": entry["refund_total"]} 
-                                                       for date in sorted(daily_breakdown) for entry in daily_breakdown[date] if entry["Store"] == sid] 
+                                                       for date, entry in store_day_rows(index, sid, dates)] 
                                                       for sid in selected_stores}
         with open(fname, "w", encoding="utf-8") as f:
             json.dump(export_data, f, indent=2)
@@ -191,27 +230,23 @@ def export_file(fmt, window, txt, transactions_data, store_summary, daily_breakd
                 elements.append(Paragraph("Per-Day Transaction Summary", styles["Heading2"]))
                 elements.append(Paragraph(f"{'Date':<10} {'Store':<6} {'TotSales':>10} {'TotNet':>8} {'TotTax':>8} {'TotUnits':>8} {'TotTxns':>8} {'EatIn':>5} {'ToGo':>5} {'Deliv':>5} {'AvgTx$':>8} {'Void#':>5} {'Void$':>8} {'Rfund#':>6} {'Rfund$':>8}", style))
                 elements.append(Paragraph("─" * 75, style))
-                for date in sorted(daily_breakdown):
-                    for sid in selected_stores:
-                        for entry in daily_breakdown[date]:
-                            if entry["Store"] == sid:
-                                text = (f"{date:<10} {entry['Store']:<6} {entry['total_sales']:>10.2f} {entry['total_net']:>8.2f} {entry['total_tax']:>8.2f} "
-                                        f"{entry['total_units']:>8} {entry['total_txns']:>8} {entry['eatin']:>5} {entry['togo']:>5} {entry['delivery']:>5} "
-                                        f"{entry['avg_tx']:>8.2f} {entry['void_count']:>5} {entry['void_total']:>8.2f} {entry['refund_count']:>6} {entry['refund_total']:>8.2f}")
-                                elements.append(Paragraph(text, style))
-                                elements.append(Spacer(1, 12))
+                for date in dates:
+                    for entry in day_rows(index, date, selected_stores):
+                        text = (f"{date:<10} {entry['Store']:<6} {entry['total_sales']:>10.2f} {entry['total_net']:>8.2f} {entry['total_tax']:>8.2f} "
+                                f"{entry['total_units']:>8} {entry['total_txns']:>8} {entry['eatin']:>5} {entry['togo']:>5} {entry['delivery']:>5} "
+                                f"{entry['avg_tx']:>8.2f} {entry['void_count']:>5} {entry['void_total']:>8.2f} {entry['refund_count']:>6} {entry['refund_total']:>8.2f}")
+                        elements.append(Paragraph(text, style))
+                        elements.append(Spacer(1, 12))
                 elements.append(Paragraph("Per-Store Breakdown", styles["Heading2"]))
                 elements.append(Paragraph(f"{'Store':<6} {'Date':<10} {'TotSales':>10} {'TotNet':>8} {'TotTax':>8} {'TotUnits':>8} {'TotTxns':>8} {'EatIn':>5} {'ToGo':>5} {'Deliv':>5} {'AvgTx$':>8} {'Void#':>5} {'Void$':>8} {'Rfund#':>6} {'Rfund$':>8}", style))
                 elements.append(Paragraph("─" * 75, style))
                 for sid in selected_stores:
-                    for date in sorted(daily_breakdown):
-                        for entry in daily_breakdown[date]:
-                            if entry["Store"] == sid:
-                                text = (f"{entry['Store']:<6} {date:<10} {entry['total_sales']:>10.2f} {entry['total_net']:>8.2f} {entry['total_tax']:>8.2f} "
-                                        f"{entry['total_units']:>8} {entry['total_txns']:>8} {entry['eatin']:>5} {entry['togo']:>5} {entry['delivery']:>5} "
-                                        f"{entry['avg_tx']:>8.2f} {entry['void_count']:>5} {entry['void_total']:>8.2f} {entry['refund_count']:>6} {entry['refund_total']:>8.2f}")
-                                elements.append(Paragraph(text, style))
-                                elements.append(Spacer(1, 12))
+                    for date, entry in store_day_rows(index, sid, dates):
+                        text = (f"{entry['Store']:<6} {date:<10} {entry['total_sales']:>10.2f} {entry['total_net']:>8.2f} {entry['total_tax']:>8.2f} "
+                                f"{entry['total_units']:>8} {entry['total_txns']:>8} {entry['eatin']:>5} {entry['togo']:>5} {entry['delivery']:>5} "
+                                f"{entry['avg_tx']:>8.2f} {entry['void_count']:>5} {entry['void_total']:>8.2f} {entry['refund_count']:>6} {entry['refund_total']:>8.2f}")
+                        elements.append(Paragraph(text, style))
+                        elements.append(Spacer(1, 12))
             elements.append(Paragraph("Void/Refund Summary", styles["Heading2"]))
             elements.append(Paragraph(f"{'Store':<6} {'Void #':>6} {'Void $':>8} {'Refund #':>8} {'Refund $':>8}", style))
             elements.append(Paragraph("─" * 37, style))
@@ -223,8 +258,7 @@ def export_file(fmt, window, txt, transactions_data, store_summary, daily_breakd
             elements.append(Paragraph("Voided/Refunded Transactions", styles["Heading2"]))
             elements.append(Paragraph(f"{'Store':<6} {'Date':<10} {'Time':<8} {'Type':<5} {'Receipt #':<9} {'Clerk':<15} {'Amount $':>8}", style))
             elements.append(Paragraph("─" * 63, style))
-            vr_list = [entry for entry in transactions_data if entry["Type"].lower() in ["void", "refund"]]
-            for entry in sorted(vr_list, key=lambda x: (x["Store"], x["Date"], x["Time"])):
+            for entry in void_refund_rows(transactions_data, index):
                 text = (f"{entry['Store']:<6} {entry['Date']:<10} {entry['Time']:<8} {entry['Type']:<5} {entry['Receipt']:<9} {entry['Clerk'][:15]:<15} {entry['Total']:>8.2f}")
                 elements.append(Paragraph(text, style))
                 elements.append(Spacer(1, 12))
@@ -244,7 +278,7 @@ def export_file(fmt, window, txt, transactions_data, store_summary, daily_breakd
         else:
             messagebox.showinfo("Open Info", f"File saved to {fname}. Open manually (error: {e}).", parent=window)
 
-def open_email_dialog(window, txt, transactions_data, store_summary, daily_breakdown, title, start_date, end_date, selected_stores, config_emails, config_smtp):
+def open_email_dialog(window, txt, transactions_data, store_summary, daily_breakdown, index, title, start_date, end_date, selected_stores, config_emails, config_smtp):
     """Open dialog to select emails, format, and send report as attachment via mailto or SMTP."""
     if not config_emails:
         messagebox.showwarning("No Emails", "No emails configured. Add via Emails button.", parent=window)
@@ -282,7 +316,7 @@ def open_email_dialog(window, txt, transactions_data, store_summary, daily_break
             messagebox.showwarning("No Selection", "Select at least one email.", parent=dialog)
             return
         fmt = format_var.get()
-        export_file(fmt, dialog, txt, transactions_data, store_summary, daily_breakdown, title, start_date, end_date, selected_stores)
+        export_file(fmt, dialog, txt, transactions_data, store_summary, daily_breakdown, index, title, start_date, end_date, selected_stores)
         fname = generate_unique_filename(fmt)
         lines = txt.get("1.0", "end-1c").splitlines()
         subj = f"Transactions Report: {start_date} to {end_date}"
@@ -302,7 +336,7 @@ def open_email_dialog(window, txt, transactions_data, store_summary, daily_break
             return
         fmt = format_var.get()
         fname = generate_unique_filename(fmt)
-        export_file(fmt, dialog, txt, transactions_data, store_summary, daily_breakdown, title, start_date, end_date, selected_stores)
+        export_file(fmt, dialog, txt, transactions_data, store_summary, daily_breakdown, index, title, start_date, end_date, selected_stores)
         try:
             smtp = config_smtp
             msg = MIMEMultipart()
@@ -339,7 +373,7 @@ def open_email_dialog(window, txt, transactions_data, store_summary, daily_break
         tk.Button(btn_frame, text="Send Now", command=send_now, bg="#005228", fg="#ecc10c").pack(side="left", padx=5)
     tk.Button(btn_frame, text="Close", command=dialog.destroy, bg="#005228", fg="#ecc10c").pack(side="right", padx=5)
 
-def create_toolbar(window, txt, title, transactions_data, store_summary, daily_breakdown, start_date, end_date, selected_stores):
+def create_toolbar(window, txt, title, transactions_data, store_summary, daily_breakdown, index, start_date, end_date, selected_stores):
     """Create revamped toolbar with Export .PDF/.JSON/.TXT/.CSV, Email, Print, Copy."""
     toolbar = tk.Frame(window, bg="#f0f0f0")
     toolbar.pack(fill="x", pady=(8, 0), padx=8)
@@ -348,19 +382,19 @@ def create_toolbar(window, txt, title, transactions_data, store_summary, daily_b
     print_btn = tk.Button(toolbar, text="Print", state=tk.DISABLED, bg="#005228", fg="#ecc10c", font=("Arial", 10))
     print_btn.pack(side="right", padx=4)
     email_btn = tk.Button(toolbar, text="Email", state=tk.DISABLED, bg="#005228", fg="#ecc10c", font=("Arial", 10),
-                          command=lambda: open_email_dialog(window, txt, transactions_data, store_summary, daily_breakdown, title, start_date, end_date, selected_stores, config_emails, config_smtp))
+                          command=lambda: open_email_dialog(window, txt, transactions_data, store_summary, daily_breakdown, index, title, start_date, end_date, selected_stores, config_emails, config_smtp))
     email_btn.pack(side="right", padx=4)
     csv_btn = tk.Button(toolbar, text="Export .CSV", state=tk.DISABLED, bg="#005228", fg="#ecc10c", font=("Arial", 10),
-                        command=lambda: export_file("CSV", window, txt, transactions_data, store_summary, daily_breakdown, title, start_date, end_date, selected_stores))
+                        command=lambda: export_file("CSV", window, txt, transactions_data, store_summary, daily_breakdown, index, title, start_date, end_date, selected_stores))
     csv_btn.pack(side="right", padx=4)
     txt_btn = tk.Button(toolbar, text="Export .TXT", state=tk.DISABLED, bg="#005228", fg="#ecc10c", font=("Arial", 10),
-                        command=lambda: export_file("TXT", window, txt, transactions_data, store_summary, daily_breakdown, title, start_date, end_date, selected_stores))
+                        command=lambda: export_file("TXT", window, txt, transactions_data, store_summary, daily_breakdown, index, title, start_date, end_date, selected_stores))
     txt_btn.pack(side="right", padx=4)
     json_btn = tk.Button(toolbar, text="Export .JSON", state=tk.DISABLED, bg="#005228", fg="#ecc10c", font=("Arial", 10),
-                         command=lambda: export_file("JSON", window, txt, transactions_data, store_summary, daily_breakdown, title, start_date, end_date, selected_stores))
+                         command=lambda: export_file("JSON", window, txt, transactions_data, store_summary, daily_breakdown, index, title, start_date, end_date, selected_stores))
     json_btn.pack(side="right", padx=4)
     pdf_btn = tk.Button(toolbar, text="Export .PDF", state=tk.DISABLED, bg="#005228", fg="#ecc10c", font=("Arial", 10),
-                        command=lambda: export_file("PDF", window, txt, transactions_data, store_summary, daily_breakdown, title, start_date, end_date, selected_stores))
+                        command=lambda: export_file("PDF", window, txt, transactions_data, store_summary, daily_breakdown, index, title, start_date, end_date, selected_stores))
     pdf_btn.pack(side="right", padx=4)
 
     def print_content():
@@ -407,27 +441,24 @@ def create_toolbar(window, txt, title, transactions_data, store_summary, daily_b
                 elements.append(Paragraph("Per-Day Transaction Summary", styles["Heading2"]))
                 elements.append(Paragraph(f"{'Date':<10} {'Store':<6} {'TotSales':>10} {'TotNet':>8} {'TotTax':>8} {'TotUnits':>8} {'TotTxns':>8} {'EatIn':>5} {'ToGo':>5} {'Deliv':>5} {'AvgTx$':>8} {'Void#':>5} {'Void$':>8} {'Rfund#':>6} {'Rfund$':>8}", style))
                 elements.append(Paragraph("─" * 75, style))
-                for date in sorted(daily_breakdown):
-                    for sid in selected_stores:
-                        for entry in daily_breakdown[date]:
-                            if entry["Store"] == sid:
-                                text = (f"{date:<10} {entry['Store']:<6} {entry['total_sales']:>10.2f} {entry['total_net']:>8.2f} {entry['total_tax']:>8.2f} "
-                                        f"{entry['total_units']:>8} {entry['total_txns']:>8} {entry['eatin']:>5} {entry['togo']:>5} {entry['delivery']:>5} "
-                                        f"{entry['avg_tx']:>8.2f} {entry['void_count']:>5} {entry['void_total']:>8.2f} {entry['refund_count']:>6} {entry['refund_total']:>8.2f}")
-                                elements.append(Paragraph(text, style))
-                                elements.append(Spacer(1, 12))
+                dates = sorted(daily_breakdown)
+                for date in dates:
+                    for entry in day_rows(index, date, selected_stores):
+                        text = (f"{date:<10} {entry['Store']:<6} {entry['total_sales']:>10.2f} {entry['total_net']:>8.2f} {entry['total_tax']:>8.2f} "
+                                f"{entry['total_units']:>8} {entry['total_txns']:>8} {entry['eatin']:>5} {entry['togo']:>5} {entry['delivery']:>5} "
+                                f"{entry['avg_tx']:>8.2f} {entry['void_count']:>5} {entry['void_total']:>8.2f} {entry['refund_count']:>6} {entry['refund_total']:>8.2f}")
+                        elements.append(Paragraph(text, style))
+                        elements.append(Spacer(1, 12))
                 elements.append(Paragraph("Per-Store Breakdown", styles["Heading2"]))
                 elements.append(Paragraph(f"{'Store':<6} {'Date':<10} {'TotSales':>10} {'TotNet':>8} {'TotTax':>8} {'TotUnits':>8} {'TotTxns':>8} {'EatIn':>5} {'ToGo':>5} {'Deliv':>5} {'AvgTx$':>8} {'Void#':>5} {'Void$':>8} {'Rfund#':>6} {'Rfund$':>8}", style))
                 elements.append(Paragraph("─" * 75, style))
                 for sid in selected_stores:
-                    for date in sorted(daily_breakdown):
-                        for entry in daily_breakdown[date]:
-                            if entry["Store"] == sid:
-                                text = (f"{entry['Store']:<6} {date:<10} {entry['total_sales']:>10.2f} {entry['total_net']:>8.2f} {entry['total_tax']:>8.2f} "
-                                        f"{entry['total_units']:>8} {entry['total_txns']:>8} {entry['eatin']:>5} {entry['togo']:>5} {entry['delivery']:>5} "
-                                        f"{entry['avg_tx']:>8.2f} {entry['void_count']:>5} {entry['void_total']:>8.2f} {entry['refund_count']:>6} {entry['refund_total']:>8.2f}")
-                                elements.append(Paragraph(text, style))
-                                elements.append(Spacer(1, 12))
+                    for date, entry in store_day_rows(index, sid, dates):
+                        text = (f"{entry['Store']:<6} {date:<10} {entry['total_sales']:>10.2f} {entry['total_net']:>8.2f} {entry['total_tax']:>8.2f} "
+                                f"{entry['total_units']:>8} {entry['total_txns']:>8} {entry['eatin']:>5} {entry['togo']:>5} {entry['delivery']:>5} "
+                                f"{entry['avg_tx']:>8.2f} {entry['void_count']:>5} {entry['void_total']:>8.2f} {entry['refund_count']:>6} {entry['refund_total']:>8.2f}")
+                        elements.append(Paragraph(text, style))
+                        elements.append(Spacer(1, 12))
             elements.append(Paragraph("Void/Refund Summary", styles["Heading2"]))
             elements.append(Paragraph(f"{'Store':<6} {'Void #':>6} {'Void $':>8} {'Refund #':>8} {'Refund $':>8}", style))
             elements.append(Paragraph("─" * 37, style))
@@ -439,8 +470,7 @@ def create_toolbar(window, txt, title, transactions_data, store_summary, daily_b
             elements.append(Paragraph("Voided/Refunded Transactions", styles["Heading2"]))
             elements.append(Paragraph(f"{'Store':<6} {'Date':<10} {'Time':<8} {'Type':<5} {'Receipt #':<9} {'Clerk':<15} {'Amount $':>8}", style))
             elements.append(Paragraph("─" * 63, style))
-            vr_list = [entry for entry in transactions_data if entry["Type"].lower() in ["void", "refund"]]
-            for entry in sorted(vr_list, key=lambda x: (x["Store"], x["Date"], x["Time"])):
+            for entry in void_refund_rows(transactions_data, index):
                 text = (f"{entry['Store']:<6} {entry['Date']:<10} {entry['Time']:<8} {entry['Type']:<5} {entry['Receipt']:<9} {entry['Clerk'][:15]:<15} {entry['Total']:>8.2f}")
                 elements.append(Paragraph(text, style))
                 elements.append(Spacer(1, 12))
@@ -465,9 +495,13 @@ def create_toolbar(window, txt, title, transactions_data, store_summary, daily_b
             pdf_btn.config(state=tk.NORMAL)
     return enable_toolbar
 
+@profiling.profiled("Transactions")
 def run(window):
     """Run the Transactions report for selected stores and date range."""
     from __main__ import get_selected_start_date, get_selected_end_date, fetch_data, store_vars, config_accounts, handle_rate_limit, log_error, config_max_workers, _password_validated, RateLimitError, config_emails, config_smtp, SCRIPT_DIR
+    fetch_data = metrics.instrument(fetch_data, config_accounts, RateLimitError)
+    metrics.start_exporter(SCRIPT_DIR)
+    roll = rollup.open_rollup(SCRIPT_DIR)
 
     if not _password_validated:
         messagebox.showerror("Access Denied", "Password validation required.", parent=window)
@@ -509,12 +543,11 @@ def run(window):
     is_single_day = start == end
 
     # Create toolbar at the top with additional params
-    transactions_data = []
-    store_summary = defaultdict(lambda: {"total_sales": 0.0, "total_net": 0.0, "total_tax": 0.0, "total_units": 0, "total_txns": 0, 
-                                        "eatin": 0, "togo": 0, "delivery": 0, "avg_tx": 0.0, "void_count": 0, "void_total": 0.0, 
-                                        "refund_count": 0, "refund_total": 0.0})
+    transactions_data = entries.transaction_table()
+    store_summary = defaultdict(entries.empty_summary)
     daily_breakdown = defaultdict(list)
-    enable_toolbar = create_toolbar(window, txt, f"Transactions Report: {start_date_str} to {end_date_str}", transactions_data, store_summary, daily_breakdown, start_date_str, end_date_str, selected_stores)
+    index = {}  # "store"/"type": sorted transaction rows, "day": (date, sid) -> daily row; filled by the worker
+    enable_toolbar = create_toolbar(window, txt, f"Transactions Report: {start_date_str} to {end_date_str}", transactions_data, store_summary, daily_breakdown, index, start_date_str, end_date_str, selected_stores)
     log_error("Toolbar created", endpoint=ENDPOINT_NAME)
 
     # Now pack txt below toolbar
@@ -572,103 +605,92 @@ def run(window):
             # Header for summary views
             hdr_sum = f"{'Store':<6} {'TotSales':>10} {'TotNet':>8} {'TotTax':>8} {'TotUnits':>8} {'TotTxns':>8} {'EatIn':>5} {'ToGo':>5} {'Deliv':>5} {'AvgTx$':>8} {'Void#':>5} {'Void$':>8} {'Rfund#':>6} {'Rfund$':>8}"
 
-            # Fetch transaction data per store
-            futures = {}
-            with ThreadPoolExecutor(max_workers=min(config_max_workers, len(selected_stores))) as ex:
-                for sid, (aname, cid, ckey) in store_map.items():
-                    fut = ex.submit(fetch_data, ENDPOINT_NAME, sid, start_date_str, end_date_str, cid, ckey)
-                    futures[fut] = (sid, aname, cid, ckey)
-
-                for fut in as_completed(futures):
-                    sid, aname, cid, ckey = futures[fut]
-                    try:
-                        res = fut.result()
-                        log_error(f"API response for store {sid}: {json.dumps(res, indent=2)}", endpoint=ENDPOINT_NAME)
-                    except RateLimitError as ex:
-                        log_error(f"Rate limit for store {sid}: {ex}", endpoint=ENDPOINT_NAME)
-                        log(f"⚠️ Store {sid}: Rate limit hit; skipping.", "sep")
-                        continue
-                    except Exception as ex:
-                        log_error(f"Fetch failed for store {sid}: {ex}", sid, ENDPOINT_NAME)
-                        log(f"❌ Store {sid}: Exception: {ex}", "sep")
-                        continue
-
-                    err = res.get("error")
-                    if err:
-                        log_error(f"API error for store {sid}: {err}", sid, ENDPOINT_NAME)
-                        log(f"❌ Store {sid}: {err}", "sep")
-                        continue
+            # Fetch transactions one window of days at a time per store. Each window's rows also give its
+            # per-day store summaries, so there are no per-day calls; payloads are dropped once their rows
+            # are in the table. Every transaction is listed, so every store is fetched; only the per-day
+            # summaries go to the rollup.
+            index["day"] = {}
+            spans = windows.day_windows(start, end)
+            for span in spans:
+                w_start, w_end = span[0], span[-1]
+                day_tables = defaultdict(entries.transaction_table)
+                responded = []
+                futures = {}
+                with ThreadPoolExecutor(max_workers=min(config_max_workers, len(selected_stores))) as ex:
+                    for sid, (aname, cid, ckey) in store_map.items():
+                        fut = ex.submit(fetch_data, ENDPOINT_NAME, sid, w_start, w_end, cid, ckey)
+                        futures[fut] = (sid, aname, cid, ckey)
 
-                    data = res.get("data", []) or []
-                    if isinstance(data, dict):
-                        data = [data]
-                    for txn in data:
-                        date_key = next((k for k in txn if "date" in k.lower()), None)
-                        raw_date = txn.get(date_key, start_date_str)
-                        date = raw_date.split("T")[0] if "T" in str(raw_date) else str(raw_date)
+                    for fut in as_completed(futures):
+                        sid, aname, cid, ckey = futures[fut]
                         try:
-                            parsed_date = datetime.strptime(date, "%Y-%m-%d").date()
-                            date = parsed_date.strftime("%Y-%m-%d")
-                        except ValueError:
-                            log_error(f"Invalid date format for store {sid}: {raw_date}", endpoint=ENDPOINT_NAME)
+                            res = fut.result()
+                            log_error(f"API response for store {sid} ({w_start} to {w_end}): {json.dumps(res, indent=2)}", endpoint=ENDPOINT_NAME)
+                        except RateLimitError as ex:
+                            log_error(f"Rate limit for store {sid} ({w_start} to {w_end}): {ex}", endpoint=ENDPOINT_NAME)
+                            log(f"⚠️ Store {sid} ({w_start} to {w_end}): Rate limit hit; skipping.", "sep")
+                            continue
+                        except Exception as ex:
+                            log_error(f"Fetch failed for store {sid} ({w_start} to {w_end}): {ex}", sid, ENDPOINT_NAME)
+                            log(f"❌ Store {sid} ({w_start} to {w_end}): Exception: {ex}", "sep")
                             continue
-                        time_str = txn.get("time", "").split("T")[1].split(".")[0] if "T" in str(txn.get("time", "")) else txn.get("time", "")
-                        txn_type = txn.get("type", "Unknown")
-                        receipt = txn.get("receiptNumber", "N/A")
-                        clerk = txn.get("clerkName", "Unknown")
-                        channel = txn.get("channel", "")
-                        sale_type = txn.get("saleType", "")
-                        units = int(txn.get("units", 0))
-                        order_source = txn.get("orderSource", "")
-                        delivery_provider = txn.get("deliveryProvider", "")
-                        delivery_partner = txn.get("deliveryPartner", "")
-                        total = float(txn.get("total", 0.0))
-                        net_total = float(txn.get("netTotal", 0.0))
-                        tax = float(txn.get("tax", 0.0))
-                        entry = {
-                            "Store": sid,
-                            "Date": date,
-                            "Time": time_str,
-                            "Type": txn_type,
-                            "Receipt": receipt,
-                            "Clerk": clerk,
-                            "Channel": channel,
-                            "Sale Type": sale_type,
-                            "Units": units,
-                            "Order Source": order_source,
-                            "Delivery Provider": delivery_provider,
-                            "Delivery Partner": delivery_partner,
-                            "Total": total,
-                            "Net Total": net_total,
-                            "Tax": tax
-                        }
-                        transactions_data.append(entry)
-                        ss = store_summary[sid]
-                        ss["total_sales"] += total
-                        ss["total_net"] += net_total
-                        ss["total_tax"] += tax
-                        ss["total_units"] += units
-                        ss["total_txns"] += 1
-                        lower_sale_type = sale_type.lower()
-                        if lower_sale_type == "eatin":
-                            ss["eatin"] += 1
-                        elif lower_sale_type == "togo":
-                            ss["togo"] += 1
-                        elif lower_sale_type == "delivery":
-                            ss["delivery"] += 1
-                        lower_type = txn_type.lower()
-                        if lower_type == "void":
-                            ss["void_count"] += 1
-                            ss["void_total"] += total
-                        elif lower_type == "refund":
-                            ss["refund_count"] += 1
-                            ss["refund_total"] += total
-
-            # Update avg_tx in store_summary
-            for sid in store_summary:
-                ss = store_summary[sid]
-                if ss["total_txns"] > 0:
-                    ss["avg_tx"] = ss["total_sales"] / ss["total_txns"]
+
+                        err = res.get("error")
+                        if err:
+                            log_error(f"API error for store {sid} ({w_start} to {w_end}): {err}", sid, ENDPOINT_NAME)
+                            log(f"❌ Store {sid} ({w_start} to {w_end}): {err}", "sep")
+                            continue
+
+                        data = res.get("data", []) or []
+                        if isinstance(data, dict):
+                            data = [data]
+                        responded.append(sid)
+                        day = schemas.day_reader(data)
+                        for txn in data:
+                            try:
+                                date = day(txn, w_start)
+                            except ValueError as e:
+                                log_error(f"Invalid date format for store {sid}: {e}", endpoint=ENDPOINT_NAME)
+                                continue
+                            entry = entries.transaction_entry(txn, sid, date)
+                            transactions_data.append(entry)
+                            day_tables[date].append(entry)
+
+                # Per-store totals for each day as group-bys; stores that answered with no rows get zeros
+                rolled_up = []
+                for d in span:
+                    day_summary = entries.summarize_transactions(day_tables[d])
+                    for sid in responded:
+                        entry = {"Store": sid, **day_summary.get(sid, entries.empty_summary())}
+                        daily_breakdown[d].append(entry)
+                        index["day"][(d, sid)] = entry
+                        rolled_up.append((sid, d, entry))
+                if roll:
+                    roll.put("transactions", rolled_up)
+                futures.clear()
+                day_tables.clear()
+                if len(spans) > 1:
+                    log(f"{w_start} → {w_end}: {len(responded)} store(s) fetched", "sep")
+
+            # Store summaries as group-bys over the whole table
+            store_summary.update(entries.summarize_transactions(transactions_data))
+
+            # Bucket rows per store (sorted by date/time) and by type once
+            index.update(index_transactions(transactions_data))
+
+            # Period-over-period totals: comparison days come from the rollup, only days it lacks are fetched
+            periods = compare.selected()
+            if periods:
+                def fetch_run(sid, cid, ckey, first, last):
+                    res = fetch_data(ENDPOINT_NAME, sid, first, last, cid, ckey)
+                    if res.get("error"):
+                        raise compare.FetchError(res["error"])
+                    data = res.get("data", []) or []
+                    return entries.day_summaries(sid, [data] if isinstance(data, dict) else data, first)
+
+                totals, failed = compare.collect(roll, "transactions", store_map, periods, start, end, fetch_run, ("total_sales", "total_txns"), max_workers=config_max_workers)
+                for sid, err in failed.items():
+                    log_error(f"Comparison fetch failed for store {sid}: {err}", sid, ENDPOINT_NAME)
 
             # Log individual transactions per store
             for sid in selected_stores:
@@ -677,14 +699,12 @@ def run(window):
                 log("─" * 120, "sep")
                 log(hdr_txn, "heading")
                 log("─" * 120, "sep")
-                has_txn = False
-                for entry in sorted(transactions_data, key=lambda x: (x["Date"], x["Time"])):
-                    if entry["Store"] == sid:
-                        has_txn = True
-                        log(f"{entry['Store']:<6} {entry['Date']:<10} {entry['Time']:<8} {entry['Type']:<5} {entry['Receipt']:<10} {entry['Clerk'][:20]:<20} "
-                            f"{entry['Channel'][:20]:<20} {entry['Sale Type'][:10]:<10} {entry['Units']:>5} {entry['Order Source'][:20]:<20} "
-                            f"{entry['Delivery Provider'][:15]:<15} {entry['Delivery Partner'][:15]:<15} ${entry['Total']:>9.2f} ${entry['Net Total']:>9.2f} ${entry['Tax']:>8.2f}")
-                if not has_txn:
+                rows = index["store"].get(sid, [])
+                for entry in transactions_data.rows(rows):
+                    log(f"{entry['Store']:<6} {entry['Date']:<10} {entry['Time']:<8} {entry['Type']:<5} {entry['Receipt']:<10} {entry['Clerk'][:20]:<20} "
+                        f"{entry['Channel'][:20]:<20} {entry['Sale Type'][:10]:<10} {entry['Units']:>5} {entry['Order Source'][:20]:<20} "
+                        f"{entry['Delivery Provider'][:15]:<15} {entry['Delivery Partner'][:15]:<15} ${entry['Total']:>9.2f} ${entry['Net Total']:>9.2f} ${entry['Tax']:>8.2f}")
+                if not rows:
                     log("No transactions for this store.")
                 log("─" * 120, "sep")
 
@@ -703,118 +723,28 @@ def run(window):
                     f"{ss['refund_count']:>6} {ss['refund_total']:>8.2f}")
             log("─" * 75, "sep")
 
-            # Fetch daily breakdown per store
-            days = [start + timedelta(days=x) for x in range((end - start).days + 1)]
-            for day in days:
-                dstr = day.strftime("%Y-%m-%d")
-                futures = {}
-                with ThreadPoolExecutor(max_workers=min(config_max_workers, len(selected_stores))) as ex:
-                    for sid, (aname, cid, ckey) in store_map.items():
-                        fut = ex.submit(fetch_data, ENDPOINT_NAME, sid, dstr, dstr, cid, ckey)
-                        futures[fut] = (sid, cid, ckey)
+            if periods:
+                for sid in failed:
+                    log(f"⚠️ Store {sid}: comparison data incomplete ({failed[sid]}).", "sep")
+                for line, tag in compare.report_lines(selected_stores, store_summary, totals, (("total_sales", "TotSales", True), ("total_txns", "TotTxns", False))):
+                    log(line, tag)
 
-                    for fut in as_completed(futures):
-                        sid, cid, ckey = futures[fut]
-                        try:
-                            res = fut.result()
-                            log_error(f"API response for store {sid} on {dstr}: {json.dumps(res, indent=2)}", endpoint=ENDPOINT_NAME)
-                        except RateLimitError as ex:
-                            log_error(f"Rate limit for store {sid} on {dstr}: {ex}", endpoint=ENDPOINT_NAME)
-                            log(f"⚠️ Store {sid} on {dstr}: Rate limit hit; skipping.", "sep")
-                            continue
-                        except Exception as ex:
-                            log_error(f"Fetch failed for store {sid} on {dstr}: {ex}", sid, ENDPOINT_NAME)
-                            log(f"❌ Store {sid} on {dstr}: Exception: {ex}", "sep")
-                            continue
-
-                        err = res.get("error")
-                        if err:
-                            log_error(f"API error for store {sid} on {dstr}: {err}", sid, ENDPOINT_NAME)
-                            log(f"❌ Store {sid} on {dstr}: {err}", "sep")
-                            continue
-
-                        data = res.get("data", []) or []
-                        if isinstance(data, dict):
-                            data = [data]
-                        total_sales = 0.0
-                        total_net = 0.0
-                        total_tax = 0.0
-                        total_units = 0
-                        total_txns = 0
-                        eatin = 0
-                        togo = 0
-                        delivery = 0
-                        void_count = 0
-                        void_total = 0.0
-                        refund_count = 0
-                        refund_total = 0.0
-                        for txn in data:
-                            date_key = next((k for k in txn if "date" in k.lower()), None)
-                            raw_date = txn.get(date_key, dstr)
-                            date = raw_date.split("T")[0] if "T" in str(raw_date) else str(raw_date)
-                            try:
-                                parsed_date = datetime.strptime(date, "%Y-%m-%d").date()
-                                date = parsed_date.strftime("%Y-%m-%d")
-                            except ValueError:
-                                log_error(f"Invalid date format for store {sid} on {dstr}: {raw_date}", endpoint=ENDPOINT_NAME)
-                                continue
-                            total = float(txn.get("total", 0.0))
-                            net_total = float(txn.get("netTotal", 0.0))
-                            tax = float(txn.get("tax", 0.0))
-                            units = int(txn.get("units", 0))
-                            txn_type = txn.get("type", "Unknown").lower()
-                            sale_type = txn.get("saleType", "").lower()
-                            total_sales += total
-                            total_net += net_total
-                            total_tax += tax
-                            total_units += units
-                            total_txns += 1
-                            if sale_type == "eatin":
-                                eatin += 1
-                            elif sale_type == "togo":
-                                togo += 1
-                            elif sale_type == "delivery":
-                                delivery += 1
-                            if txn_type == "void":
-                                void_count += 1
-                                void_total += total
-                            elif txn_type == "refund":
-                                refund_count += 1
-                                refund_total += total
-                        avg_tx = total_sales / total_txns if total_txns > 0 else 0.0
-                        daily_breakdown[dstr].append({
-                            "Store": sid,
-                            "total_sales": total_sales,
-                            "total_net": total_net,
-                            "total_tax": total_tax,
-                            "total_units": total_units,
-                            "total_txns": total_txns,
-                            "eatin": eatin,
-                            "togo": togo,
-                            "delivery": delivery,
-                            "avg_tx": avg_tx,
-                            "void_count": void_count,
-                            "void_total": void_total,
-                            "refund_count": refund_count,
-                            "refund_total": refund_total
-                        })
-
-                # Log per-day summaries only for multi-day
-                if not is_single_day:
+            # Log per-day summaries only for multi-day
+            dates = sorted(daily_breakdown)
+            if not is_single_day:
+                for dstr in dates:
                     log("", None)
                     log(f"Per-Day Transaction Summary ({dstr})", "title")
                     log("─" * 75, "sep")
                     log(hdr_sum, "heading")
                     log("─" * 75, "sep")
                     for sid in selected_stores:
-                        found = False
-                        for entry in daily_breakdown[dstr]:
-                            if entry["Store"] == sid:
-                                found = True
-                                log(f"{entry['Store']:<6} {entry['total_sales']:>10.2f} {entry['total_net']:>8.2f} {entry['total_tax']:>8.2f} {entry['total_units']:>8} {entry['total_txns']:>8} "
-                                    f"{entry['eatin']:>5} {entry['togo']:>5} {entry['delivery']:>5} {entry['avg_tx']:>8.2f} {entry['void_count']:>5} {entry['void_total']:>8.2f} "
-                                    f"{entry['refund_count']:>6} {entry['refund_total']:>8.2f}")
-                        if not found:
+                        entry = index["day"].get((dstr, sid))
+                        if entry:
+                            log(f"{entry['Store']:<6} {entry['total_sales']:>10.2f} {entry['total_net']:>8.2f} {entry['total_tax']:>8.2f} {entry['total_units']:>8} {entry['total_txns']:>8} "
+                                f"{entry['eatin']:>5} {entry['togo']:>5} {entry['delivery']:>5} {entry['avg_tx']:>8.2f} {entry['void_count']:>5} {entry['void_total']:>8.2f} "
+                                f"{entry['refund_count']:>6} {entry['refund_total']:>8.2f}")
+                        else:
                             log(f"{sid:<6} {0.0:>10.2f} {0.0:>8.2f} {0.0:>8.2f} {0:>8} {0:>8} {0:>5} {0:>5} {0:>5} {0.0:>8.2f} {0:>5} {0.0:>8.2f} {0:>6} {0.0:>8.2f}")
                     log("─" * 75, "sep")
 
@@ -826,15 +756,12 @@ def run(window):
                     log("─" * 75, "sep")
                     log(f"{'Date':<10} {'TotSales':>10} {'TotNet':>8} {'TotTax':>8} {'TotUnits':>8} {'TotTxns':>8} {'EatIn':>5} {'ToGo':>5} {'Deliv':>5} {'AvgTx$':>8} {'Void#':>5} {'Void$':>8} {'Rfund#':>6} {'Rfund$':>8}", "heading")
                     log("─" * 75, "sep")
-                    has_data = False
-                    for date in sorted(daily_breakdown):
-                        for entry in daily_breakdown[date]:
-                            if entry["Store"] == sid:
-                                has_data = True
-                                log(f"{date:<10} {entry['total_sales']:>10.2f} {entry['total_net']:>8.2f} {entry['total_tax']:>8.2f} {entry['total_units']:>8} {entry['total_txns']:>8} "
-                                    f"{entry['eatin']:>5} {entry['togo']:>5} {entry['delivery']:>5} {entry['avg_tx']:>8.2f} {entry['void_count']:>5} {entry['void_total']:>8.2f} "
-                                    f"{entry['refund_count']:>6} {entry['refund_total']:>8.2f}")
-                    if not has_data:
+                    rows = store_day_rows(index, sid, dates)
+                    for date, entry in rows:
+                        log(f"{date:<10} {entry['total_sales']:>10.2f} {entry['total_net']:>8.2f} {entry['total_tax']:>8.2f} {entry['total_units']:>8} {entry['total_txns']:>8} "
+                            f"{entry['eatin']:>5} {entry['togo']:>5} {entry['delivery']:>5} {entry['avg_tx']:>8.2f} {entry['void_count']:>5} {entry['void_total']:>8.2f} "
+                            f"{entry['refund_count']:>6} {entry['refund_total']:>8.2f}")
+                    if not rows:
                         log(f"No data for this store.")
                     log("─" * 75, "sep")
 
@@ -855,9 +782,9 @@ def run(window):
             log("─" * 63, "sep")
             log(f"{'Store':<6} {'Date':<10} {'Time':<8} {'Type':<5} {'Receipt #':<9} {'Clerk':<15} {'Amount $':>8}", "heading")
             log("─" * 63, "sep")
-            vr_list = [entry for entry in transactions_data if entry["Type"].lower() in ["void", "refund"]]
+            vr_list = void_refund_rows(transactions_data, index)
             if vr_list:
-                for entry in sorted(vr_list, key=lambda x: (x["Store"], x["Date"], x["Time"])):
+                for entry in vr_list:
                     log(f"{entry['Store']:<6} {entry['Date']:<10} {entry['Time']:<8} {entry['Type']:<5} {entry['Receipt']:<9} {entry['Clerk'][:15]:<15} {entry['Total']:>8.2f}")
             else:
                 log("No voided or refunded transactions.")
@@ -873,7 +800,7 @@ def run(window):
             log(f"❌ Report error: {ex}", "sep")
             window.after(0, enable_toolbar)
 
-    threading.Thread(target=worker, daemon=True).start()
+    threading.Thread(target=metrics.timed(profiling.profiled("Transactions", "worker")(worker), "Transactions"), daemon=True).start()
 
 if __name__ == "__main__":
     config_emails = []
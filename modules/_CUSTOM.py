@@ -4,6 +4,7 @@ from tkinter.scrolledtext import ScrolledText
 import json
 import csv
 import os
+import sys
 from datetime import datetime
 from concurrent.futures import ThreadPoolExecutor, as_completed
 try:
@@ -19,6 +20,11 @@ from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.application import MIMEApplication
 
+MODULES_DIR = os.path.dirname(os.path.abspath(__file__))
+if MODULES_DIR not in sys.path:
+    sys.path.insert(0, MODULES_DIR)
+from liveiq import metrics, profiling
+
 # Custom exception defined in SubwayIQ.py
 class NoInternetError(Exception):
     pass
@@ -26,6 +32,7 @@ class NoInternetError(Exception):
 # Define the API endpoint globally (modify as needed)
 ENDPOINT = "Daily Timeclock"  # Example endpoint; change to any key in ENDPOINTS (e.g., "Sales Summary", "Transaction Details")
 
+@profiling.profiled("_CUSTOM")
 def run(window):
     """Main entry point for the Custom module. Fetches and displays data from the LiveIQ API.
 
@@ -38,6 +45,8 @@ def run(window):
     """
     # Import required globals from SubwayIQ.py
     from __main__ import get_selected_start_date, get_selected_end_date, fetch_data, store_vars, config_accounts, handle_rate_limit, log_error, _password_validated, RateLimitError, config_emails, config_smtp, SCRIPT_DIR
+    fetch_data = metrics.instrument(fetch_data, config_accounts, RateLimitError)
+    metrics.start_exporter(SCRIPT_DIR)
 
     if not _password_validated:
         messagebox.showerror("Access Denied", "Password validation required.", parent=window)
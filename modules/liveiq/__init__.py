@@ -0,0 +1,6 @@
+"""Shared, GUI-free helpers for the SubwayIQ report modules.
+
+This folder is not a report module: SubwayIQ only turns the ``.py`` files that
+sit directly in ``modules/`` into buttons. Report modules put ``modules/`` on
+``sys.path`` and import what they need, e.g. ``from liveiq import metrics``.
+"""
@@ -0,0 +1,137 @@
+"""Resumable historical backfill of the rollup and its checkpoints.
+
+A backfill walks every store-day of a range for a set of sources and writes
+what each report would have written after fetching it: rollup rows for Sales,
+Transactions, 3rd-Party and Labor, and partial checkpoints for Transactions,
+Items-Sold and Discounts. Historical reports then read those store-days
+locally instead of calling LiveIQ.
+
+The rollup is the checkpoint. plan() asks it which store-days are still
+missing and turns only those into tasks. Each task stores its rows as soon
+as its fetch returns, so a backfill that is stopped, rate-limited or
+interrupted resumes by planning again. Sources that read the same endpoint
+in runs of the same length (Items-Sold and Discounts both use one
+Transaction Details call per store-day) share their fetches.
+
+Tasks run newest first through the caller's fetch, normally a
+liveiq.pacing stream, so an overnight run stays within the rate budget.
+gaps() reports the store-days that are still missing afterwards.
+"""
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from . import compare
+
+
+class Source:
+    """One backfilled dataset.
+
+    endpoint and run_days say how it is fetched (runs of consecutive days,
+    one store per call); covered(roll, stores, days) returns the (store, day)
+    pairs already on file; store(roll, sid, days, data) writes one run's
+    rows from the response data.
+    """
+
+    def __init__(self, name, endpoint, run_days, covered, store):
+        self.name = name
+        self.endpoint = endpoint
+        self.run_days = run_days
+        self.covered = covered
+        self.store = store
+
+
+def in_rollup(table):
+    """covered() for sources kept in a rollup table."""
+    return lambda roll, stores, days: set(roll.get(table, stores, days))
+
+
+def in_partials(source):
+    """covered() for sources kept as partial checkpoints."""
+    return lambda roll, stores, days: set(roll.get_partials(source, stores, days))
+
+
+class Task:
+    """One fetch: a store and a run of consecutive days for the sources sharing an endpoint."""
+
+    __slots__ = ("sources", "sid", "days")
+
+    def __init__(self, sources, sid, days):
+        self.sources = sources
+        self.sid = sid
+        self.days = days
+
+    @property
+    def endpoint(self):
+        return self.sources[0].endpoint
+
+    def __repr__(self):
+        return f"{self.endpoint} {self.sid} {self.days[0]}..{self.days[-1]}"
+
+
+def plan(roll, sources, stores, days):
+    """Tasks for the store-days not on file for some source, most recent runs first."""
+    groups = defaultdict(list)
+    for source in sources:
+        groups[(source.endpoint, source.run_days)].append(source)
+    tasks = []
+    for (endpoint, run_days), group in groups.items():
+        have = [source.covered(roll, stores, days) for source in group]
+        for sid in stores:
+            todo = [d for d in days if any((sid, d) not in got for got in have)]
+            tasks.extend(Task(group, sid, run) for run in compare.runs(todo, run_days))
+    tasks.sort(key=lambda task: task.days[-1], reverse=True)
+    return tasks
+
+
+def run(roll, tasks, fetch, store_map, stop=None, on_done=None, max_workers=4):
+    """Fetch and store tasks until they are done or stop (a threading.Event) is set.
+
+    fetch is fetch_data-compatible and may raise; store_map maps a store to
+    (account name, cid, ckey). on_done(task, error) is called per finished
+    task, with error None on success. Returns (done, failed) counts.
+    """
+    def one(task):
+        if stop is not None and stop.is_set():
+            return None
+        name, cid, ckey = store_map[task.sid]
+        res = fetch(task.endpoint, task.sid, task.days[0], task.days[-1], cid, ckey)
+        if res.get("error"):
+            raise compare.FetchError(res["error"])
+        data = res.get("data") or []
+        if isinstance(data, dict):
+            data = [data]
+        for source in task.sources:
+            source.store(roll, task.sid, task.days, data)
+        return task
+
+    done = failed = 0
+    with ThreadPoolExecutor(max_workers=max_workers) as ex:
+        futures = {ex.submit(one, task): task for task in tasks}
+        for fut in as_completed(futures):
+            task = futures[fut]
+            try:
+                if fut.result() is None:
+                    continue
+            except Exception as ex:
+                failed += 1
+                if on_done:
+                    on_done(task, ex)
+                continue
+            done += 1
+            if on_done:
+                on_done(task, None)
+    return done, failed
+
+
+def gaps(roll, sources, stores, days):
+    """{source name: {store: [(first, last), ...]}} for the store-days still missing."""
+    out = {}
+    for source in sources:
+        have = source.covered(roll, stores, days)
+        missing = {}
+        for sid in stores:
+            todo = [d for d in days if (sid, d) not in have]
+            if todo:
+                missing[sid] = [(r[0], r[-1]) for r in compare.runs(todo, len(todo))]
+        out[source.name] = missing
+    return out
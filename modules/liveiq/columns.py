@@ -0,0 +1,121 @@
+"""Array-backed column tables for report rows.
+
+A Table stores each column separately instead of one dict per row:
+
+    "f"    float   array('d')
+    "i"    int     array('q')
+    "cat"  str     dictionary-encoded: an int code per row plus the distinct values
+    "str"  str     plain list (free text such as receipt numbers or times)
+
+Group-bys walk whole columns at once and key on the categorical codes, so the
+per-row work is one index into a list of accumulators. Rows are materialised
+as dicts only when a caller asks for them (rendering and exports).
+"""
+from array import array
+
+
+class Categorical:
+    """Dictionary-encoded string column."""
+
+    __slots__ = ("codes", "values", "_lookup")
+
+    def __init__(self):
+        self.codes = array("l")
+        self.values = []
+        self._lookup = {}
+
+    def encode(self, value):
+        """Return value's code, adding it to the dictionary if it is new."""
+        code = self._lookup.get(value)
+        if code is None:
+            code = self._lookup[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def append(self, value):
+        self.codes.append(self.encode(value))
+
+    def code(self, value):
+        """Return value's code, or None if no row has it."""
+        return self._lookup.get(value)
+
+    def __getitem__(self, i):
+        return self.values[self.codes[i]]
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __iter__(self):
+        values = self.values
+        return (values[c] for c in self.codes)
+
+
+def _column(kind):
+    if kind == "f":
+        return array("d")
+    if kind == "i":
+        return array("q")
+    if kind == "cat":
+        return Categorical()
+    if kind == "str":
+        return []
+    raise ValueError(f"unknown column kind: {kind!r}")
+
+
+class Table:
+    """Columnar table with a fixed schema of (name, kind) pairs."""
+
+    def __init__(self, schema):
+        self.schema = list(schema)
+        self.names = [name for name, _ in self.schema]
+        self.columns = {name: _column(kind) for name, kind in self.schema}
+        self._appenders = [self.columns[name].append for name in self.names]
+
+    def __len__(self):
+        return len(self.columns[self.names[0]]) if self.names else 0
+
+    def append(self, row):
+        """Append one row given as a dict keyed by column name."""
+        for name, add in zip(self.names, self._appenders):
+            add(row[name])
+
+    def row(self, i):
+        """Return row i as a dict."""
+        return {name: self.columns[name][i] for name in self.names}
+
+    def rows(self, indices=None):
+        """Yield rows as dicts, for all rows or the given row indices."""
+        for i in range(len(self)) if indices is None else indices:
+            yield self.row(i)
+
+    def __iter__(self):
+        return self.rows()
+
+    def to_dicts(self):
+        return list(self.rows())
+
+    def _keys(self, key, by):
+        """Return (combined code per row, decoder) for grouping on key and optional by."""
+        k = self.columns[key]
+        if by is None:
+            return k.codes, lambda code: k.values[code]
+        b = self.columns[by]
+        width = len(b.values) or 1
+        codes = [kc * width + bc for kc, bc in zip(k.codes, b.codes)]
+        return codes, lambda code: (k.values[code // width], b.values[code % width])
+
+    def counts(self, key, by=None):
+        """Row counts per key value, or per (key value, by value) pair."""
+        codes, decode = self._keys(key, by)
+        acc = {}
+        for code in codes:
+            acc[code] = acc.get(code, 0) + 1
+        return {decode(code): n for code, n in acc.items()}
+
+    def sums(self, key, column, by=None):
+        """Sum of a numeric column per key value, or per (key value, by value) pair."""
+        codes, decode = self._keys(key, by)
+        acc = {}
+        for code, value in zip(codes, self.columns[column]):
+            acc[code] = acc.get(code, 0) + value
+        return {decode(code): total for code, total in acc.items()}
@@ -0,0 +1,149 @@
+"""Period-over-period comparisons, served from the rollup.
+
+Comparisons are off unless this environment variable is set:
+
+    SUBWAYIQ_COMPARE  comma list of wow, mom, yoy (or all) to add comparison
+                      tables to Sales, Transactions and 3rd-Party
+
+    wow  the same dates one week earlier
+    mom  as many days, starting one month earlier (a start day past a
+         shorter month's end falls on its last day)
+    yoy  364 days earlier, so the weekdays line up with the report's
+
+A comparison range always has as many days as the report range, so totals
+compare like with like.
+
+A comparison figure is a store's total over the shifted range, summed from
+per-store-day rows. collect() reads those rows from the rollup and fetches
+only the store-days it has never seen, in runs of consecutive days, through
+the report's own fetch_run callback. Fetched days are written back, so with
+SUBWAYIQ_ROLLUP_DB set a comparison costs no calls the second time. The
+callbacks fetch in SUBWAYIQ_WINDOW_DAYS runs, so comparison ranges are not
+bound by a report's MAX_DAYS.
+"""
+import os
+from calendar import monthrange
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, timedelta
+
+from . import rollup, windows
+
+PERIODS = {"wow": "WoW", "mom": "MoM", "yoy": "YoY"}
+
+
+class FetchError(Exception):
+    """A fetch_run callback's API error for one run of store-days."""
+
+
+def selected():
+    """Comparison periods named in SUBWAYIQ_COMPARE, in PERIODS order."""
+    names = {name.strip().lower() for name in os.environ.get("SUBWAYIQ_COMPARE", "").split(",")}
+    return [p for p in PERIODS if p in names or "all" in names]
+
+
+def shift(day, period):
+    """The date period-ago for day."""
+    if period == "wow":
+        return day - timedelta(days=7)
+    if period == "yoy":
+        return day - timedelta(days=364)
+    year, month = (day.year, day.month - 1) if day.month > 1 else (day.year - 1, 12)
+    return day.replace(year=year, month=month, day=min(day.day, monthrange(year, month)[1]))
+
+
+def period_days(start, end, period):
+    """ISO days of the comparison range for start..end (dates, inclusive): as many days, from shift(start)."""
+    first = shift(start, period)
+    return [(first + timedelta(days=x)).isoformat() for x in range((end - start).days + 1)]
+
+
+def runs(days, size):
+    """Split sorted ISO days into runs of consecutive days, each at most size long."""
+    out = []
+    for day in days:
+        if out and len(out[-1]) < size and out[-1][-1] == _previous(day):
+            out[-1].append(day)
+        else:
+            out.append([day])
+    return out
+
+
+def _previous(day):
+    return (date.fromisoformat(day) - timedelta(days=1)).isoformat()
+
+
+def collect(roll, source, store_map, periods, start, end, fetch_run, keys, run_days=None, max_workers=4):
+    """Per-store totals over keys for each comparison period, plus the stores that failed.
+
+    Returns ({period: {sid: totals or None}}, {sid: error}); a store's total is
+    None when any of its days could not be fetched. fetch_run(sid, cid, ckey,
+    first, last) returns {day: row} with the rollup row keys of source for
+    one run of days and may raise; days it leaves out are zero (the store
+    answered but had nothing). run_days caps a run (default
+    SUBWAYIQ_WINDOW_DAYS; 1 for endpoints that total a range).
+    """
+    spans = {p: period_days(start, end, p) for p in periods}
+    wanted = sorted(set().union(*spans.values())) if spans else []
+    rows = roll.get(source, store_map, wanted) if roll and wanted else {}
+    zero = {key: 0 for _, key, _ in rollup.SOURCES[source]}
+    size = run_days or windows.window_days()
+    errors, missing = {}, set()
+    futures = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as ex:
+        for sid, (name, cid, ckey) in store_map.items():
+            for run in runs([d for d in wanted if (sid, d) not in rows], size):
+                futures[ex.submit(fetch_run, sid, cid, ckey, run[0], run[-1])] = (sid, run)
+        for fut in as_completed(futures):
+            sid, run = futures[fut]
+            try:
+                got = fut.result()
+            except Exception as ex:
+                errors[sid] = str(ex)
+                missing.update((sid, d) for d in run)
+                continue
+            fresh = [(sid, d, got.get(d) or zero) for d in run]
+            rows.update(((sid, d), row) for sid, d, row in fresh)
+            if roll:
+                roll.put(source, fresh)
+    totals = {}
+    for p, days in spans.items():
+        totals[p] = {sid: None if any((sid, d) in missing for d in days) else rollup.total((rows[(sid, d)] for d in days), keys)
+                     for sid in store_map}
+    return totals, errors
+
+
+def change(current, previous):
+    """Percent change as text ('n/a' without a base)."""
+    if current is None or not previous:
+        return "n/a"
+    return f"{(current - previous) / previous * 100:+.1f}%"
+
+
+def table_lines(stores, current, totals, key, title, money=True):
+    """Header and per-store lines for one comparison table of key: the report's figure, then each period's and its change."""
+    periods = list(totals)
+    fmt = (lambda v: f"{v:>10.2f}") if money else (lambda v: f"{v:>10}")
+    header = f"{'Store':<6} {title:>10}" + "".join(f" {PERIODS[p]:>10} {'Chg':>8}" for p in periods)
+    lines = []
+    for sid in stores:
+        row = current.get(sid)
+        value = row[key] if row else None
+        cells = [f"{sid:<6}", fmt(value) if value is not None else f"{'-':>10}"]
+        for p in periods:
+            prior = totals[p].get(sid)
+            prior = prior[key] if prior else None
+            cells.append(fmt(prior) if prior is not None else f"{'n/a':>10}")
+            cells.append(f"{change(value, prior):>8}")
+        lines.append(" ".join(cells))
+    return header, lines
+
+
+def report_lines(stores, current, totals, tables):
+    """(line, tag) pairs for a report's comparison section: one table per (key, title, money) in tables."""
+    out = []
+    for key, title, money in tables:
+        header, lines = table_lines(stores, current, totals, key, title, money)
+        out += [("", None), (f"Period Comparison: {title}", "title"), (header, "heading"), ("─" * len(header), "sep")]
+        out += [(line, None) for line in lines]
+        out.append(("─" * len(header), "sep"))
+    return out
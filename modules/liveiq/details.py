@@ -0,0 +1,73 @@
+"""Streaming traversal of Transaction Details payloads.
+
+Line items nest modifiers, addons and extras to any depth. walk() yields
+them lazily from a stack of iterators, one per open level. A consumer
+never holds more than the transaction it is on. It does not copy the day's
+items into a flattened list.
+
+item_rows and discount_rows reduce one store-day to compact rows. They only
+need the parsed payload, so liveiq.parallel can run them in worker processes.
+"""
+from itertools import chain
+
+
+def walk(transactions):
+    """Yield (transaction, item, depth) for every item and nested modifier/addon/extra, depth first."""
+    for txn in transactions or []:
+        stack = [iter(txn.get("items") or ())]
+        while stack:
+            for item in stack[-1]:
+                yield txn, item, len(stack) - 1
+                mods, addons, extras = item.get("modifiers"), item.get("addons"), item.get("extras")
+                if mods or addons or extras:
+                    subs = [sub for sub in (mods, addons, extras) if sub and isinstance(sub, list)]
+                    if subs:
+                        stack.append(chain.from_iterable(subs))
+                        break
+            else:
+                stack.pop()
+
+
+def item_rows(transactions):
+    """[[description, plu, count, total], ...] for the sale lines of one store-day, in first-seen order.
+
+    The same figures Items-Sold's reduce_items folds into a catalog, without
+    the catalog, so it can run in a worker process.
+    """
+    tally = {}
+    for txn, item, depth in walk(transactions):
+        if item.get("type", "").lower() == "sale":
+            qty = item.get("quantity", 1)
+            key = (item.get("description", "Unknown"), item.get("plu", "N/A"))
+            row = tally.get(key)
+            if row is None:
+                row = tally[key] = [key[0], key[1], 0, 0.0]
+            row[2] += qty
+            row[3] += float(item.get("adjustedPrice", 0.0)) * qty
+    return list(tally.values())
+
+
+def discount_rows(transactions):
+    """Reduce one store-day Transaction Details payload to [code, desc, count, orig, adj, save] rows.
+
+    walk supplies the nested modifiers/addons/extras. The rows are plain
+    lists so they fold, and checkpoint as JSON, the same way.
+    """
+    tally = {}
+    for txn, it, depth in walk(transactions):
+        code = (it.get("discountCode") or "").strip()
+        if not code:
+            continue
+        desc = (it.get("discount") or it.get("description", "")).strip()
+        orig = float(it.get("originalPrice") or 0)
+        adj = float(it.get("adjustedPrice") or orig)
+        save = orig - adj
+        if save > 0:
+            row = tally.get((code, desc))
+            if row is None:
+                row = tally[(code, desc)] = [code, desc, 0, 0.0, 0.0, 0.0]
+            row[2] += 1
+            row[3] += orig
+            row[4] += adj
+            row[5] += save
+    return list(tally.values())
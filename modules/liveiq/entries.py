@@ -0,0 +1,189 @@
+"""Report rows built from decoded LiveIQ records.
+
+Sales, Transactions, 3rd-Party and Labor build their rows here rather than in
+the report modules, so the Backfill module writes exactly the rows a report
+run would without importing the reports themselves (and their tkinter and
+reportlab set-up) a second time.
+"""
+from collections import defaultdict
+from datetime import datetime
+
+from . import columns, schemas
+
+# Sales
+
+def sales_entry(sid, rec):
+    """Report row for one decoded Sales Summary / Daily Sales Summary record."""
+    return {"Store": sid, "Sales": rec.net_sales, "Tax": rec.tax, "Units": rec.units, "Txns": rec.transactions,
+            "Cash/Card": rec.cash_card, "3rd $": rec.third_party_sales, "3rd Txns": rec.third_party_transactions}
+
+
+def daily_entries(sid, data):
+    """{date: report row} for one store's Daily Sales Summary records; records without a readable date are skipped."""
+    data = [data] if isinstance(data, dict) else data or []
+    day = schemas.day_reader(data)
+    out = {}
+    for rec in data:
+        try:
+            date = day(rec)
+        except ValueError:
+            continue
+        out[date] = sales_entry(sid, schemas.DAILY_SALES_SUMMARY.decode(rec))
+    return out
+
+# Transactions
+
+# Summary rows are stored column-wise; categorical columns are dictionary-encoded.
+TRANSACTION_COLUMNS = [
+    ("Store", "cat"), ("Date", "cat"), ("Time", "str"), ("Type", "cat"), ("Receipt", "str"),
+    ("Clerk", "cat"), ("Channel", "cat"), ("Sale Type", "cat"), ("Units", "i"), ("Order Source", "cat"),
+    ("Delivery Provider", "cat"), ("Delivery Partner", "cat"), ("Total", "f"), ("Net Total", "f"), ("Tax", "f"),
+]
+SALE_TYPE_KEYS = {"eatin": "eatin", "togo": "togo", "delivery": "delivery"}
+
+
+def clock_time(value):
+    """HH:MM:SS from an ISO timestamp such as 2025-06-16T11:02:03.000; other values pass through."""
+    return value.split("T")[1].split(".")[0] if "T" in value else value
+
+
+# transaction_entry(txn, sid, date): the report row for one Transaction Summary record,
+# compiled once from the endpoint schema
+transaction_entry = schemas.TRANSACTION_SUMMARY.row_decoder([
+    ("Time", "time", clock_time),
+    ("Type", "type"),
+    ("Receipt", "receipt"),
+    ("Clerk", "clerk"),
+    ("Channel", "channel"),
+    ("Sale Type", "sale_type"),
+    ("Units", "units"),
+    ("Order Source", "order_source"),
+    ("Delivery Provider", "delivery_provider"),
+    ("Delivery Partner", "delivery_partner"),
+    ("Total", "total"),
+    ("Net Total", "net_total"),
+    ("Tax", "tax"),
+], leading=("Store", "Date"))
+
+
+def transaction_table():
+    """Return an empty columnar table for transaction_entry rows."""
+    return columns.Table(TRANSACTION_COLUMNS)
+
+
+def empty_summary():
+    """Zeroed per-store (or per-store-day) transaction summary."""
+    return {"total_sales": 0.0, "total_net": 0.0, "total_tax": 0.0, "total_units": 0, "total_txns": 0,
+            "eatin": 0, "togo": 0, "delivery": 0, "avg_tx": 0.0, "void_count": 0, "void_total": 0.0,
+            "refund_count": 0, "refund_total": 0.0}
+
+
+def summarize_transactions(table):
+    """Per-store summaries computed as column group-bys over a transaction table."""
+    sales = table.sums("Store", "Total")
+    net = table.sums("Store", "Net Total")
+    tax = table.sums("Store", "Tax")
+    units = table.sums("Store", "Units")
+    summary = {}
+    for sid, n in table.counts("Store").items():
+        ss = summary[sid] = empty_summary()
+        ss["total_sales"] = sales[sid]
+        ss["total_net"] = net[sid]
+        ss["total_tax"] = tax[sid]
+        ss["total_units"] = units[sid]
+        ss["total_txns"] = n
+        ss["avg_tx"] = sales[sid] / n
+    for (sid, sale_type), n in table.counts("Store", "Sale Type").items():
+        key = SALE_TYPE_KEYS.get(str(sale_type).lower())
+        if key:
+            summary[sid][key] += n
+    type_totals = table.sums("Store", "Total", "Type")
+    for (sid, txn_type), n in table.counts("Store", "Type").items():
+        kind = str(txn_type).lower()
+        if kind in ("void", "refund"):
+            summary[sid][f"{kind}_count"] += n
+            summary[sid][f"{kind}_total"] += type_totals[(sid, txn_type)]
+    return summary
+
+
+def day_summaries(sid, data, default_date):
+    """{date: summarize_transactions row} for one store's Transaction Summary records, per business day."""
+    tables = defaultdict(transaction_table)
+    day = schemas.day_reader(data)
+    for txn in data:
+        try:
+            date = day(txn, default_date)
+        except ValueError:
+            continue
+        tables[date].append(transaction_entry(txn, sid, date))
+    return {date: summarize_transactions(table)[sid] for date, table in tables.items()}
+
+# 3rd-Party
+
+PROVIDER_COLUMNS = (("doordash", "DD"), ("grubhub", "GH"), ("uber", "UE"), ("ezcater", "EC"))
+
+
+def tp_entry(sid, obj):
+    """Report row for one Third Party Sales Summary record: totals plus -T/-N/-S columns per provider."""
+    rec = schemas.THIRD_PARTY_SALES_SUMMARY.decode(obj)
+    entry = {"Store": sid, "TotSales": rec.total_sales, "TotNet": rec.total_net_sales, "TotTxns": rec.total_transactions}
+    providers = {p.provider.lower(): p for p in schemas.THIRD_PARTY_PROVIDER.decode_all(rec.providers)}
+    for name, col in PROVIDER_COLUMNS:
+        p = providers.get(name)
+        entry[f"{col}-T"] = p.transactions if p else 0
+        entry[f"{col}-N"] = p.net_sales if p else 0.0
+        entry[f"{col}-S"] = p.sales if p else 0.0
+    return entry
+
+# Labor
+
+def parse_timestamp(value):
+    """Parse a LiveIQ YYYY-MM-DDTHH:MM:SS timestamp; raises ValueError like strptime."""
+    if len(value) == 19 and value[10] == "T":
+        return datetime.fromisoformat(value)
+    return datetime.strptime(value, "%Y-%m-%dT%H:%M:%S")
+
+
+def shift_times(cin, cout):
+    """Return (in, out, hours) display values for a clock-in/out pair; open shifts show "(in)"."""
+    t0 = parse_timestamp(cin)
+    t1 = parse_timestamp(cout) if cout else None
+    in_s = t0.strftime("%m/%d %I:%M %p")
+    out_s = t1.strftime("%m/%d %I:%M %p") if t1 else "(in)"
+    hrs = (t1 - t0).total_seconds() / 3600 if t1 else 0
+    return in_s, out_s, hrs
+
+
+def labor_rollup_rows(records, store_ids, days):
+    """Labor rollup rows for decoded Daily Timeclock records, as the report writes them.
+
+    Returns ([(store, date, {"hours", "shifts"})], [(store, date, employee, hours, shifts)]).
+    Store-days with an open shift, and every day of a store with a bad
+    timestamp, are left out.
+    """
+    wanted, span = set(store_ids), set(days)
+    day_totals = defaultdict(lambda: {"hours": 0.0, "shifts": 0})
+    day_emps = defaultdict(lambda: [0.0, 0])
+    unsettled = set()
+    for rec in records:
+        sid = rec.store
+        if sid not in wanted:
+            continue
+        emp = rec.employee.strip().title()
+        try:
+            in_s, out_s, hrs = shift_times(rec.clock_in, rec.clock_out)
+        except (TypeError, ValueError):
+            unsettled.update((sid, d) for d in days)
+            continue
+        day = rec.clock_in[:10]
+        if not rec.clock_out:
+            unsettled.add((sid, day))
+        day_totals[(sid, day)]["hours"] += hrs
+        day_totals[(sid, day)]["shifts"] += 1
+        day_emps[(sid, day, emp)][0] += hrs
+        day_emps[(sid, day, emp)][1] += 1
+    totals = [(sid, d, day_totals.get((sid, d), {"hours": 0.0, "shifts": 0}))
+              for sid in store_ids for d in days if (sid, d) not in unsettled]
+    employees = [(sid, d, emp, hrs, n) for (sid, d, emp), (hrs, n) in day_emps.items()
+                 if (sid, d) not in unsettled and d in span]
+    return totals, employees
@@ -0,0 +1,152 @@
+"""Incremental refresh of today's Transaction Details store-days.
+
+Incremental refresh is on unless this environment variable turns it off:
+
+    SUBWAYIQ_INTRADAY  0 to reduce every transaction of today on every run
+
+LiveIQ only filters Transaction Details by business date, so refreshing a
+"Today" report still downloads the day so far. What it no longer repeats is
+the reducing. For every store-day that has not settled (SUBWAYIQ_ROLLUP_SETTLE_DAYS,
+see liveiq.rollup) a report keeps, for the rest of the SubwayIQ session, the
+keys of the transactions it has reduced and the rows it folded them into
+(details.item_rows / discount_rows layout). The next run walks only the
+transactions it has not seen and adds their rows to the kept ones.
+
+Transactions are remembered by key rather than by a last-seen time: LiveIQ
+posts them 30-60 minutes late and not always in time order, so a time
+watermark would drop stragglers. Each key keeps the transaction's total.
+When a kept transaction is missing from the new payload, or its total has
+changed (LiveIQ edited or voided it in place), the kept rows no longer add
+up and the whole store-day is reduced again. Tracked days are therefore not
+streamed: their payload must be walkable twice. Settled days are forgotten;
+they belong to the rollup checkpoints.
+"""
+import os
+import threading
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+from . import metrics, rollup
+
+_lock = threading.Lock()
+_trackers = {}
+
+
+def enabled():
+    return os.environ.get("SUBWAYIQ_INTRADAY", "").strip().lower() not in ("0", "false", "no", "off")
+
+
+_MISSING = object()
+
+
+def txn_key(txn):
+    """Identity of one transaction within its store-day."""
+    return (txn.get("receiptNumber"), txn.get("time"))
+
+
+def unseen(transactions, seen, current):
+    """Yield the transactions whose key is not in seen; record every transaction's key and total in current."""
+    for txn in transactions:
+        key = txn_key(txn)
+        current[key] = txn.get("total")
+        if key not in seen:
+            yield txn
+
+
+def merge_rows(kept, new):
+    """Add rows keyed on their first two columns; the remaining columns are summed."""
+    out = {(row[0], row[1]): list(row) for row in kept}
+    for row in new:
+        have = out.get((row[0], row[1]))
+        if have is None:
+            out[(row[0], row[1])] = list(row)
+        else:
+            for i in range(2, len(row)):
+                have[i] += row[i]
+    return list(out.values())
+
+
+class Day:
+    """What earlier runs reduced for one store-day: {transaction key: total} and folded rows."""
+
+    __slots__ = ("seen", "rows", "lock", "reused", "reduced")
+
+    def __init__(self):
+        self.seen = {}
+        self.rows = []
+        self.lock = threading.Lock()
+        self.reused = self.reduced = 0
+
+    def fresh(self, transactions, current):
+        """The transactions not reduced before (see unseen)."""
+        return unseen(transactions, self.seen, current)
+
+    def holds(self, current):
+        """True when every kept transaction is in current with the same total."""
+        return all(current.get(key, _MISSING) == total for key, total in self.seen.items())
+
+    def commit(self, current, rows, full):
+        """Record the payload's transactions and return the store-day's rows.
+
+        rows were reduced from the transactions fresh() yielded and are added
+        to the kept ones. When the kept rows no longer hold (see holds),
+        full() is called for rows reduced from the whole payload instead.
+        """
+        if self.holds(current):
+            self.reused, self.reduced = len(self.seen), len(current) - len(self.seen)
+            self.rows = merge_rows(self.rows, rows) if self.rows else [list(row) for row in rows]
+        else:
+            self.reused, self.reduced = 0, len(current)
+            self.rows = [list(row) for row in full()]
+        self.seen = dict(current)
+        return self.rows
+
+
+class Tracker:
+    """The intraday Days of one report source, shared between runs and pool threads."""
+
+    def __init__(self, source, settle=None):
+        self.source = source
+        self.settle = rollup.settle_days() if settle is None else settle
+        self._lock = threading.Lock()
+        self._days = {}
+
+    def live(self, day):
+        """True when day (YYYY-MM-DD) has not settled, so it is refreshed incrementally."""
+        return day > (date.today() - timedelta(days=self.settle)).isoformat()
+
+    def tracks(self, day):
+        """True when open() yields a Day for day."""
+        return enabled() and self.live(day)
+
+    @contextmanager
+    def open(self, sid, day):
+        """Hold one store-day while a run reduces it; yields its Day, or None when it is not tracked.
+
+        A second run refreshing the same store-day waits here, so no
+        transaction is added twice. Nothing is recorded unless the holder
+        calls Day.commit.
+        """
+        if not self.tracks(day):
+            yield None
+            return
+        with self._lock:
+            for key in [k for k in self._days if not self.live(k[1])]:
+                del self._days[key]
+            entry = self._days.get((sid, day))
+            if entry is None:
+                entry = self._days[(sid, day)] = Day()
+        with entry.lock:
+            entry.reused = entry.reduced = 0
+            yield entry
+            metrics.inc("subwayiq_cache_hits_total", entry.reused, cache=f"intraday:{self.source}")
+            metrics.inc("subwayiq_cache_misses_total", entry.reduced, cache=f"intraday:{self.source}")
+
+
+def tracker(source):
+    """Return the session's Tracker for source."""
+    with _lock:
+        found = _trackers.get(source)
+        if found is None:
+            found = _trackers[source] = Tracker(source)
+        return found
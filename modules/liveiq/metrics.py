@@ -0,0 +1,225 @@
+"""Prometheus text-format metrics for LiveIQ requests and report runs.
+
+Metrics are off unless one of these environment variables is set:
+
+    SUBWAYIQ_METRICS_PORT      serve http://127.0.0.1:<port>/metrics
+    SUBWAYIQ_METRICS_FILE      write a .prom textfile (relative paths are
+                               resolved against the SubwayIQ folder)
+    SUBWAYIQ_METRICS_INTERVAL  textfile refresh in seconds (default 15)
+
+The registry lives at module level, so every report window in one SubwayIQ
+process feeds the same counters.
+"""
+import os
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+REPORT_BUCKETS = (1.0, 5.0, 15.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+RATE_WINDOW = 60.0
+
+_lock = threading.Lock()
+_counters = {}
+_histograms = {}
+_recent = {}
+_exporter_started = False
+
+HELP = {
+    "subwayiq_requests_total": ("counter", "LiveIQ requests issued by report modules."),
+    "subwayiq_request_duration_seconds": ("histogram", "LiveIQ request latency, including host-side retries."),
+    "subwayiq_rate_limit_errors_total": ("counter", "Requests that ended in a 429 / RateLimitError."),
+    "subwayiq_retries_total": ("counter", "Retries reported by the host's tenacity wrapper (best effort)."),
+    "subwayiq_cache_hits_total": ("counter", "Local cache lookups answered without calling LiveIQ."),
+    "subwayiq_cache_misses_total": ("counter", "Local cache lookups that fell through to LiveIQ."),
+    "subwayiq_report_duration_seconds": ("histogram", "Wall time of a report module's worker."),
+    "subwayiq_requests_last_minute": ("gauge", "Requests started in the last 60 s (LiveIQ allows ~60/min)."),
+}
+
+
+def enabled():
+    """Return True when an exporter is configured through the environment."""
+    return bool(os.environ.get("SUBWAYIQ_METRICS_PORT") or os.environ.get("SUBWAYIQ_METRICS_FILE"))
+
+
+def inc(name, value=1, **labels):
+    """Add value to the counter name{labels}."""
+    key = (name, tuple(sorted(labels.items())))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+
+def observe(name, value, buckets=LATENCY_BUCKETS, **labels):
+    """Record value in the histogram name{labels}."""
+    key = (name, tuple(sorted(labels.items())))
+    with _lock:
+        h = _histograms.get(key)
+        if h is None:
+            h = _histograms[key] = {"buckets": buckets, "counts": [0] * len(buckets), "sum": 0.0, "count": 0}
+        for i, le in enumerate(h["buckets"]):
+            if value <= le:
+                h["counts"][i] += 1
+        h["sum"] += value
+        h["count"] += 1
+
+
+def record_cache(hit, cache="default"):
+    """Count a cache hit or miss for the named local cache."""
+    inc("subwayiq_cache_hits_total" if hit else "subwayiq_cache_misses_total", cache=cache)
+
+
+def _is_rate_limit(error):
+    text = str(error).lower()
+    return "429" in text or "rate limit" in text
+
+
+def instrument(fetch_data, accounts=(), rate_limit_error=None):
+    """Wrap the host's fetch_data so every call is counted and timed.
+
+    Accounts are labelled by their Name, never by ClientID. Returns fetch_data
+    unchanged when metrics are disabled.
+    """
+    if not enabled():
+        return fetch_data
+    names = {a.get("ClientID"): a.get("Name") or "unknown" for a in accounts}
+
+    def wrapped(ep, sid, start, end, cid, ckey, *args, **kwargs):
+        account = names.get(cid, "unknown")
+        with _lock:
+            _recent.setdefault(account, deque()).append(time.time())
+        status = "ok"
+        t0 = time.perf_counter()
+        try:
+            res = fetch_data(ep, sid, start, end, cid, ckey, *args, **kwargs)
+        except Exception as ex:
+            limited = isinstance(ex, rate_limit_error) if rate_limit_error else _is_rate_limit(ex)
+            status = "rate_limited" if limited else "exception"
+            raise
+        else:
+            err = res.get("error") if isinstance(res, dict) else None
+            if err:
+                status = "rate_limited" if _is_rate_limit(err) else "error"
+            return res
+        finally:
+            observe("subwayiq_request_duration_seconds", time.perf_counter() - t0, endpoint=ep)
+            inc("subwayiq_requests_total", endpoint=ep, account=account, status=status)
+            if status == "rate_limited":
+                inc("subwayiq_rate_limit_errors_total", endpoint=ep, account=account)
+            # tenacity exposes the statistics of the most recent call only, so
+            # concurrent calls can misattribute retries; good enough for trends.
+            stats = getattr(fetch_data, "statistics", None) or {}
+            attempts = stats.get("attempt_number", 1) if isinstance(stats, dict) else 1
+            if attempts > 1:
+                inc("subwayiq_retries_total", attempts - 1, endpoint=ep)
+
+    return wrapped
+
+
+def timed(worker, module):
+    """Wrap a report worker so its wall time lands in the report histogram."""
+    def run_timed(*args, **kwargs):
+        t0 = time.perf_counter()
+        try:
+            return worker(*args, **kwargs)
+        finally:
+            observe("subwayiq_report_duration_seconds", time.perf_counter() - t0, REPORT_BUCKETS, module=module)
+            if enabled():
+                _write_textfile()
+    return run_timed
+
+
+def _fmt_labels(labels, extra=()):
+    items = list(labels) + list(extra)
+    if not items:
+        return ""
+    esc = lambda v: str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return "{" + ",".join(f'{k}="{esc(v)}"' for k, v in items) + "}"
+
+
+def render():
+    """Return all metrics in the Prometheus text exposition format."""
+    now = time.time()
+    with _lock:
+        for dq in _recent.values():
+            while dq and now - dq[0] > RATE_WINDOW:
+                dq.popleft()
+        series = {}
+        for (name, labels), value in sorted(_counters.items()):
+            series.setdefault(name, []).append(f"{name}{_fmt_labels(labels)} {value}")
+        for (name, labels), h in sorted(_histograms.items(), key=lambda kv: kv[0]):
+            lines = series.setdefault(name, [])
+            for le, count in zip(h["buckets"], h["counts"]):
+                lines.append(f"{name}_bucket{_fmt_labels(labels, [('le', le)])} {count}")
+            lines.append(f"{name}_bucket{_fmt_labels(labels, [('le', '+Inf')])} {h['count']}")
+            lines.append(f"{name}_sum{_fmt_labels(labels)} {h['sum']}")
+            lines.append(f"{name}_count{_fmt_labels(labels)} {h['count']}")
+        for account, dq in sorted(_recent.items()):
+            series.setdefault("subwayiq_requests_last_minute", []).append(
+                f"subwayiq_requests_last_minute{_fmt_labels([('account', account)])} {len(dq)}")
+    out = []
+    for name in sorted(series):
+        kind, text = HELP.get(name, ("untyped", name))
+        out.append(f"# HELP {name} {text}")
+        out.append(f"# TYPE {name} {kind}")
+        out.extend(series[name])
+    return "\n".join(out) + "\n"
+
+
+_textfile = None
+
+
+def _write_textfile():
+    if not _textfile:
+        return
+    tmp = f"{_textfile}.tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(render())
+        os.replace(tmp, _textfile)
+    except OSError:
+        pass
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_exporter(script_dir):
+    """Start the configured HTTP endpoint and/or textfile writer once per process."""
+    global _exporter_started, _textfile
+    with _lock:
+        if _exporter_started or not enabled():
+            return
+        _exporter_started = True
+    port = os.environ.get("SUBWAYIQ_METRICS_PORT")
+    if port:
+        try:
+            server = ThreadingHTTPServer(("127.0.0.1", int(port)), _Handler)
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+        except (OSError, ValueError):
+            pass
+    path = os.environ.get("SUBWAYIQ_METRICS_FILE")
+    if path:
+        _textfile = path if os.path.isabs(path) else os.path.join(script_dir, path)
+        os.makedirs(os.path.dirname(_textfile) or ".", exist_ok=True)
+        interval = float(os.environ.get("SUBWAYIQ_METRICS_INTERVAL", "15") or 15)
+
+        def loop():
+            while True:
+                _write_textfile()
+                time.sleep(interval)
+
+        threading.Thread(target=loop, daemon=True).start()
@@ -0,0 +1,91 @@
+"""One paced request stream per LiveIQ account, shared across reports.
+
+    SUBWAYIQ_PACE_PER_MINUTE  requests per minute per account for paced
+                              fetches (default 50, under LiveIQ's ~60/min)
+
+A report run fires its requests as fast as its thread pool allows and relies
+on the rate-limit handling when it overshoots. A mode that refreshes on a
+timer cannot: 100 stores on one account, fired at once every tick, would hit
+429s all day. Pacer.wrap() gives every call of a fetch_data-compatible
+function the next free slot of its account's stream instead. Slots are
+60/rate seconds apart and shared by every paced fetch in the process, so two
+open dashboards split one budget rather than doubling it. A 429 holds the
+account for a minute: its next slot moves past the hold, and calls already
+waiting for an earlier slot take a new one when they wake inside it.
+"""
+import os
+import threading
+import time
+
+DEFAULT_PER_MINUTE = 50
+
+_lock = threading.Lock()
+_shared = None
+
+
+def per_minute():
+    """Paced requests per minute per account from SUBWAYIQ_PACE_PER_MINUTE."""
+    try:
+        return max(1, int(os.environ.get("SUBWAYIQ_PACE_PER_MINUTE", "") or DEFAULT_PER_MINUTE))
+    except ValueError:
+        return DEFAULT_PER_MINUTE
+
+
+class Pacer:
+    """Hands out request slots per account, spaced 60/rate seconds apart."""
+
+    def __init__(self, rate=None, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate or per_minute()
+        self.spacing = 60.0 / self.rate
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._next = {}
+        self._blocked = {}  # account -> clock time its hold ends
+
+    def reserve(self, account):
+        """Claim the account's next slot and return the seconds until it opens."""
+        with self._lock:
+            now = self._clock()
+            slot = max(now, self._next.get(account, now))
+            self._next[account] = slot + self.spacing
+        return slot - now
+
+    def wait(self, account):
+        """Block until the caller's slot for account opens outside any hold."""
+        while True:
+            delay = self.reserve(account)
+            if delay > 0:
+                self._sleep(delay)
+            with self._lock:
+                until = self._blocked.get(account)
+                if until is None or self._clock() >= until:
+                    return
+
+    def hold(self, account, seconds=60.0):
+        """Block the account for at least seconds (after a 429) and push its next slot past the hold."""
+        with self._lock:
+            until = self._clock() + seconds
+            self._blocked[account] = max(self._blocked.get(account, until), until)
+            self._next[account] = max(self._next.get(account, until), until)
+
+    def wrap(self, fetch, rate_limit_error=None):
+        """Return fetch(ep, sid, start, end, cid, ckey) paced per ClientID."""
+        def paced(ep, sid, start, end, cid, ckey, *args, **kwargs):
+            self.wait(cid)
+            try:
+                return fetch(ep, sid, start, end, cid, ckey, *args, **kwargs)
+            except Exception as ex:
+                if rate_limit_error is not None and isinstance(ex, rate_limit_error):
+                    self.hold(cid)
+                raise
+        return paced
+
+
+def shared():
+    """The process-wide Pacer, so every paced fetch draws on the same per-account streams."""
+    global _shared
+    with _lock:
+        if _shared is None:
+            _shared = Pacer()
+        return _shared
@@ -0,0 +1,95 @@
+"""Process-pool stage for the CPU-bound half of Transaction Details reports.
+
+The process pool is off unless this environment variable is set:
+
+    SUBWAYIQ_PARSE_PROCESSES  worker processes that decode and reduce response
+                              bodies ("auto" = one per CPU; default 0 = off)
+
+Fetch threads spend their time waiting on LiveIQ, but decoding a store-day's
+JSON and walking its item trees is pure-Python work that holds the GIL, so
+extra threads do not help with it. With the pool on, Items-Sold and Discounts
+hand each store-day's payload to a worker process, which returns compact rows
+(details.item_rows or details.discount_rows) for the report to fold on its own
+thread as before. Fetches still go through the host, and the pool is only
+used when it provides fetch_data_raw (see liveiq.stream): the worker is sent
+the undecoded body and decodes it too. A parsed list from fetch_data is
+reduced on the fetch thread instead, because pickling it to a worker (under
+the GIL) costs more than walking it.
+For a store-day refreshed incrementally (liveiq.intraday) the worker is given
+the keys already reduced and skips those transactions.
+
+Worker processes import this package by name. On Windows, and in frozen
+builds, multiprocessing starts them by re-running the host script, so the host
+must guard its start-up with ``if __name__ == "__main__"`` and call
+multiprocessing.freeze_support().
+"""
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from . import details, intraday, schemas
+
+_lock = threading.Lock()
+_pool = None
+_workers = 0
+
+
+def processes():
+    """Worker process count from SUBWAYIQ_PARSE_PROCESSES (0 = off)."""
+    value = os.environ.get("SUBWAYIQ_PARSE_PROCESSES", "").strip().lower()
+    if value == "auto":
+        return os.cpu_count() or 1
+    try:
+        return max(0, int(value or 0))
+    except ValueError:
+        return 0
+
+
+def pool():
+    """Return the shared ProcessPoolExecutor, or None when the stage is off.
+
+    The pool outlives a report run, so later runs do not pay for process
+    start-up again; a pool broken by a crashed worker is replaced.
+    """
+    global _pool, _workers
+    count = processes()
+    if not count:
+        return None
+    with _lock:
+        if _pool is None or getattr(_pool, "_broken", False) or _workers != count:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            _pool, _workers = ProcessPoolExecutor(max_workers=count), count
+        return _pool
+
+
+def summary(body):
+    """Small stand-in for a body sent to the pool, for the report's log."""
+    return {"bytes": len(body)}
+
+
+def _reduce(reducer, body, seen):
+    transactions = schemas.loads(body) or []
+    if seen is None:
+        return reducer(transactions), None
+    current = {}
+    rows = reducer(intraday.unseen(transactions, seen, current))
+    return rows, current
+
+
+def item_rows(body, seen=None):
+    """Decode one Transaction Details body and reduce it to details.item_rows rows (runs in a worker).
+
+    Returns (rows, current): with seen, only transactions whose key is not in
+    it are reduced and current maps every transaction's key to its total (see
+    intraday.unseen); without it current is None.
+    """
+    return _reduce(details.item_rows, body, seen)
+
+
+def discount_rows(body, seen=None):
+    """Decode one Transaction Details body and reduce it to details.discount_rows rows (runs in a worker).
+
+    Returns (rows, keys) like item_rows.
+    """
+    return _reduce(details.discount_rows, body, seen)
@@ -0,0 +1,174 @@
+"""Opt-in profiling for a module's run(window) and its worker thread.
+
+    SUBWAYIQ_PROFILE           "1"/"all" for every module, or a comma list
+                               such as "Discounts,Transactions"
+    SUBWAYIQ_PROFILE_MODE      "cprofile" (deterministic, default) or
+                               "sample" (stack sampling, low overhead)
+    SUBWAYIQ_PROFILE_INTERVAL  sampling interval in ms (default 5)
+
+Profiles land in reports/ as <Module>-<part>-YYYYMMDD-HHMMSS.* : a .prof
+file plus a .txt summary for cProfile, or a .folded stack file (flamegraph.pl
+/ speedscope format) for sampling. The host can call set_profile() to toggle
+profiling at runtime instead of using the environment. On Python 3.12+ only
+one cProfile profile can record at a time, so run() and its worker share one
+(the run file) when they overlap.
+"""
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from functools import wraps
+
+REPORTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "reports")
+# From Python 3.12 cProfile records through sys.monitoring: one profiler at a
+# time for the whole process, covering every thread.
+PROCESS_WIDE = sys.version_info >= (3, 12)
+
+_override = None
+_lock = threading.Lock()
+_shared = None  # [profile, users, base] while a process-wide profile is recording
+
+
+def set_profile(spec, mode=None):
+    """Override SUBWAYIQ_PROFILE (and optionally the mode); pass None to clear."""
+    global _override
+    _override = None if spec is None else (spec, mode)
+
+
+def _settings():
+    if _override is not None:
+        spec, mode = _override
+    else:
+        spec, mode = os.environ.get("SUBWAYIQ_PROFILE", ""), None
+    mode = (mode or os.environ.get("SUBWAYIQ_PROFILE_MODE") or "cprofile").lower()
+    return (spec or "").strip(), mode
+
+
+def _active(module):
+    spec, _ = _settings()
+    if not spec or spec.lower() in ("0", "false", "off"):
+        return False
+    if spec.lower() in ("1", "true", "on", "all", "*"):
+        return True
+    return module.lower() in {s.strip().lower() for s in spec.split(",")}
+
+
+def _base_name(module, part):
+    os.makedirs(REPORTS_DIR, exist_ok=True)
+    return os.path.join(REPORTS_DIR, f"{module}-{part}-{datetime.now():%Y%m%d-%H%M%S}")
+
+
+class _Sampler:
+    """Sample one thread's Python stack at a fixed interval."""
+
+    def __init__(self, thread_id, interval):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+
+    def _loop(self):
+        while not self._stop.is_set():
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+            time.sleep(self.interval)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def write(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+def _start_cprofile(base):
+    """Start profiling this call; returns the [profile, users, base] entry it records into, or None."""
+    global _shared
+    with _lock:
+        if _shared is not None:
+            _shared[1] += 1
+            return _shared
+        prof = cProfile.Profile()
+        try:
+            prof.enable()
+        except ValueError:
+            return None  # another profiling tool (a debugger, python -m cProfile) holds the process
+        entry = [prof, 1, base]
+        if PROCESS_WIDE:
+            _shared = entry
+        return entry
+
+
+def _finish_cprofile(entry):
+    """Stop entry's profile once its last user is done, and write it out."""
+    global _shared
+    with _lock:
+        entry[1] -= 1
+        if entry[1]:
+            return
+        if _shared is entry:
+            _shared = None
+        prof, _, base = entry
+        prof.disable()
+    prof.dump_stats(f"{base}.prof")
+    out = io.StringIO()
+    pstats.Stats(prof, stream=out).sort_stats("cumulative").print_stats(60)
+    with open(f"{base}.txt", "w", encoding="utf-8") as f:
+        f.write(out.getvalue())
+
+
+def _run_profiled(fn, module, part, args, kwargs):
+    _, mode = _settings()
+    base = _base_name(module, part)
+    if mode == "sample":
+        interval = float(os.environ.get("SUBWAYIQ_PROFILE_INTERVAL", "5") or 5) / 1000.0
+        sampler = _Sampler(threading.get_ident(), interval)
+        sampler.start()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            sampler.stop()
+            sampler.write(f"{base}.folded")
+    entry = _start_cprofile(base)
+    if entry is None:
+        return fn(*args, **kwargs)
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        _finish_cprofile(entry)
+
+
+def profiled(module, part="run"):
+    """Decorate run() or a worker so it is profiled when enabled for module.
+
+    Profiling is checked per call, so toggling it does not need a restart.
+    Each thread is profiled separately; wrap the worker itself, not the code
+    that starts its thread. On Python 3.12+ a worker started while run() is
+    being profiled joins run()'s profile instead, and the profile is written
+    when the last of them returns.
+    """
+    def decorate(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _active(module):
+                return fn(*args, **kwargs)
+            return _run_profiled(fn, module, part, args, kwargs)
+        return wrapper
+    return decorate
@@ -0,0 +1,224 @@
+"""Local store x day rollup of report summaries, kept in SQLite.
+
+The rollup is off unless this environment variable is set:
+
+    SUBWAYIQ_ROLLUP_DB           rollup database file (relative paths are
+                                 resolved against the SubwayIQ folder)
+    SUBWAYIQ_ROLLUP_SETTLE_DAYS  a day is only rolled up once it is at least
+                                 this many days old (default 1: yesterday and
+                                 earlier), so late LiveIQ data is not frozen
+
+Reports write their per-store, per-day figures as a side effect of a normal
+run and read them back instead of calling LiveIQ for days already on file.
+Each source has its own table keyed by (store, date):
+
+    sales           Daily Sales Summary figures (Sales)
+    transactions    per-day Transaction Summary totals (Transactions)
+    third_party     per-day Third Party Sales Summary figures (3rd-Party)
+    labor           clocked hours and shifts (Labor)
+    labor_employee  hours and shifts per employee (Labor)
+
+A missing row means "not rolled up yet", never zero. The store_day view joins
+the headline figures for ad-hoc trend queries, e.g.
+
+    sqlite3 rollup.db "SELECT date, SUM(net_sales) FROM store_day GROUP BY date"
+
+The partial table holds checkpoints: a report's folded per-store-day result
+(JSON), so a long windowed run that stopped part-way resumes where it left off.
+Only compact folded results belong there (Items-Sold's item rows, Discounts'
+discount rows); raw transactions are never checkpointed.
+"""
+import json
+import os
+import sqlite3
+import threading
+from datetime import date, timedelta
+
+from . import metrics
+
+# source -> [(column, report row key, SQL type)]; the row keys are the ones each report already uses.
+SOURCES = {
+    "sales": [
+        ("net_sales", "Sales", "REAL"), ("tax", "Tax", "REAL"), ("units", "Units", "INTEGER"),
+        ("txns", "Txns", "INTEGER"), ("cash_card", "Cash/Card", "REAL"),
+        ("tp_sales", "3rd $", "REAL"), ("tp_txns", "3rd Txns", "INTEGER"),
+    ],
+    "transactions": [
+        ("total_sales", "total_sales", "REAL"), ("total_net", "total_net", "REAL"), ("total_tax", "total_tax", "REAL"),
+        ("total_units", "total_units", "INTEGER"), ("total_txns", "total_txns", "INTEGER"),
+        ("eatin", "eatin", "INTEGER"), ("togo", "togo", "INTEGER"), ("delivery", "delivery", "INTEGER"),
+        ("avg_tx", "avg_tx", "REAL"), ("void_count", "void_count", "INTEGER"), ("void_total", "void_total", "REAL"),
+        ("refund_count", "refund_count", "INTEGER"), ("refund_total", "refund_total", "REAL"),
+    ],
+    "third_party": [
+        ("tot_sales", "TotSales", "REAL"), ("tot_net", "TotNet", "REAL"), ("tot_txns", "TotTxns", "INTEGER"),
+        ("dd_t", "DD-T", "INTEGER"), ("dd_n", "DD-N", "REAL"), ("dd_s", "DD-S", "REAL"),
+        ("gh_t", "GH-T", "INTEGER"), ("gh_n", "GH-N", "REAL"), ("gh_s", "GH-S", "REAL"),
+        ("ue_t", "UE-T", "INTEGER"), ("ue_n", "UE-N", "REAL"), ("ue_s", "UE-S", "REAL"),
+        ("ec_t", "EC-T", "INTEGER"), ("ec_n", "EC-N", "REAL"), ("ec_s", "EC-S", "REAL"),
+    ],
+    "labor": [("hours", "hours", "REAL"), ("shifts", "shifts", "INTEGER")],
+}
+
+VIEW = """
+CREATE VIEW IF NOT EXISTS store_day AS
+WITH keys AS (
+    SELECT store, date FROM sales UNION SELECT store, date FROM transactions
+    UNION SELECT store, date FROM third_party UNION SELECT store, date FROM labor
+)
+SELECT k.store, k.date,
+       s.net_sales, s.tax, s.units, s.txns, s.cash_card,
+       COALESCE(tp.tot_sales, s.tp_sales) AS tp_sales, COALESCE(tp.tot_txns, s.tp_txns) AS tp_txns,
+       t.void_count, t.void_total, t.refund_count, t.refund_total,
+       l.hours AS labor_hours, l.shifts AS labor_shifts
+FROM keys k
+LEFT JOIN sales s ON s.store = k.store AND s.date = k.date
+LEFT JOIN transactions t ON t.store = k.store AND t.date = k.date
+LEFT JOIN third_party tp ON tp.store = k.store AND tp.date = k.date
+LEFT JOIN labor l ON l.store = k.store AND l.date = k.date
+"""
+
+_lock = threading.Lock()
+_stores = {}
+
+
+def settle_days():
+    try:
+        return max(0, int(os.environ.get("SUBWAYIQ_ROLLUP_SETTLE_DAYS", "1") or 1))
+    except ValueError:
+        return 1
+
+
+def open_rollup(script_dir):
+    """Return the configured Rollup (shared per file), or None when SUBWAYIQ_ROLLUP_DB is unset."""
+    path = os.environ.get("SUBWAYIQ_ROLLUP_DB")
+    if not path:
+        return None
+    path = path if os.path.isabs(path) else os.path.join(script_dir, path)
+    with _lock:
+        store = _stores.get(path)
+        if store is None:
+            store = _stores[path] = Rollup(path)
+        return store
+
+
+class Rollup:
+    """One rollup database; safe to share between a report's pool threads."""
+
+    def __init__(self, path, settle=None):
+        self.path = path
+        self.settle = settle_days() if settle is None else settle
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        with self._lock, self._db:
+            for source, cols in SOURCES.items():
+                defs = ", ".join(f"{col} {kind} NOT NULL" for col, _, kind in cols)
+                self._db.execute(f"CREATE TABLE IF NOT EXISTS {source} (store TEXT NOT NULL, date TEXT NOT NULL, {defs}, "
+                                 f"updated TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP, PRIMARY KEY (store, date))")
+            self._db.execute("CREATE TABLE IF NOT EXISTS labor_employee (store TEXT NOT NULL, date TEXT NOT NULL, "
+                             "employee TEXT NOT NULL, hours REAL NOT NULL, shifts INTEGER NOT NULL, "
+                             "PRIMARY KEY (store, date, employee))")
+            self._db.execute("CREATE TABLE IF NOT EXISTS partial (source TEXT NOT NULL, store TEXT NOT NULL, date TEXT NOT NULL, "
+                             "data TEXT NOT NULL, PRIMARY KEY (source, store, date))")
+            # Transactions used to checkpoint every raw row here; those rows are never read now
+            self._db.execute("DELETE FROM partial WHERE source = 'transactions'")
+            self._db.execute(VIEW)
+
+    def settled(self, day):
+        """True when day (YYYY-MM-DD) is old enough to be rolled up."""
+        return day <= (date.today() - timedelta(days=self.settle)).isoformat()
+
+    def put(self, source, rows):
+        """Upsert (store, date, row) triples for source; days that have not settled are ignored."""
+        cols = SOURCES[source]
+        values = [(sid, day, *(row[key] for _, key, _ in cols)) for sid, day, row in rows if self.settled(day)]
+        if not values:
+            return 0
+        names = ", ".join(col for col, _, _ in cols)
+        marks = ", ".join("?" * (len(cols) + 2))
+        with self._lock, self._db:
+            self._db.executemany(f"INSERT OR REPLACE INTO {source} (store, date, {names}) VALUES ({marks})", values)
+        return len(values)
+
+    def get(self, source, stores, days):
+        """{(store, date): row} for the settled store-days on file, with the report's own row keys."""
+        cols = SOURCES[source]
+        days = [d for d in days if self.settled(d)]
+        stores = list(stores)
+        if not days or not stores:
+            return {}
+        names = ", ".join(col for col, _, _ in cols)
+        sql = (f"SELECT store, date, {names} FROM {source} WHERE date BETWEEN ? AND ? "
+               f"AND store IN ({', '.join('?' * len(stores))})")
+        wanted = set(days)
+        with self._lock:
+            found = self._db.execute(sql, [min(days), max(days), *stores]).fetchall()
+        out = {}
+        for sid, day, *values in found:
+            if day in wanted:
+                out[(sid, day)] = {key: value for (_, key, _), value in zip(cols, values)}
+        hits = len(out)
+        metrics.inc("subwayiq_cache_hits_total", hits, cache=f"rollup:{source}")
+        metrics.inc("subwayiq_cache_misses_total", len(stores) * len(days) - hits, cache=f"rollup:{source}")
+        return out
+
+    def covered(self, source, stores, days):
+        """Split stores into (fully rolled up for every day, the rest) and return the rows found."""
+        rows = self.get(source, stores, days)
+        full = [sid for sid in stores if all((sid, d) in rows for d in days)]
+        done = set(full)
+        return full, [sid for sid in stores if sid not in done], rows
+
+    def put_employees(self, rows):
+        """Upsert (store, date, employee, hours, shifts) rows for settled days."""
+        values = [r for r in rows if self.settled(r[1])]
+        if not values:
+            return 0
+        with self._lock, self._db:
+            self._db.executemany("INSERT OR REPLACE INTO labor_employee (store, date, employee, hours, shifts) VALUES (?, ?, ?, ?, ?)", values)
+        return len(values)
+
+    def employees(self, stores, start, end):
+        """(store, employee, hours, shifts) totals over start..end for the given stores."""
+        stores = list(stores)
+        if not stores:
+            return []
+        sql = ("SELECT store, employee, SUM(hours), SUM(shifts) FROM labor_employee WHERE date BETWEEN ? AND ? "
+               f"AND store IN ({', '.join('?' * len(stores))}) GROUP BY store, employee ORDER BY store, employee")
+        with self._lock:
+            return self._db.execute(sql, [start, end, *stores]).fetchall()
+
+    def put_partials(self, source, rows):
+        """Checkpoint (store, date, JSON-able value) triples for source; unsettled days are ignored."""
+        values = [(source, sid, day, json.dumps(value, separators=(",", ":"))) for sid, day, value in rows if self.settled(day)]
+        if not values:
+            return 0
+        with self._lock, self._db:
+            self._db.executemany("INSERT OR REPLACE INTO partial (source, store, date, data) VALUES (?, ?, ?, ?)", values)
+        return len(values)
+
+    def get_partials(self, source, stores, days):
+        """{(store, date): value} for the settled store-days checkpointed under source."""
+        days = [d for d in days if self.settled(d)]
+        stores = list(stores)
+        if not days or not stores:
+            return {}
+        sql = ("SELECT store, date, data FROM partial WHERE source = ? AND date BETWEEN ? AND ? "
+               f"AND store IN ({', '.join('?' * len(stores))})")
+        wanted = set(days)
+        with self._lock:
+            found = self._db.execute(sql, [source, min(days), max(days), *stores]).fetchall()
+        out = {(sid, day): json.loads(data) for sid, day, data in found if day in wanted}
+        metrics.inc("subwayiq_cache_hits_total", len(out), cache=f"partial:{source}")
+        metrics.inc("subwayiq_cache_misses_total", len(stores) * len(days) - len(out), cache=f"partial:{source}")
+        return out
+
+
+def total(rows, keys):
+    """Sum row dicts over keys, keeping int fields int (a range summary built from daily rows)."""
+    out = {key: 0 for key in keys}
+    for row in rows:
+        for key in keys:
+            out[key] += row[key]
+    return out
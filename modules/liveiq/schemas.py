@@ -0,0 +1,267 @@
+"""Declared record schemas for the seven LiveIQ endpoints.
+
+Each schema lists the fields a report reads from one record, with their type,
+default and every name LiveIQ has used for them:
+
+    Field("net_sales", float, 0.0, "netSales", "netSalesTotal")
+
+Schema.decode is generated once per schema. It resolves the aliases in order
+(the first one present with a non-null value wins, otherwise the default),
+converts the value with the field's type and returns a __slots__ record, so a
+hot loop reads rec.net_sales instead of repeating
+float(rec.get("netSales", rec.get("netSalesTotal", 0.0))). A value that does
+not convert raises SchemaError naming the endpoint, field and value.
+
+loads() decodes a raw response body with orjson when it is installed and the
+standard json module otherwise; decode_body() goes straight from bytes to
+records.
+
+Business dates drift between responses (businessDate, date, ...), so
+day_reader() picks the date key from a response's first record and reuses it
+for the rest, and iso_day() caches the parse of each distinct date string.
+"""
+import json
+from datetime import date, datetime
+from functools import lru_cache
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class SchemaError(ValueError):
+    """A LiveIQ record field that does not convert to its declared type."""
+
+
+class Field:
+    """One record field: attribute name, type (None keeps the raw value), default and source keys."""
+
+    __slots__ = ("name", "type", "default", "keys")
+
+    def __init__(self, name, type, default, *keys):
+        self.name = name
+        self.type = type
+        self.default = default
+        self.keys = keys or (name,)
+
+
+class Schema:
+    """A compiled record layout for one endpoint (or one nested list inside it)."""
+
+    def __init__(self, endpoint, fields):
+        self.endpoint = endpoint
+        self.fields = list(fields)
+        self.record, self.decode = self._compile()
+
+    def _source(self, fields, args=()):
+        """Generated decoder prologue: resolve and convert fields into locals f0, f1, ..."""
+        scope = {"_error": self._error}
+        lines = [f"def decode({', '.join(('d',) + tuple(args))}):", "    g = d.get", "    try:"]
+        for i, f in enumerate(fields):
+            scope[f"_d{i}"] = f.default
+            scope[f"_t{i}"] = f.type
+            lines.append(f"        v = g({f.keys[0]!r})")
+            for key in f.keys[1:]:
+                lines.append(f"        if v is None: v = g({key!r})")
+            # Values that already have the declared type (nearly all of them) skip the conversion call
+            lines.append(f"        f{i} = _d{i} if v is None else " + (f"v if v.__class__ is _t{i} else _t{i}(v)" if f.type else "v"))
+        lines.append("    except (TypeError, ValueError):")
+        lines.append("        raise _error(d) from None")
+        return scope, lines
+
+    def _compile(self):
+        names = [f.name for f in self.fields]
+        cls = type(self.endpoint.title().replace(" ", "") + "Record", (_Record,), {"__slots__": tuple(names)})
+        scope, lines = self._source(self.fields)
+        scope.update(_new=cls.__new__, _cls=cls)
+        lines.append("    r = _new(_cls)")
+        lines.extend(f"    r.{name} = f{i}" for i, name in enumerate(names))
+        lines.append("    return r")
+        exec("\n".join(lines), scope)
+        return cls, scope["decode"]
+
+    def row_decoder(self, columns, leading=()):
+        """Compile decode(d, *leading values) -> report row dict, skipping the record object.
+
+        columns are (row key, field name) or (row key, field name, converter)
+        pairs; the leading row keys are filled from the extra arguments. For
+        hot loops that only ever turn records into report rows.
+        """
+        by_name = {f.name: f for f in self.fields}
+        fields = [by_name[col[1]] for col in columns]
+        args = [f"a{i}" for i in range(len(leading))]
+        scope, lines = self._source(fields, args)
+        items = [f"{key!r}: {arg}" for key, arg in zip(leading, args)]
+        for i, col in enumerate(columns):
+            if len(col) > 2:
+                scope[f"_c{i}"] = col[2]
+                items.append(f"{col[0]!r}: _c{i}(f{i})")
+            else:
+                items.append(f"{col[0]!r}: f{i}")
+        lines.append("    return {" + ", ".join(items) + "}")
+        exec("\n".join(lines), scope)
+        return scope["decode"]
+
+    def _error(self, d):
+        """Build the SchemaError for the first field of d that will not convert (the slow path)."""
+        for f in self.fields:
+            value = next((d.get(k) for k in f.keys if d.get(k) is not None), None)
+            if value is not None and f.type:
+                try:
+                    f.type(value)
+                except (TypeError, ValueError):
+                    return SchemaError(f"{self.endpoint}: field {f.keys[0]!r} has {value!r}, expected {f.type.__name__}")
+        return SchemaError(f"{self.endpoint}: record does not match the schema")
+
+    def decode_all(self, records):
+        """Decode a list of record dicts; a single dict counts as a one-record list."""
+        if isinstance(records, dict):
+            records = [records]
+        decode = self.decode
+        return [decode(r) for r in records or ()]
+
+
+class _Record:
+    __slots__ = ()
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        return f"{type(self).__name__}({', '.join(f'{n}={getattr(self, n)!r}' for n in self.__slots__)})"
+
+    def __eq__(self, other):
+        return type(self) is type(other) and all(getattr(self, n) == getattr(other, n) for n in self.__slots__)
+
+
+def loads(body):
+    """Decode a JSON response body (bytes or str)."""
+    return orjson.loads(body) if orjson is not None else json.loads(body)
+
+
+def decode_body(schema, body):
+    """Decode a raw response body straight to schema records."""
+    return schema.decode_all(loads(body))
+
+
+def date_key(record):
+    """The first key of record that names a date, or None."""
+    return next((k for k in record if "date" in k.lower()), None)
+
+
+@lru_cache(maxsize=4096)
+def iso_day(raw):
+    """YYYY-MM-DD for a LiveIQ date or timestamp string; raises ValueError(raw) if it is not a date."""
+    day = raw.split("T")[0] if "T" in raw else raw
+    try:
+        if len(day) == 10:
+            return date.fromisoformat(day).isoformat()
+        return datetime.strptime(day, "%Y-%m-%d").date().isoformat()
+    except ValueError:
+        raise ValueError(raw) from None
+
+
+def day_reader(records):
+    """Return day(record, default) -> YYYY-MM-DD for the records of one response.
+
+    The date key is chosen once from the first record; a record without it
+    falls back to its own first date-like key, and a record with none to
+    default. Raises ValueError(raw value) for a date that does not parse.
+    """
+    key = date_key(records[0]) if records else None
+
+    def day(record, default=""):
+        raw = record[key] if key in record else record.get(date_key(record), default)
+        return iso_day(raw if raw.__class__ is str else str(raw))
+    return day
+
+
+_SALES_FIELDS = [
+    Field("business_date", str, "", "businessDate"),
+    Field("net_sales", float, 0.0, "netSales", "netSalesTotal"),
+    Field("tax", float, 0.0, "tax"),
+    Field("units", int, 0, "units", "unitCount"),
+    Field("transactions", int, 0, "transactions", "transactionCount"),
+    Field("cash_card", float, 0.0, "cashCardTotal"),
+    Field("third_party_sales", float, 0.0, "thirdPartySales", "thirdPartySaleTotal"),
+    Field("third_party_transactions", int, 0, "thirdPartyTransactions", "thirdPartyTransactionCount"),
+]
+
+SALES_SUMMARY = Schema("Sales Summary", _SALES_FIELDS)
+DAILY_SALES_SUMMARY = Schema("Daily Sales Summary", _SALES_FIELDS)
+
+THIRD_PARTY_SALES_SUMMARY = Schema("Third Party Sales Summary", [
+    Field("business_date", str, "", "businessDate"),
+    Field("total_sales", float, 0.0, "totalSales"),
+    Field("total_net_sales", float, 0.0, "totalNetSales"),
+    Field("total_transactions", int, 0, "totalTransactions"),
+    Field("providers", None, (), "providers"),
+])
+# One entry of a Third Party Sales Summary record's providers list.
+THIRD_PARTY_PROVIDER = Schema("Third Party Provider", [
+    Field("provider", str, "", "provider"),
+    Field("transactions", int, 0, "transactions"),
+    Field("net_sales", float, 0.0, "netSales"),
+    Field("sales", float, 0.0, "sales"),
+])
+
+THIRD_PARTY_TRANSACTION_SUMMARY = Schema("Third Party Transaction Summary", [
+    Field("business_date", str, "", "businessDate"),
+    Field("time", str, "", "time"),
+    Field("provider", str, "", "provider"),
+    Field("order_id", str, "", "orderId"),
+    Field("receipt", str, "", "receiptNumber"),
+    Field("type", str, "", "type"),
+    Field("total", float, 0.0, "total"),
+    Field("net_total", float, 0.0, "netTotal"),
+    Field("tax", float, 0.0, "tax"),
+])
+
+TRANSACTION_SUMMARY = Schema("Transaction Summary", [
+    Field("business_date", str, "", "businessDate"),
+    Field("time", str, "", "time"),
+    Field("type", str, "Unknown", "type"),
+    Field("receipt", str, "N/A", "receiptNumber"),
+    Field("clerk", str, "Unknown", "clerkName"),
+    Field("channel", str, "", "channel"),
+    Field("sale_type", str, "", "saleType"),
+    Field("units", int, 0, "units"),
+    Field("order_source", str, "", "orderSource"),
+    Field("delivery_provider", str, "", "deliveryProvider"),
+    Field("delivery_partner", str, "", "deliveryPartner"),
+    Field("total", float, 0.0, "total"),
+    Field("net_total", float, 0.0, "netTotal"),
+    Field("tax", float, 0.0, "tax"),
+])
+
+# Transaction Details records are walked as nested trees (liveiq.details), so
+# the schema covers the transaction header and one item line of the tree.
+TRANSACTION_DETAILS = Schema("Transaction Details", [
+    Field("business_date", str, "", "businessDate"),
+    Field("time", str, "", "time"),
+    Field("receipt", str, "N/A", "receiptNumber"),
+    Field("items", None, (), "items"),
+])
+TRANSACTION_ITEM = Schema("Transaction Item", [
+    Field("description", str, "Unknown", "description"),
+    Field("plu", str, "N/A", "plu"),
+    Field("type", str, "", "type"),
+    Field("quantity", int, 1, "quantity"),
+    Field("original_price", float, 0.0, "originalPrice"),
+    Field("adjusted_price", float, 0.0, "adjustedPrice"),
+    Field("discount_code", str, "", "discountCode"),
+    Field("discount", str, "", "discount"),
+])
+
+DAILY_TIMECLOCK = Schema("Daily Timeclock", [
+    Field("store", str, "", "restaurantNumber"),
+    Field("business_date", str, "", "businessDate"),
+    Field("employee", str, "Unknown", "employeeName"),
+    Field("clock_in", None, None, "clockInDateTime", "clockIn"),
+    Field("clock_out", None, None, "clockOutDateTime", "clockOut"),
+])
+
+SCHEMAS = {s.endpoint: s for s in (SALES_SUMMARY, DAILY_SALES_SUMMARY, THIRD_PARTY_SALES_SUMMARY,
+                                    THIRD_PARTY_TRANSACTION_SUMMARY, TRANSACTION_SUMMARY, TRANSACTION_DETAILS,
+                                    DAILY_TIMECLOCK)}
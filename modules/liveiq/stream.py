@@ -0,0 +1,173 @@
+"""Incremental decoding of large LiveIQ responses.
+
+Streaming is off unless this environment variable is set:
+
+    SUBWAYIQ_STREAM_DETAILS  1 to stream Transaction Details responses
+
+The host's fetch_data reads the whole body and json.loads it before a report
+sees the first transaction, so a busy store-day is held twice: as text and as
+the parsed list. A streamed fetch instead returns {"data": Stream}, an
+iterator that decodes the top-level array one transaction at a time as the
+bytes arrive. The report reduces each transaction while the rest of the body
+is still downloading, and peak memory is one read buffer plus one transaction.
+
+Streaming needs the host to expose the undecoded body. host_fetch() looks for
+an optional helper next to fetch_data in the host script:
+
+    fetch_data_raw(ep, sid, start, end, cid, ckey)
+
+It takes the same arguments and goes through the same request path as
+fetch_data: URL, headers, retries and rate-limit handling, including
+RateLimitError when it gives up on a 429. It returns {"data": response} with
+the open HTTP response (a readable, closeable binary file) instead of parsed
+JSON, or {"error": ...}. Without it, reports keep using fetch_data. A
+connection that drops mid-body raises from the iterator, on the thread that
+is consuming it.
+"""
+import codecs
+import json
+import os
+import sys
+
+HOOK = "fetch_data_raw"
+CHUNK = 64 * 1024
+WHITESPACE = " \t\n\r"
+DELIMITERS = ",]" + WHITESPACE
+
+
+def enabled():
+    return os.environ.get("SUBWAYIQ_STREAM_DETAILS", "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def iter_array(chunks):
+    """Yield the elements of a top-level JSON array from an iterable of byte chunks.
+
+    A body that is not an array is decoded whole: a list is yielded item by
+    item, anything else as a single value. Raises ValueError on bad JSON.
+    """
+    decode = json.JSONDecoder().raw_decode
+    text = codecs.getincrementaldecoder("utf-8")()
+    chunks = iter(chunks)
+    buf, pos, state = "", 0, "start"  # start -> value <-> comma -> end
+    while True:
+        chunk = next(chunks, None)
+        eof = chunk is None
+        buf = buf[pos:] + text.decode(b"" if eof else chunk, final=eof)
+        pos = 0
+        while True:
+            n = len(buf)
+            while pos < n and buf[pos] in WHITESPACE:
+                pos += 1
+            if pos == n:
+                break
+            if state == "start":
+                if buf[pos] != "[":
+                    rest = buf[pos:] + "".join(text.decode(c) for c in chunks) + text.decode(b"", final=True)
+                    value = json.loads(rest)
+                    yield from value if isinstance(value, list) else [value]
+                    return
+                pos += 1
+                state = "first"
+            elif state == "comma":
+                if buf[pos] == "]":
+                    state = "end"
+                    pos += 1
+                elif buf[pos] == ",":
+                    state = "value"
+                    pos += 1
+                else:
+                    raise ValueError(f"expected ',' or ']' in JSON array, got {buf[pos]!r}")
+            elif state == "end":
+                raise ValueError("extra data after JSON array")
+            else:
+                if state == "first" and buf[pos] == "]":
+                    state = "end"
+                    pos += 1
+                    continue
+                try:
+                    value, end = decode(buf, pos)
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                    break  # the element continues in the next chunk
+                if not eof and (end == n or buf[end] not in DELIMITERS):
+                    break  # a bare number may continue in the next chunk
+                pos = end
+                state = "comma"
+                yield value
+        if eof:
+            if state != "end":
+                raise ValueError("truncated JSON array")
+            return
+
+
+class Stream:
+    """Iterator over one streamed response; closes the connection when done."""
+
+    def __init__(self, resp, chunk_size=CHUNK):
+        self._resp = resp
+        self.chunk_size = chunk_size
+        self.bytes = 0
+        self.count = 0
+        self._items = iter_array(self._chunks())
+
+    def _chunks(self):
+        read = self._resp.read
+        while True:
+            chunk = read(self.chunk_size)
+            if not chunk:
+                return
+            self.bytes += len(chunk)
+            yield chunk
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        try:
+            value = next(self._items)
+        except BaseException:
+            self.close()
+            raise
+        self.count += 1
+        return value
+
+    def close(self):
+        if self._resp is not None:
+            self._resp.close()
+            self._resp = None
+
+    def summary(self):
+        """Small stand-in for the payload in logs: what was streamed, not the data itself."""
+        return {"streamed": {"transactions": self.count, "bytes": self.bytes}}
+
+
+def host_fetch():
+    """The host's fetch_data_raw helper, or None when the host has none."""
+    return getattr(sys.modules.get("__main__"), HOOK, None)
+
+
+def fetcher(fetch_raw, raw=False):
+    """Return a fetch_data-compatible streaming fetch over fetch_raw, or None.
+
+    None when fetch_raw is None (see host_fetch) or streaming is off and raw
+    is False. With raw=True the fetch reads the whole body and returns it
+    undecoded (bytes), for a caller that decodes it elsewhere
+    (liveiq.parallel). Errors and exceptions pass through from fetch_raw.
+    """
+    if fetch_raw is None or not (raw or enabled()):
+        return None
+
+    def fetch_stream(ep, sid, start, end, cid, ckey):
+        res = fetch_raw(ep, sid, start, end, cid, ckey)
+        if res.get("error"):
+            return res
+        resp = res["data"]
+        if not raw:
+            return {"data": Stream(resp)}
+        try:
+            return {"data": resp.read()}
+        finally:
+            resp.close()
+
+    return fetch_stream
@@ -0,0 +1,26 @@
+"""Day windows for report ranges longer than one fetch-and-fold pass.
+
+    SUBWAYIQ_WINDOW_DAYS  days fetched and folded per window (default 7)
+
+A windowed report fetches one window, folds it into its compact aggregates and
+drops the raw payloads before starting the next, so memory stays bounded by
+the window rather than the range.
+"""
+import os
+from datetime import timedelta
+
+DEFAULT_WINDOW_DAYS = 7
+
+
+def window_days():
+    try:
+        return max(1, int(os.environ.get("SUBWAYIQ_WINDOW_DAYS", DEFAULT_WINDOW_DAYS) or DEFAULT_WINDOW_DAYS))
+    except ValueError:
+        return DEFAULT_WINDOW_DAYS
+
+
+def day_windows(start, end, size=None):
+    """Split start..end (dates, inclusive) into consecutive lists of ISO day strings."""
+    size = size or window_days()
+    days = [(start + timedelta(days=x)).isoformat() for x in range((end - start).days + 1)]
+    return [days[i:i + size] for i in range(0, len(days), size)]
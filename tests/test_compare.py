@@ -0,0 +1,33 @@
+"""liveiq.compare: comparison ranges."""
+import os
+import sys
+import unittest
+from datetime import date
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "modules"))
+from liveiq import compare  # noqa: E402
+
+
+class PeriodDaysTest(unittest.TestCase):
+    def test_mom_keeps_the_range_length_past_a_short_month(self):
+        self.assertEqual(compare.period_days(date(2025, 3, 29), date(2025, 3, 31), "mom"),
+                         ["2025-02-28", "2025-03-01", "2025-03-02"])
+
+    def test_every_period_matches_the_report_length(self):
+        for start, end in ((date(2025, 1, 31), date(2025, 2, 2)), (date(2024, 2, 29), date(2024, 3, 31)),
+                           (date(2025, 12, 25), date(2026, 1, 6)), (date(2025, 7, 1), date(2025, 7, 1))):
+            for period in compare.PERIODS:
+                with self.subTest(start=start, end=end, period=period):
+                    days = compare.period_days(start, end, period)
+                    self.assertEqual(len(days), (end - start).days + 1)
+                    self.assertEqual(days[0], compare.shift(start, period).isoformat())
+
+    def test_wow_and_yoy_keep_weekdays(self):
+        start, end = date(2025, 7, 7), date(2025, 7, 13)
+        for period in ("wow", "yoy"):
+            days = compare.period_days(start, end, period)
+            self.assertEqual(date.fromisoformat(days[0]).weekday(), start.weekday())
+
+
+if __name__ == "__main__":
+    unittest.main()
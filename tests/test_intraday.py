@@ -0,0 +1,87 @@
+"""liveiq.intraday: incremental store-day refresh stays equal to a full reduce."""
+import copy
+import json
+import os
+import sys
+import unittest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "modules"))
+sys.path.insert(0, ROOT)
+from benchmarks import synthetic  # noqa: E402
+from liveiq import details, intraday, parallel  # noqa: E402
+
+DAY = "2025-06-29"
+
+
+def totals(rows):
+    return sorted((row[0], row[1], *(round(v, 6) for v in row[2:])) for row in rows)
+
+
+class RefreshTest(unittest.TestCase):
+    def setUp(self):
+        self.txns = synthetic.transaction_details(1, "10001", DAY, 40)
+        self.day = intraday.Day()
+        self.full_calls = 0
+
+    def refresh(self, payload):
+        """One report refresh of the store-day, as Items-Sold does it in thread mode."""
+        current = {}
+        rows = details.item_rows(self.day.fresh(payload, current))
+
+        def full():
+            self.full_calls += 1
+            return details.item_rows(payload)
+
+        return self.day.commit(current, rows, full)
+
+    def assert_matches_full(self, payload):
+        self.assertEqual(totals(self.refresh(payload)), totals(details.item_rows(payload)))
+
+    def test_appended_transactions_are_added(self):
+        self.assert_matches_full(self.txns[:25])
+        self.assert_matches_full(self.txns)
+        self.assertEqual(self.full_calls, 0)
+        self.assertEqual((self.day.reused, self.day.reduced), (25, len(self.txns) - 25))
+
+    def test_stragglers_out_of_order_are_added(self):
+        self.assert_matches_full(self.txns[::2])
+        self.assert_matches_full(self.txns[1::2] + self.txns[::2])
+        self.assertEqual(self.full_calls, 0)
+
+    def test_edited_transaction_is_not_counted_twice(self):
+        self.assert_matches_full(self.txns[:30])
+        edited = copy.deepcopy(self.txns)
+        edited[3]["type"] = "Void"
+        edited[3]["total"] = 0.0
+        self.assert_matches_full(edited)
+        self.assertEqual(self.full_calls, 1)
+
+    def test_removed_transaction_is_subtracted(self):
+        self.assert_matches_full(self.txns)
+        self.assert_matches_full(self.txns[:10] + self.txns[11:])
+        self.assertEqual(self.full_calls, 1)
+        self.assertEqual(self.day.reused, 0)
+
+    def test_back_to_incremental_after_a_full_reduce(self):
+        self.assert_matches_full(self.txns[:20])
+        self.assert_matches_full(self.txns[1:30])
+        self.assert_matches_full(self.txns[1:])
+        self.assertEqual(self.full_calls, 1)
+
+    def test_worker_reports_every_key_and_total(self):
+        self.refresh(self.txns[:25])
+        edited = copy.deepcopy(self.txns)
+        edited[0]["total"] += 1
+        rows, current = parallel.item_rows(json.dumps(edited).encode(), self.day.seen)
+        self.assertEqual(len(current), len(edited))
+        self.assertEqual(totals(rows), totals(details.item_rows(edited[25:])))
+        self.assertFalse(self.day.holds(current))
+
+    def test_key_ignores_type_and_total(self):
+        txn = {"receiptNumber": "A-1", "time": "2025-06-29T11:02:03", "type": "Sale", "total": 9.5}
+        self.assertEqual(intraday.txn_key(txn), intraday.txn_key(dict(txn, type="Refund", total=-9.5)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+"""liveiq.metrics: the fetch_data wrapper."""
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "modules"))
+from liveiq import metrics  # noqa: E402
+
+ACCOUNTS = [{"Name": "North", "ClientID": "cid"}]
+
+
+def requests(status):
+    return sum(v for (name, labels), v in metrics._counters.items()
+               if name == "subwayiq_requests_total" and ("status", status) in labels)
+
+
+class InstrumentTest(unittest.TestCase):
+    def setUp(self):
+        patches = [mock.patch.dict(os.environ, {"SUBWAYIQ_METRICS_FILE": os.devnull}),
+                   mock.patch.object(metrics, "_counters", {}), mock.patch.object(metrics, "_histograms", {}),
+                   mock.patch.object(metrics, "_recent", {})]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def fetch(self, res):
+        return metrics.instrument(lambda *a: res, ACCOUNTS)("Daily Sales Summary", "1001", "d", "d", "cid", "key")
+
+    def test_parsed_responses_are_not_reserialized(self):
+        with mock.patch("json.dumps") as dumps:
+            self.fetch({"data": [{"netSales": 10.5}] * 100})
+            dumps.assert_not_called()
+        self.assertEqual(requests("ok"), 1)
+
+    def test_non_dict_response_passes_through(self):
+        self.assertIsNone(self.fetch(None))
+        self.assertEqual(requests("ok"), 1)
+
+    def test_errors_and_rate_limits_are_labelled(self):
+        self.fetch({"error": "HTTP 500: boom"})
+        self.fetch({"error": "429 Too Many Requests"})
+        self.assertEqual((requests("error"), requests("rate_limited")), (1, 1))
+        self.assertIn('subwayiq_rate_limit_errors_total{account="North",endpoint="Daily Sales Summary"} 1', metrics.render())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+"""liveiq.pacing: per-account slots and 429 holds."""
+import os
+import sys
+import threading
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "modules"))
+from liveiq import pacing  # noqa: E402
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.on_sleep = None
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        if self.on_sleep:
+            self.on_sleep()
+        self.now += seconds
+
+
+class PacerTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.pacer = pacing.Pacer(rate=60, clock=self.clock, sleep=self.clock.sleep)
+
+    def test_slots_are_spaced_per_account(self):
+        self.assertEqual([self.pacer.reserve("a") for _ in range(3)], [0.0, 1.0, 2.0])
+        self.assertEqual(self.pacer.reserve("b"), 0.0)
+
+    def test_hold_pushes_the_next_slot(self):
+        self.pacer.reserve("a")
+        self.pacer.hold("a", 30)
+        self.assertEqual(self.pacer.reserve("a"), 30.0)
+        self.assertEqual(self.pacer.reserve("a"), 31.0)
+
+    def test_caller_sleeping_through_a_hold_waits_it_out(self):
+        self.pacer.reserve("a")  # the slot at 0 is taken; the next caller sleeps until 1
+
+        def hit_429():
+            self.clock.on_sleep = None
+            self.pacer.hold("a", 60)
+
+        self.clock.on_sleep = hit_429
+        self.pacer.wait("a")
+        self.assertEqual(self.clock.now, 60.0)
+        self.assertEqual(self.pacer.reserve("a"), 1.0)
+
+    def test_hold_never_shortens(self):
+        self.pacer.hold("a", 60)
+        self.pacer.hold("a", 10)
+        self.assertEqual(self.pacer.reserve("a"), 60.0)
+
+    def test_wrap_holds_on_rate_limit(self):
+        class Limited(Exception):
+            pass
+
+        def fetch(*args):
+            raise Limited("429")
+
+        with self.assertRaises(Limited):
+            self.pacer.wrap(fetch, Limited)("ep", "1001", "d", "d", "cid", "key")
+        self.assertEqual(self.pacer.reserve("cid"), 60.0)
+
+    def test_threads_woken_inside_a_hold_take_later_slots(self):
+        pacer = pacing.Pacer(rate=600)  # 0.1 s spacing, real clock
+        fired = []
+        lock = threading.Lock()
+
+        def call():
+            pacer.wait("a")
+            with lock:
+                fired.append(pacer._clock())
+
+        pacer.reserve("a")
+        threads = [threading.Thread(target=call) for _ in range(3)]
+        for t in threads:
+            t.start()
+        pacer.hold("a", 0.5)
+        held = pacer._clock()
+        for t in threads:
+            t.join(5)
+        self.assertEqual(len(fired), 3)
+        self.assertTrue(all(t >= held + 0.5 for t in fired), fired)
+
+
+if __name__ == "__main__":
+    unittest.main()
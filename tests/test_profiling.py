@@ -0,0 +1,72 @@
+"""liveiq.profiling: nested and overlapping cProfile runs."""
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "modules"))
+from liveiq import profiling  # noqa: E402
+
+
+class ProfiledTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+        patch = mock.patch.object(profiling, "REPORTS_DIR", self.dir.name)
+        patch.start()
+        self.addCleanup(patch.stop)
+        profiling.set_profile("Test", "cprofile")
+        self.addCleanup(profiling.set_profile, None)
+
+    def files(self, suffix):
+        return sorted(f for f in os.listdir(self.dir.name) if f.endswith(suffix))
+
+    def run_with_worker(self):
+        """run() starts a profiled worker thread and returns while it is still going, as the modules do."""
+        started, release, done = threading.Event(), threading.Event(), []
+
+        @profiling.profiled("Test", "worker")
+        def worker():
+            started.set()
+            release.wait(5)
+            done.append(sum(range(1000)))
+
+        @profiling.profiled("Test")
+        def run():
+            thread = threading.Thread(target=worker)
+            thread.start()
+            started.wait(5)
+            return thread
+
+        thread = run()
+        release.set()
+        thread.join(5)
+        return done
+
+    def test_worker_overlapping_run_is_profiled(self):
+        self.assertEqual(self.run_with_worker(), [499500])
+        self.assertEqual(len(self.files(".prof")), 1 if profiling.PROCESS_WIDE else 2)
+
+    def test_process_wide_profile_is_shared_and_written_once(self):
+        with mock.patch.object(profiling, "PROCESS_WIDE", True):
+            self.assertEqual(self.run_with_worker(), [499500])
+            self.assertIsNone(profiling._shared)
+        prof = self.files(".prof")
+        self.assertEqual(len(prof), 1)
+        self.assertTrue(prof[0].startswith("Test-run-"))
+        self.assertEqual(len(self.files(".txt")), 1)
+
+    def test_runs_unprofiled_when_another_profiler_is_active(self):
+        class Busy:
+            def enable(self):
+                raise ValueError("Another profiling tool is already active")
+
+        with mock.patch.object(profiling.cProfile, "Profile", Busy):
+            self.assertEqual(profiling.profiled("Test")(lambda: 42)(), 42)
+        self.assertEqual(self.files(".prof"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,175 @@
+"""liveiq.stream: the incremental array decoder and the host fetch hook."""
+import json
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "modules"))
+from liveiq import stream  # noqa: E402
+
+PAYLOAD = [
+    {"receiptNumber": "A-1", "total": 12.5, "items": [{"description": "Footlong, \"Italian\" ]", "qty": 2}]},
+    {"receiptNumber": "A-2", "total": -3, "note": "café ☕ naïve", "items": []},
+    [1, 2.5e3, -0.0, True, False, None],
+    "plain string with , and ] inside",
+    12345678901234567890,
+    {},
+    [],
+]
+
+
+def chunked(body, size):
+    return [body[i:i + size] for i in range(0, len(body), size)]
+
+
+def decode(body, size):
+    return list(stream.iter_array(chunked(body, size)))
+
+
+class IterArrayTest(unittest.TestCase):
+    def test_every_chunk_size_matches_json_loads(self):
+        body = json.dumps(PAYLOAD, ensure_ascii=False).encode("utf-8")
+        for size in range(1, 40):
+            self.assertEqual(decode(body, size), PAYLOAD, f"chunk size {size}")
+        self.assertEqual(decode(body, len(body)), PAYLOAD)
+
+    def test_multibyte_characters_split_across_chunks(self):
+        body = json.dumps(["☕☕", "é"], ensure_ascii=False).encode("utf-8")
+        self.assertEqual(decode(body, 1), ["☕☕", "é"])
+
+    def test_numbers_split_across_chunks(self):
+        self.assertEqual(list(stream.iter_array([b"[12", b"34, 5", b"6.7", b"5]"])), [1234, 56.75])
+        self.assertEqual(list(stream.iter_array([b"[1", b"e", b"3]"])), [1000.0])
+
+    def test_whitespace_and_empty_chunks(self):
+        self.assertEqual(list(stream.iter_array([b" \n[", b"", b" 1 ,\t", b"", b"2 ] \r\n"])), [1, 2])
+
+    def test_empty_array(self):
+        self.assertEqual(decode(b"[]", 1), [])
+        self.assertEqual(decode(b"  [ \n ]  ", 1), [])
+
+    def test_non_array_body_is_decoded_whole(self):
+        self.assertEqual(decode(b'{"a": [1, 2]}', 3), [{"a": [1, 2]}])
+        self.assertEqual(decode(b"42", 1), [42])
+
+    def test_empty_body_raises(self):
+        with self.assertRaises(ValueError):
+            decode(b"", 1)
+        with self.assertRaises(ValueError):
+            decode(b"   ", 1)
+
+    def test_truncated_array_raises(self):
+        for body in (b"[", b"[1", b"[1,", b'[{"a": 1}', b'[{"a": 1', b'["abc'):
+            with self.subTest(body=body), self.assertRaises(ValueError):
+                decode(body, 2)
+
+    def test_malformed_array_raises(self):
+        for body in (b"[1 2]", b"[1,]", b"[,1]", b"[1]]", b"[1] x", b"[1] [2]", b"[nul]"):
+            with self.subTest(body=body), self.assertRaises(ValueError):
+                decode(body, 1)
+
+    def test_elements_yielded_before_the_body_ends(self):
+        def chunks():
+            yield b'[{"n": 1},'
+            raise ConnectionResetError("dropped")
+
+        items = stream.iter_array(chunks())
+        self.assertEqual(next(items), {"n": 1})
+        with self.assertRaises(ConnectionResetError):
+            next(items)
+
+
+class FakeResponse:
+    def __init__(self, body, fail_after=None):
+        self.body = body
+        self.pos = 0
+        self.fail_after = fail_after
+        self.closed = False
+
+    def read(self, size=-1):
+        if self.fail_after is not None and self.pos >= self.fail_after:
+            raise ConnectionResetError("dropped")
+        end = len(self.body) if size < 0 else self.pos + size
+        chunk = self.body[self.pos:end]
+        self.pos += len(chunk)
+        return chunk
+
+    def close(self):
+        self.closed = True
+
+
+class StreamTest(unittest.TestCase):
+    def test_counts_and_closes_when_exhausted(self):
+        body = json.dumps(PAYLOAD).encode("utf-8")
+        resp = FakeResponse(body)
+        s = stream.Stream(resp, chunk_size=7)
+        self.assertEqual(list(s), PAYLOAD)
+        self.assertTrue(resp.closed)
+        self.assertEqual(s.summary(), {"streamed": {"transactions": len(PAYLOAD), "bytes": len(body)}})
+
+    def test_closes_on_error(self):
+        resp = FakeResponse(b'[1, 2, 3, 4, 5, 6]', fail_after=4)
+        s = stream.Stream(resp, chunk_size=4)
+        self.assertEqual(next(s), 1)
+        with self.assertRaises(ConnectionResetError):
+            list(s)
+        self.assertTrue(resp.closed)
+
+    def test_close_twice_closes_once(self):
+        closes = []
+        resp = FakeResponse(b"[]")
+        resp.close = lambda: closes.append(1)
+        s = stream.Stream(resp)
+        s.close()
+        s.close()
+        self.assertEqual(closes, [1])
+
+
+class FetcherTest(unittest.TestCase):
+    def setUp(self):
+        self.saved = os.environ.pop("SUBWAYIQ_STREAM_DETAILS", None)
+
+    def tearDown(self):
+        os.environ.pop("SUBWAYIQ_STREAM_DETAILS", None)
+        if self.saved is not None:
+            os.environ["SUBWAYIQ_STREAM_DETAILS"] = self.saved
+
+    def test_off_without_hook_or_setting(self):
+        self.assertIsNone(stream.fetcher(None, raw=True))
+        self.assertIsNone(stream.fetcher(lambda *a: {"data": FakeResponse(b"[]")}))
+
+    def test_streams_through_the_hook(self):
+        os.environ["SUBWAYIQ_STREAM_DETAILS"] = "1"
+        calls = []
+
+        def fetch_raw(*args):
+            calls.append(args)
+            return {"data": FakeResponse(b'[{"n": 1}, {"n": 2}]')}
+
+        res = stream.fetcher(fetch_raw)("Transaction Details", "1001", "2025-07-01", "2025-07-01", "cid", "key")
+        self.assertEqual(list(res["data"]), [{"n": 1}, {"n": 2}])
+        self.assertEqual(calls, [("Transaction Details", "1001", "2025-07-01", "2025-07-01", "cid", "key")])
+
+    def test_raw_reads_the_body_and_closes(self):
+        resp = FakeResponse(b"[1, 2]")
+        res = stream.fetcher(lambda *a: {"data": resp}, raw=True)("ep", "1", "d", "d", "c", "k")
+        self.assertEqual(res, {"data": b"[1, 2]"})
+        self.assertTrue(resp.closed)
+
+    def test_errors_and_exceptions_pass_through(self):
+        os.environ["SUBWAYIQ_STREAM_DETAILS"] = "1"
+        self.assertEqual(stream.fetcher(lambda *a: {"error": "HTTP 404: nope"})("ep", "1", "d", "d", "c", "k"),
+                         {"error": "HTTP 404: nope"})
+
+        class Limited(Exception):
+            pass
+
+        def limited(*args):
+            raise Limited("429")
+
+        with self.assertRaises(Limited):
+            stream.fetcher(limited, raw=True)("ep", "1", "d", "d", "c", "k")
+
+
+if __name__ == "__main__":
+    unittest.main()